@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Run every pending action of a model turn concurrently.
+
+`runs.poll_and_execute_action()` executes only the first pending action
+and calls tools one after another.  When a turn asks for several tools
+(e.g. `get_top_k_recommendations` + `get_item_metadata`) the turn then
+takes the *sum* of the tool latencies.  `ParallelActionExecutor`:
+
+• fetches all pending actions once the run reaches `pending_action`;
+• runs them on a shared thread pool (or process pool for CPU-bound,
+  picklable executors);
+• gives each tool its own timeout – a tool that overruns is answered with
+  an error payload so the model can still respond (its worker thread is
+  left to finish in the background);
+• submits the tool outputs in the order the model issued the calls, each
+  linked to its `tool_call_id`, and moves every action through
+  `processing` → `completed` / `failed` with `actions.update_action()`,
+  as the SDK helper does.
+
+An executor that also has `execute(tool_name, arguments) -> (content,
+meta)` (e.g. `tool_cache.ToolCache`) has `meta` sent as the tool
+message's `meta_data`.
+
+Turn latency becomes the slowest tool, not the sum.
+
+    executor = ParallelActionExecutor(tools, timeouts={"get_item_metadata": 2.0})
+    handled = executor.poll_and_execute(
+        client.runs, run_id=run.id, thread_id=thread.id, assistant_id=ASSISTANT_ID,
+        actions_client=client.actions, messages_client=client.messages,
+    )
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, TimeoutError as FutureTimeout
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+TERMINAL_STATES = {"completed", "failed", "cancelled", "expired"}
+
+
+@dataclass
+class ActionResult:
+    action_id: str
+    tool_name: str
+    content: str
+    status: str                 # "ok" | "error" | "timeout"
+    ms: float
+    meta: Dict[str, Any] = field(default_factory=dict)
+    tool_call_id: Optional[str] = None
+
+
+def run_status(run) -> str:
+    """`run.status` as a plain string (the SDK returns a `StatusEnum`)."""
+    return getattr(run.status, "value", str(run.status))
+
+
+def action_arguments(action: Dict[str, Any]) -> Dict[str, Any]:
+    """`function_arguments` of a pending action, whether sent as a dict or a JSON string."""
+    args = action.get("function_arguments") or {}
+    return json.loads(args) if isinstance(args, str) else args
+
+
+def _error(message: str) -> str:
+    return json.dumps({"status": "error", "message": message})
+
+
+def update_status(actions_client, action_id: str, status: str) -> None:
+    """`actions_client.update_action(...)`; a failed update is printed, not raised."""
+    try:
+        actions_client.update_action(action_id, status=status)
+    except Exception as exc:
+        print(f"[action] could not mark {action_id} {status}: {exc}")
+
+
+def report(results: List[ActionResult]) -> None:
+    for r in results:
+        cached = f" ({r.meta['cache']})" if r.meta.get("cache") else ""
+        print(f"[action] {r.tool_name} → {r.status} in {r.ms:.1f} ms{cached}")
+
+
+def _timed_call(tool_executor: Callable[[str, dict], str], tool_name: str, arguments: dict):
+    t0 = time.perf_counter()
+    execute = getattr(tool_executor, "execute", None)
+    if execute is not None:
+        content, meta = execute(tool_name, arguments)
+    else:
+        content, meta = tool_executor(tool_name, arguments), {}
+    return content, (time.perf_counter() - t0) * 1000, meta
+
+
+class ParallelActionExecutor:
+    def __init__(
+        self,
+        tool_executor: Callable[[str, dict], str],
+        *,
+        timeouts: Optional[Dict[str, float]] = None,
+        default_timeout: float = 30.0,
+        max_workers: int = 8,
+        processes: bool = False,
+    ):
+        self.tool_executor = tool_executor
+        self.timeouts = dict(timeouts or {})
+        self.default_timeout = default_timeout
+        self.pool: Executor = (
+            ProcessPoolExecutor(max_workers=max_workers)
+            if processes
+            else ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="action")
+        )
+
+    def start_call(self, tool_name: str, arguments: Dict[str, Any]) -> Future:
+        """Start one tool call on the pool; the future yields `(content, ms, meta)`."""
+        return self.pool.submit(_timed_call, self.tool_executor, tool_name, arguments)
+
+    def execute(
+        self,
+        actions: List[Dict[str, Any]],
+        started: Optional[Sequence[Optional[Tuple[Future, float]]]] = None,
+    ) -> List[ActionResult]:
+        """
+        Run `actions` concurrently; results come back in the same order.
+
+        `started[i]`, if not None, is an already running `(future,
+        perf_counter start)` for `actions[i]` – see `speculative_actions` –
+        and is awaited instead of starting a new call.
+        """
+        now = time.perf_counter()
+        calls: List[Tuple[Any, float]] = []
+        for i, action in enumerate(actions):
+            if started and started[i] is not None:
+                calls.append(started[i])
+                continue
+            try:
+                args = action_arguments(action)
+            except ValueError as exc:
+                calls.append((exc, now))
+                continue
+            calls.append((self.start_call(action["tool_name"], args), now))
+
+        results = []
+        for action, (fut, t0) in zip(actions, calls):
+            name = action["tool_name"]
+            call_id = action.get("tool_call_id")
+            limit = self.timeouts.get(name, self.default_timeout)
+            if isinstance(fut, Exception):
+                results.append(ActionResult(
+                    action["action_id"], name, _error(f"bad arguments: {fut}"), "error", 0.0,
+                    tool_call_id=call_id,
+                ))
+                continue
+            try:
+                content, ms, meta = fut.result(timeout=max(0.0, t0 + limit - time.perf_counter()))
+                results.append(ActionResult(action["action_id"], name, content, "ok", ms, meta, call_id))
+            except FutureTimeout:
+                fut.cancel()
+                results.append(ActionResult(
+                    action["action_id"], name, _error(f"{name} timed out after {limit:g}s"), "timeout",
+                    (time.perf_counter() - t0) * 1000, tool_call_id=call_id,
+                ))
+            except Exception as exc:
+                results.append(ActionResult(
+                    action["action_id"], name, _error(f"{type(exc).__name__}: {exc}"), "error",
+                    (time.perf_counter() - t0) * 1000, tool_call_id=call_id,
+                ))
+        return results
+
+    def submit(
+        self,
+        results: List[ActionResult],
+        *,
+        thread_id: str,
+        assistant_id: str,
+        actions_client,
+        messages_client,
+    ) -> None:
+        """Submit each output, then mark its action `completed` (or `failed` on error / timeout)."""
+        for r in results:
+            messages_client.submit_tool_output(
+                thread_id=thread_id,
+                tool_id=r.action_id,
+                tool_call_id=r.tool_call_id,
+                content=r.content,
+                role="tool",
+                assistant_id=assistant_id,
+                meta_data=r.meta or None,
+            )
+            update_status(actions_client, r.action_id, "completed" if r.status == "ok" else "failed")
+
+    def handle(
+        self,
+        actions: List[Dict[str, Any]],
+        *,
+        thread_id: str,
+        assistant_id: str,
+        actions_client,
+        messages_client,
+        started: Optional[Sequence[Optional[Tuple[Future, float]]]] = None,
+    ) -> List[ActionResult]:
+        """Mark `actions` processing, execute them, print a line per result and submit the outputs."""
+        for action in actions:
+            update_status(actions_client, action["action_id"], "processing")
+        results = self.execute(actions, started)
+        report(results)
+        self.submit(
+            results,
+            thread_id=thread_id,
+            assistant_id=assistant_id,
+            actions_client=actions_client,
+            messages_client=messages_client,
+        )
+        return results
+
+    def poll_and_execute(
+        self,
+        runs_client,
+        *,
+        run_id: str,
+        thread_id: str,
+        assistant_id: str,
+        actions_client,
+        messages_client,
+        timeout: float = 60.0,
+        interval: float = 1.0,
+    ) -> bool:
+        """Drop-in for `runs.poll_and_execute_action` that handles every pending action."""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            status = run_status(runs_client.retrieve_run(run_id))
+            if status == "pending_action":
+                actions = actions_client.get_pending_actions(run_id=run_id)
+                if actions:
+                    self.handle(actions, thread_id=thread_id, assistant_id=assistant_id,
+                                actions_client=actions_client, messages_client=messages_client)
+                    return True
+            elif status in TERMINAL_STATES:
+                return False
+            time.sleep(interval)
+        return False
+
+    def close(self) -> None:
+        self.pool.shutdown(wait=False, cancel_futures=True)
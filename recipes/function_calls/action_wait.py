@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Event-driven wait for a run's tool actions.
+
+`runs.poll_and_execute_action(..., interval=…)` polls `GET /v1/runs/{id}`
+at a fixed interval: a short interval burns requests, a long one adds up to
+a whole interval of latency to every tool round trip.  `ActionWaiter`:
+
+• subscribes to the run's server-sent events (`GET /v1/runs/{id}/events`)
+  and returns on the first `action_required` event – one held-open request,
+  no polling delay – then fetches `/v1/actions/pending/{id}` once so every
+  action of the turn is returned.  The run status is read once before
+  subscribing, so an action that already exists is not missed;
+• if the event stream is unavailable (non-200, connection error) or ends
+  without an action, falls back to polling with adaptive backoff: starting
+  at `min_interval` and growing by `backoff` up to `max_interval`, so a fast
+  action is noticed within tens of milliseconds and a slow one costs few
+  requests.
+
+Every `WaitResult` carries the number of HTTP calls it made.
+`action_wait_bench.py` compares the strategies against a local mock server.
+
+    waiter = ActionWaiter.from_client(client)
+    result = waiter.wait(run.id, timeout=60.0)
+    if result.status == "pending_action":
+        executor.handle(result.actions, thread_id=..., assistant_id=...,
+                        actions_client=client.actions, messages_client=client.messages)
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import httpx
+
+from recipes.function_calls.action_executor import TERMINAL_STATES
+
+
+@dataclass
+class WaitResult:
+    status: str                 # "pending_action", a terminal run status, or "timeout"
+    actions: List[Dict[str, Any]] = field(default_factory=list)
+    source: str = "poll"        # "events" | "poll"
+    http_calls: int = 0
+    ms: float = 0.0
+
+
+def sse_events(lines: Iterator[str]) -> Iterator[Tuple[str, str]]:
+    """`(event, data)` pairs from text/event-stream lines."""
+    event, data = "message", []
+    for line in lines:
+        if not line:
+            if data:
+                yield event, "\n".join(data)
+            event, data = "message", []
+        elif line.startswith(":"):
+            continue
+        else:
+            name, _, value = line.partition(":")
+            value = value[1:] if value.startswith(" ") else value
+            if name == "event":
+                event = value
+            elif name == "data":
+                data.append(value)
+
+
+class ActionWaiter:
+    def __init__(
+        self,
+        base_url: str,
+        headers: Optional[Dict[str, str]] = None,
+        *,
+        events: bool = True,
+        min_interval: float = 0.05,
+        max_interval: float = 0.5,
+        backoff: float = 1.5,
+    ):
+        self.http = httpx.Client(base_url=base_url, headers=headers or {}, timeout=httpx.Timeout(10.0))
+        self.events = events
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+
+    @classmethod
+    def from_client(cls, client, **kwargs) -> "ActionWaiter":
+        """Waiter for an `Entity` client (same base URL and API key)."""
+        return cls(client.base_url, {"X-API-Key": client.api_key}, **kwargs)
+
+    def _get(self, path: str, result: WaitResult) -> Any:
+        result.http_calls += 1
+        resp = self.http.get(path)
+        resp.raise_for_status()
+        return resp.json()
+
+    def _pending(self, run_id: str, result: WaitResult) -> List[Dict[str, Any]]:
+        return self._get(f"/v1/actions/pending/{run_id}", result)
+
+    # ─── strategies ─────────────────────────────────────────────────────────
+    def _wait_events(self, run_id: str, deadline: float, result: WaitResult) -> bool:
+        """True once an action arrived; False if the stream ended without one."""
+        result.http_calls += 1
+        timeout = httpx.Timeout(10.0, read=max(0.1, deadline - time.monotonic()))
+        with self.http.stream(
+            "GET", f"/v1/runs/{run_id}/events", headers={"Accept": "text/event-stream"}, timeout=timeout
+        ) as resp:
+            resp.raise_for_status()
+            for event, data in sse_events(resp.iter_lines()):
+                if event == "action_required":
+                    result.source = "events"
+                    result.status = "pending_action"
+                    result.actions = self._pending(run_id, result) or [json.loads(data)]
+                    return True
+                if time.monotonic() >= deadline:
+                    break
+        return False
+
+    def _check(self, run_id: str, result: WaitResult) -> bool:
+        """One status read; True (and `result` filled in) if waiting is over."""
+        status = self._get(f"/v1/runs/{run_id}", result).get("status")
+        if status == "pending_action":
+            actions = self._pending(run_id, result)
+            if actions:
+                result.status, result.actions = status, actions
+                return True
+        elif status in TERMINAL_STATES:
+            result.status = status
+            return True
+        return False
+
+    def _wait_poll(self, run_id: str, deadline: float, result: WaitResult) -> None:
+        interval = self.min_interval
+        while time.monotonic() < deadline:
+            if self._check(run_id, result):
+                return
+            time.sleep(min(interval, max(0.0, deadline - time.monotonic())))
+            interval = min(self.max_interval, interval * self.backoff)
+        result.status = "timeout"
+
+    def wait(self, run_id: str, timeout: float = 60.0) -> WaitResult:
+        start = time.perf_counter()
+        deadline = time.monotonic() + timeout
+        result = WaitResult(status="timeout")
+        done = False
+        if self.events:
+            done = self._check(run_id, result)
+            if not done:
+                try:
+                    done = self._wait_events(run_id, deadline, result)
+                except (httpx.HTTPError, ValueError):
+                    done = False                            # no usable event stream → poll
+        if not done:
+            self._wait_poll(run_id, deadline, result)
+        result.ms = (time.perf_counter() - start) * 1000
+        return result
+
+    def close(self) -> None:
+        self.http.close()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Benchmark: how quickly is a pending action noticed, and at what request cost?
+
+Starts a local mock of the three run endpoints (`http.server`, no API or
+model needed):
+
+    GET /v1/runs/{id}              {"id", "status"} – "in_progress" until the
+                                   action is ready, then "pending_action"
+    GET /v1/actions/pending/{id}   [] / [action]
+    GET /v1/runs/{id}/events       SSE; sends `action_required` when ready
+
+Each trial creates a run whose action becomes ready after a random delay
+(`--min-delay`…`--max-delay`), then waits for it with:
+
+• fixed polling at 0.1 / 0.3 / 1.0 s – what `poll_and_execute_action` does;
+• adaptive backoff polling (`ActionWaiter(events=False)`);
+• the event stream (`ActionWaiter()`).
+
+Reported per strategy: detection latency after the action became ready
+(mean / p95) and HTTP requests per tool round trip, as counted by the
+server.
+
+    python -m recipes.function_calls.action_wait_bench --trials 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+
+import numpy as np
+
+from recipes.function_calls.action_wait import ActionWaiter
+
+
+# ─── mock server ────────────────────────────────────────────────────────────
+class MockRunServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.ready_at: Dict[str, float] = {}
+        self.requests: Counter = Counter()
+        self.lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def new_run(self, run_id: str, delay_s: float) -> None:
+        self.ready_at[run_id] = time.monotonic() + delay_s
+
+    def count(self, run_id: str) -> None:
+        with self.lock:
+            self.requests[run_id] += 1
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: MockRunServer
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def _json(self, body) -> None:
+        raw = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def do_GET(self) -> None:
+        parts = self.path.strip("/").split("/")
+        run_id = parts[2] if parts[:2] == ["v1", "runs"] else parts[-1]
+        ready_at = self.server.ready_at.get(run_id)
+        if ready_at is None:
+            self.send_error(404)
+            return
+        self.server.count(run_id)
+        action = {"action_id": f"act_{run_id}", "tool_name": "search_movies",
+                  "function_arguments": {"query": "space opera"}}
+        ready = time.monotonic() >= ready_at
+
+        if parts[:2] == ["v1", "runs"] and parts[3:] == ["events"]:
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.end_headers()
+            self.wfile.write(b": connected\n\n")
+            self.wfile.flush()
+            time.sleep(max(0.0, ready_at - time.monotonic()))
+            self.wfile.write(f"event: action_required\ndata: {json.dumps(action)}\n\n".encode())
+            self.wfile.flush()
+        elif parts[:2] == ["v1", "runs"]:
+            self._json({"id": run_id, "status": "pending_action" if ready else "in_progress"})
+        else:
+            self._json([action] if ready else [])
+
+
+# ─── benchmark ──────────────────────────────────────────────────────────────
+def run(trials: int, min_delay: float, max_delay: float, seed: int = 0) -> None:
+    server = MockRunServer()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    strategies = {
+        "fixed 0.1s": ActionWaiter(server.base_url, events=False, min_interval=0.1, max_interval=0.1, backoff=1.0),
+        "fixed 0.3s": ActionWaiter(server.base_url, events=False, min_interval=0.3, max_interval=0.3, backoff=1.0),
+        "fixed 1.0s": ActionWaiter(server.base_url, events=False, min_interval=1.0, max_interval=1.0, backoff=1.0),
+        "adaptive backoff": ActionWaiter(server.base_url, events=False),
+        "events (SSE)": ActionWaiter(server.base_url),
+    }
+    delays = np.random.default_rng(seed).uniform(min_delay, max_delay, size=trials)
+
+    print(f"{trials} round trips, action ready after {min_delay:g}–{max_delay:g} s\n")
+    print(f"{'strategy':<18} {'mean ms':>9} {'p95 ms':>9} {'HTTP/trip':>10}")
+    for name, waiter in strategies.items():
+        lags: List[float] = []
+        calls: List[int] = []
+        for i, delay in enumerate(delays):
+            run_id = f"{name.split()[0]}_{i}_{random.random():.6f}"
+            server.new_run(run_id, float(delay))
+            result = waiter.wait(run_id, timeout=max_delay + 5.0)
+            assert result.status == "pending_action", result
+            lags.append((time.monotonic() - server.ready_at[run_id]) * 1000)
+            calls.append(server.requests[run_id])
+        print(f"{name:<18} {np.mean(lags):>9.1f} {np.percentile(lags, 95):>9.1f} {np.mean(calls):>10.1f}")
+        waiter.close()
+    server.shutdown()
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--trials", type=int, default=20)
+    ap.add_argument("--min-delay", type=float, default=0.2)
+    ap.add_argument("--max-delay", type=float, default=2.0)
+    args = ap.parse_args()
+    run(args.trials, args.min_delay, args.max_delay)
+
+
+if __name__ == "__main__":
+    main()
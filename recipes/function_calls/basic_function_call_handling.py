@@ -10,6 +10,11 @@ import json
 import os
 from dotenv import load_dotenv
 from projectdavid import Entity
+
+from recipes.function_calls.action_executor import ParallelActionExecutor
+from recipes.function_calls.tool_cache import CachePolicy, ToolCache
+from recipes.function_calls.tool_registry import ToolRegistry
+from recipes.function_calls.tool_schemas import FLIGHT_TIMES
 # ------------------------------------------------------------------
 # 0.  SDK init + env
 # ------------------------------------------------------------------
@@ -29,18 +34,31 @@ HYPERBOLIC_API_KEY = os.getenv("HYPERBOLIC_API_KEY")    # provider key
 # ------------------------------------------------------------------
 # 1.  Tool executor  (runs locally for this demo)
 # ------------------------------------------------------------------
-def get_flight_times(tool_name: str, arguments: dict) -> str:
+# A real lookup would declare its API client / cache as a resource here
+# (see tool_registry.py) so it is built once and shared across calls.
+registry = ToolRegistry()
+
+
+@registry.tool(FLIGHT_TIMES)
+def get_flight_times(arguments: dict) -> str:
     """Fake flight-time lookup."""
-    if tool_name == "get_flight_times":
-        return json.dumps({
-            "status": "success",
-            "departure":     arguments.get("departure"),
-            "arrival":       arguments.get("arrival"),
-            "duration":      "4h 30m",
-            "departure_time": "10:00 AM PST",
-            "arrival_time":   "06:30 PM EST"
-        })
-    return json.dumps({"status": "error", "message": f"unknown tool '{tool_name}'"})
+    return json.dumps({
+        "status": "success",
+        "departure":     arguments.get("departure"),
+        "arrival":       arguments.get("arrival"),
+        "duration":      "4h 30m",
+        "departure_time": "10:00 AM PST",
+        "arrival_time":   "06:30 PM EST"
+    })
+
+
+# Same route → same answer: memoize it.  With TOOL_CACHE_DIR set the cached
+# result also survives across runs of this script.
+tools = ToolCache(
+    registry,
+    {"get_flight_times": CachePolicy(ttl_s=600.0, max_entries=256)},
+    disk_dir=os.getenv("TOOL_CACHE_DIR"),
+)
 
 # ------------------------------------------------------------------
 # 2.  Thread + message + run
@@ -83,16 +101,20 @@ for chunk in stream.stream_chunks(
 # ------------------------------------------------------------------
 # 4.  Poll run → execute tool → send tool result
 # ------------------------------------------------------------------
-handled = client.runs.poll_and_execute_action(
+# Not `runs.poll_and_execute_action`: that calls `tools(...)` and loses the
+# cache hit / saved-ms metadata, which the executor sends as `meta_data`.
+executor = ParallelActionExecutor(tools)
+handled = executor.poll_and_execute(
+    client.runs,
     run_id=run.id,
     thread_id=thread.id,
     assistant_id=ASSISTANT_ID,
-    tool_executor=get_flight_times,
     actions_client=client.actions,
     messages_client=client.messages,
     timeout=60.0,
     interval=0.3
 )
+executor.close()
 
 # ------------------------------------------------------------------
 # 5.  Stream final assistant response
@@ -14,6 +14,8 @@ from dotenv import load_dotenv
 from projectdavid import Entity
 from projectdavid_common.schemas.tools import ToolFunction
 
+from recipes.function_calls.tool_schemas import FLIGHT_TIMES
+
 # ------------------------------------------------------------------
 # 0. Environment + SDK init
 # ------------------------------------------------------------------
@@ -42,24 +44,7 @@ print(f"[✓] assistant ➜ {assistant.id}")
 # ------------------------------------------------------------------
 # 3. Define the function schema
 # ------------------------------------------------------------------
-flight_func_schema = {
-    "name": "get_flight_times",
-    "description": "Return flight times between two airport codes.",
-    "parameters": {
-        "type": "object",
-        "properties": {
-            "departure": {
-                "type": "string",
-                "description": "IATA code for the departure airport."
-            },
-            "arrival": {
-                "type": "string",
-                "description": "IATA code for the arrival airport."
-            }
-        },
-        "required": ["departure", "arrival"]
-    }
-}
+flight_func_schema = FLIGHT_TIMES            # see tool_schemas.py
 
 # Validate & wrap the schema
 tool_func = ToolFunction(function=flight_func_schema)
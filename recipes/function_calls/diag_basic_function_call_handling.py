@@ -17,6 +17,9 @@ import os
 from dotenv import load_dotenv
 from projectdavid import Entity
 
+from recipes.function_calls.tool_registry import ToolRegistry
+from recipes.function_calls.tool_schemas import FLIGHT_TIMES
+
 # ──────────────────────────────────────────────────────────────────
 # 0.  SDK init + env
 # ──────────────────────────────────────────────────────────────────
@@ -37,20 +40,22 @@ HYPERBOLIC_API_KEY = os.getenv("HYPERBOLIC_API_KEY")             # provider key
 # 1.  Tool executor  (runs locally for this demo)
 # ──────────────────────────────────────────────────────────────────
 
-def get_flight_times(tool_name: str, arguments: dict) -> str:
+tools = ToolRegistry()
+
+
+@tools.tool(FLIGHT_TIMES)
+def get_flight_times(arguments: dict) -> str:
     """Fake flight‑time lookup used by the assistant."""
-    if tool_name == "get_flight_times":
-        return json.dumps(
-            {
-                "status": "success",
-                "departure": arguments.get("departure"),
-                "arrival": arguments.get("arrival"),
-                "duration": "4h 30m",
-                "departure_time": "10:00AM PST",
-                "arrival_time": "06:30PM EST",
-            }
-        )
-    return json.dumps({"status": "error", "message": f"unknown tool '{tool_name}'"})
+    return json.dumps(
+        {
+            "status": "success",
+            "departure": arguments.get("departure"),
+            "arrival": arguments.get("arrival"),
+            "duration": "4h 30m",
+            "departure_time": "10:00AM PST",
+            "arrival_time": "06:30PM EST",
+        }
+    )
 
 # ──────────────────────────────────────────────────────────────────
 # 2.  Thread + message + run
@@ -99,7 +104,7 @@ handled = client.runs.poll_and_execute_action(
     run_id=run.id,
     thread_id=thread.id,
     assistant_id=ASSISTANT_ID,
-    tool_executor=get_flight_times,
+    tool_executor=tools,
     actions_client=client.actions,
     messages_client=client.messages,
     timeout=60.0,
@@ -12,12 +12,43 @@ ASSUMPTIONS
     4) Assistant streams a final, natural‑language answer.
 
 Replace the constants (ASSISTANT_ID, MOVIE_STORE_ID, MODEL_ID) if needed.
+Set TIMINGS=1 to print per-stage search latencies at the end of the run.
+Identical concurrent `search_movies` calls (same store, query, top_k and
+filters) share one encode+search via `single_flight.SingleFlight`.
+`similar_movies` answers from the precomputed neighbour table
+(`item_neighbours.py`) when it has been built, and falls back to a
+recommend-by-id vector search otherwise.
+Passing a MovieLens `user` to `search_movies` blends that user's profile
+vector (`user_profiles.py`, weight PERSONALIZE_WEIGHT) into the query.
+PERSONAL_RERANK=1 re-scores the top RERANK_N candidates with a pluggable
+model (`personal_rerank.py`) within RERANK_BUDGET_MS; over budget the raw
+vector order is returned.
+Clients, the embedding model and the lookup tables are declared as shared
+resources (`tool_registry.py`) and built once, before the first tool call.
+SPECULATE=1 starts the tool as soon as its function_call chunk streams in
+(`speculative_actions.py`) and submits once the server-side action exists.
+Tool results are serialised compactly within TOOL_OUTPUT_TOKENS
+(`tool_output.py`): `score`, then `genres` are dropped and the tail of the
+list cut only when a result would not fit.
 """
-import json
 import os
 from dotenv import load_dotenv
 from projectdavid import Entity
 
+from recipes.function_calls.action_executor import ParallelActionExecutor
+from recipes.function_calls.action_wait import ActionWaiter
+from recipes.function_calls.speculative_actions import SpeculativeActions
+from recipes.function_calls.tool_output import OutputShaper
+from recipes.function_calls.tool_registry import ResourceRegistry, ToolRegistry
+from recipes.function_calls.tool_schemas import SEARCH_MOVIES, SIMILAR_MOVIES
+from recipes.reccomender.item_neighbours import DEFAULT_TABLE_DIR, NeighbourTable
+from recipes.reccomender.movielens_data import load_items
+from recipes.reccomender.movielens_search import DISPLAY_FIELDS, StoreSearcher
+from recipes.reccomender.personal_rerank import FeatureBuilder, LinearScorer, PersonalReranker
+from recipes.reccomender.search_timing import StageTimings
+from recipes.reccomender.single_flight import SingleFlight, search_key
+from recipes.reccomender.user_profiles import UserProfiles, blend
+
 # ─── Env & SDK ───────────────────────────────────────────────────────────────
 load_dotenv()
 client = Entity(
@@ -31,30 +62,126 @@ MOVIE_STORE_ID = "vect_wHvnnr27MGNCVIhz9yqg07"                     # existing st
 MODEL_ID       = "hyperbolic/deepseek-ai/DeepSeek-V3-0324"
 PROVIDER_KW    = "TogetherAI"
 TOGETHER_KEY   = os.getenv("HYPERBOLIC_API_KEY")
+TIMINGS        = StageTimings() if os.getenv("TIMINGS", "0") == "1" else None
+PERSONALIZE_WEIGHT = float(os.getenv("PERSONALIZE_WEIGHT", "0.3"))
+PERSONAL_RERANK    = os.getenv("PERSONAL_RERANK", "0") == "1"
+RERANK_N           = int(os.getenv("RERANK_N", "50"))
+RERANK_BUDGET_MS   = float(os.getenv("RERANK_BUDGET_MS", "50"))
+SPECULATE          = os.getenv("SPECULATE", "0") == "1"
+TOOL_OUTPUT_TOKENS = int(os.getenv("TOOL_OUTPUT_TOKENS", "400"))
 
-# ─── Tool executor (local mock) ──────────────────────────────────────────────
-def search_movies(tool_name: str, arguments: dict) -> str:
-    if tool_name != "search_movies":
-        return json.dumps({"status": "error", "message": f"unknown tool '{tool_name}'"})
+# ─── Warm resources (built once, shared by every call – tool_registry.py) ───
+def _build_searcher() -> StoreSearcher:
+    searcher = StoreSearcher(client)
+    searcher.collection_for(MOVIE_STORE_ID)
+    searcher.encode("warm-up")                  # embedding model load + first pass
+    return searcher
 
-    query = arguments.get("query", "")
-    top_k = int(arguments.get("top_k", 5))
-    store = arguments.get("store_id", MOVIE_STORE_ID)
 
-    embedder = client.vectors.file_processor.embedding_model
-    qvec = embedder.encode(
-        [query],
-        convert_to_numpy=True,
-        normalize_embeddings=True,
-        truncate="model_max_length",
-    )[0].tolist()
-
-    hits = client.vectors.vector_manager.query_store(
-        store_name=store,
-        query_vector=qvec,
-        top_k=top_k,
+def _build_reranker():
+    if not PERSONAL_RERANK:
+        return None
+    # Swap LinearScorer for your own pretrained model: anything with
+    # `score(user, features) -> scores` over the FEATURES columns.
+    from recipes.reccomender.cf_recommender import load_or_train
+    from recipes.reccomender.item_metadata import load_or_build
+
+    return PersonalReranker(
+        LinearScorer(),
+        FeatureBuilder(load_or_train(), load_or_build()),
+        budget_ms=RERANK_BUDGET_MS,
     )
 
+
+resources = ResourceRegistry()
+resources.register(
+    "searcher",
+    _build_searcher,
+    health_check=lambda s: s.healthy(MOVIE_STORE_ID),
+)
+resources.register("flight", SingleFlight)
+resources.register("profiles", lambda: UserProfiles(resources.get("searcher")).build(MOVIE_STORE_ID))
+resources.register(
+    "neighbours",
+    lambda: NeighbourTable() if (DEFAULT_TABLE_DIR / "meta.json").exists() else None,
+)
+resources.register("items", lambda: {item["item_id"]: item for item in load_items()})
+resources.register("reranker", _build_reranker)
+
+
+# ─── Tool executors (local mock) ─────────────────────────────────────────────
+# arguments arrive validated against the tool schemas (ints coerced, top_k defaulted)
+tools = ToolRegistry(resources)
+shaper = OutputShaper(max_tokens=TOOL_OUTPUT_TOKENS, omit=("rank",), drop_order=("score", "genres"))
+
+
+def _shaped(payload: dict) -> str:
+    text, report = shaper.dumps(payload)
+    print(f"   ✂  output: {report.summary()}")
+    return text
+
+
+@tools.tool(SIMILAR_MOVIES, resources=("searcher", "neighbours", "items"))
+def similar_movies(arguments: dict, *, searcher, neighbours, items) -> str:
+    item_id = arguments["item_id"]
+    top_k = arguments["top_k"]
+    store = arguments.get("store_id", MOVIE_STORE_ID)
+
+    # the table only answers for the store it was built from (MOVIE_STORE_ID if unrecorded)
+    if neighbours is not None and (neighbours.store_id or MOVIE_STORE_ID) == store and item_id in neighbours:
+        pairs = neighbours.neighbours(item_id, top_k)
+    else:
+        hits = searcher.recommend(store, [item_id], top_k=top_k, include=["item_id"], timings=TIMINGS)
+        pairs = [(h["metadata"]["item_id"], h["score"]) for h in hits]
+
+    results = [
+        {
+            "rank": i + 1,
+            "item_id": other,
+            "title": items[other]["title"],
+            "genres": items[other]["genres"],
+            "year": items[other]["release_year"],
+            "score": round(score, 3),
+        }
+        for i, (other, score) in enumerate(pairs)
+        if other in items
+    ]
+    return _shaped({"status": "success", "results": results})
+
+
+@tools.tool(SEARCH_MOVIES, resources=("searcher", "flight", "profiles", "reranker"))
+def search_movies(arguments: dict, *, searcher, flight, profiles, reranker) -> str:
+    query = arguments["query"]
+    top_k = arguments["top_k"]
+    store = arguments.get("store_id", MOVIE_STORE_ID)
+    filters = arguments.get("filters")
+    user = arguments.get("user")
+
+    fetch_k = max(top_k, RERANK_N) if reranker else top_k
+
+    def run_search():
+        if user is None:
+            hits = searcher.search(
+                store, query, fetch_k, filters=filters, include=DISPLAY_FIELDS, timings=TIMINGS
+            )
+        else:
+            vector = searcher.encode(query, TIMINGS, store_id=store)
+            profile = profiles.vector(store, user)
+            if profile is not None:
+                vector = blend(vector, profile, PERSONALIZE_WEIGHT)
+            hits = searcher.search_by_vector(
+                store, vector, fetch_k, filters=filters, include=DISPLAY_FIELDS, timings=TIMINGS
+            )
+        if reranker is None:
+            return hits
+        hits, report = reranker.rerank(user, hits, top_k)
+        print(f"   ⚖  rerank: {report.summary()}")
+        if TIMINGS is not None:
+            TIMINGS.record("rerank", report.total_ms)
+        return hits
+
+    hits, _ = flight.do(search_key(store, query, top_k, filters) + (user,), run_search)
+
     results = [
         {
             "rank": i + 1,
@@ -65,21 +192,10 @@ def search_movies(tool_name: str, arguments: dict) -> str:
         }
         for i, h in enumerate(hits)
     ]
-
-    # final_results = def some_pretrained_model(input='results')
-    #------------------------------------------------------------
-    # Deal with your user specific pretrained model results here
-    # by passing the results as input. This will add some delay
-    # The result is that the  final output is tailored to whatever
-    # logic is contained in your pretrained model. For example,
-    # It might refine and rank the list of movies  according to user
-    # preferences and watch history. You will have to tailor and map
-    # results according to whatever your pretrained model does
-    #-------------------------------------------------------------
-    # return return json.dumps({"status": "success", "results": final_results})
-    return json.dumps({"status": "success", "results": results})
+    return _shaped({"status": "success", "results": results})
 
 
+tools.warm()                                    # model, indexes, tables: built before the first call
 
 # ─── Thread + message + run ──────────────────────────────────────────────────
 thread = client.threads.create_thread(participant_ids=[USER_ID])
@@ -102,26 +218,43 @@ stream.setup(
     api_key=TOGETHER_KEY,
 )
 
+executor = ParallelActionExecutor(tools, timeouts={"search_movies": 5.0, "similar_movies": 2.0})
+speculative = SpeculativeActions(executor) if SPECULATE else None   # both tools are read-only
+
 print("\n[▶] LLM streaming (expect function call) …\n")
-for chunk in stream.stream_chunks(
+chunks = stream.stream_chunks(
     provider=PROVIDER_KW, model=MODEL_ID, timeout_per_chunk=30.0
-):
+)
+for chunk in (speculative.observe(chunks) if speculative else chunks):
     if chunk.get("type") == "function_call":
         print(f"\n[function_call] → {chunk['name']}({chunk['arguments']})\n")
     else:
         print(chunk.get("content", ""), end="", flush=True)
 
 # ─── Execute tool & feed result back ─────────────────────────────────────────
-handled = client.runs.poll_and_execute_action(
-    run_id=run.id,
-    thread_id=thread.id,
-    assistant_id=ASSISTANT_ID,
-    tool_executor=search_movies,
-    actions_client=client.actions,
-    messages_client=client.messages,
-    timeout=10.0,
-    interval=1.0,
-)
+if speculative:
+    handled = speculative.finish(
+        client.runs,
+        run_id=run.id,
+        thread_id=thread.id,
+        assistant_id=ASSISTANT_ID,
+        actions_client=client.actions,
+        messages_client=client.messages,
+        timeout=10.0,
+    )
+else:
+    # run events (adaptive polling if unavailable) instead of a fixed 1 s poll
+    waited = ActionWaiter.from_client(client).wait(run.id, timeout=10.0)
+    print(f"\n[wait] {waited.status} via {waited.source} in {waited.ms:.0f} ms, {waited.http_calls} HTTP call(s)")
+    handled = waited.status == "pending_action"
+    if handled:
+        executor.handle(
+            waited.actions,
+            thread_id=thread.id,
+            assistant_id=ASSISTANT_ID,
+            actions_client=client.actions,
+            messages_client=client.messages,
+        )
 
 # ─── Stream the assistant’s final answer ─────────────────────────────────────
 if handled:
@@ -144,3 +277,7 @@ if handled:
     print("\n\n--- End of Stream ---")
 else:
     print("\n[!] No function call detected or execution failed.")
+
+if TIMINGS is not None:
+    print("\n" + TIMINGS.table("search_movies latency (ms)"))
+    print(resources.get("flight").stats())
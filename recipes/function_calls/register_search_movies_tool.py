@@ -1,7 +1,8 @@
 #! recipes/function_calls/register_search_movies_tool.py
 """
-Register the `search_movies` function tool and attach it to the default assistant.
-This enables function calling for MovieLens-style semantic vector queries.
+Register the `search_movies` and `similar_movies` function tools and attach
+them to the default assistant.  This enables function calling for
+MovieLens-style semantic vector queries and "more like this" lookups.
 """
 
 import os
@@ -9,6 +10,8 @@ from dotenv import load_dotenv
 from projectdavid import Entity
 from projectdavid_common.schemas.tools import ToolFunction
 
+from recipes.function_calls.tool_schemas import SEARCH_MOVIES, SIMILAR_MOVIES
+
 # ─── 0. Load environment and init SDK ────────────────────────────────────────
 load_dotenv()
 
@@ -17,45 +20,20 @@ client = Entity(
     api_key=os.getenv("ENTITIES_API_KEY")
 )
 
-# ─── 1. Define tool schema for movie vector search ───────────────────────────
-search_schema = {
-    "name": "search_movies",
-    "description": "Semantic search in the MovieLens vector store",
-    "parameters": {
-        "type": "object",
-        "properties": {
-            "query": {
-                "type": "string",
-                "description": "Freeform user query to search for a movie"
-            },
-            "top_k": {
-                "type": "integer",
-                "description": "How many similar results to return",
-                "default": 5
-            },
-            "store_id": {
-                "type": "string",
-                "description": "The vector store to search in"
-            }
-        },
-        "required": ["query"]
-    }
-}
-
-# ─── 2. Register tool (if not already registered) ────────────────────────────
-tool = client.tools.create_tool(
-    name=search_schema["name"],
-    type="function",
-    function=ToolFunction(function=search_schema)
-)
-print(f"[✓] Tool registered → {tool.id} ({tool.name})")
-
-# ─── 3. Attach to default assistant ──────────────────────────────────────────
+# ─── 1. Register tools and attach to default assistant ──────────────────────
 assistant_id = "default"
 
-client.tools.associate_tool_with_assistant(
-    tool_id=tool.id,
-    assistant_id=assistant_id
-)
+for schema in (SEARCH_MOVIES, SIMILAR_MOVIES):
+    tool = client.tools.create_tool(
+        name=schema["name"],
+        type="function",
+        function=ToolFunction(function=schema)
+    )
+    print(f"[✓] Tool registered → {tool.id} ({tool.name})")
+
+    client.tools.associate_tool_with_assistant(
+        tool_id=tool.id,
+        assistant_id=assistant_id
+    )
 
-print(f"[✓] Attached tool '{tool.name}' to assistant '{assistant_id}'")
+    print(f"[✓] Attached tool '{tool.name}' to assistant '{assistant_id}'")
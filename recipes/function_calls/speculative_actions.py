@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Speculative tool execution from the streamed `function_call` chunk.
+
+The usual round trip is: stream until the model finishes → poll the run
+until it reaches `pending_action` → execute the tool → submit.  But the
+`{"type": "function_call", "name", "arguments"}` chunk is visible while
+the stream is still running, so the tool can start right away:
+
+• `observe(chunks)` passes stream chunks through unchanged and starts every
+  complete function call (arguments parse as JSON) on the
+  `ParallelActionExecutor` pool the moment it appears;
+• `finish(...)` polls `get_pending_actions` at a short interval until the
+  server-side actions exist, pairs each action with a speculative call of
+  the same tool name + canonical arguments, and submits the results in
+  action order.  Actions with no matching speculation are executed then.
+
+Speculative calls whose action never materialises are discarded, so only
+side-effect-free tools should be speculated – pass `safe_tools` to limit
+it to those.  Per-tool timeouts are counted from when the speculative call
+started.
+
+    speculative = SpeculativeActions(ParallelActionExecutor(tools), safe_tools={"search_movies"})
+    for chunk in speculative.observe(stream.stream_chunks(...)):
+        ...
+    handled = speculative.finish(client.runs, run_id=run.id, ...)
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from recipes.function_calls.action_executor import (
+    TERMINAL_STATES,
+    ParallelActionExecutor,
+    action_arguments,
+    run_status,
+)
+from recipes.function_calls.tool_cache import cache_key
+
+
+class SpeculativeActions:
+    def __init__(self, executor: ParallelActionExecutor, *, safe_tools: Optional[Set[str]] = None):
+        self.executor = executor
+        self.safe_tools = safe_tools
+        self._started: Dict[str, List[Tuple[Future, float]]] = {}
+        self.speculated = 0
+        self.used = 0
+
+    def speculate(self, tool_name: Optional[str], arguments: Any) -> bool:
+        """Start `tool_name(arguments)` now; False if not allowed or the arguments are incomplete."""
+        if not tool_name or (self.safe_tools is not None and tool_name not in self.safe_tools):
+            return False
+        try:
+            args = json.loads(arguments) if isinstance(arguments, str) else dict(arguments or {})
+        except (ValueError, TypeError):
+            return False
+        key = cache_key(tool_name, args)
+        self._started.setdefault(key, []).append(
+            (self.executor.start_call(tool_name, args), time.perf_counter())
+        )
+        self.speculated += 1
+        print(f"[speculate] {tool_name} started from stream")
+        return True
+
+    def observe(self, chunks: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        for chunk in chunks:
+            if chunk.get("type") == "function_call":
+                self.speculate(chunk.get("name"), chunk.get("arguments"))
+            yield chunk
+
+    def _claim(self, action: Dict[str, Any]) -> Optional[Tuple[Future, float]]:
+        try:
+            key = cache_key(action["tool_name"], action_arguments(action))
+        except ValueError:
+            return None
+        started = self._started.get(key)
+        if not started:
+            return None
+        self.used += 1
+        return started.pop(0)
+
+    def finish(
+        self,
+        runs_client,
+        *,
+        run_id: str,
+        thread_id: str,
+        assistant_id: str,
+        actions_client,
+        messages_client,
+        timeout: float = 60.0,
+        interval: float = 0.05,
+        status_every: int = 10,
+    ) -> bool:
+        """
+        Submit results once the run's actions exist.  The run status is only
+        checked every `status_every` polls, to notice a run that ended
+        without calling a tool.
+        """
+        deadline = time.monotonic() + timeout
+        polls = 0
+        try:
+            while time.monotonic() < deadline:
+                actions = actions_client.get_pending_actions(run_id=run_id)
+                if actions:
+                    started = [self._claim(a) for a in actions]
+                    print(f"[speculate] {sum(s is not None for s in started)}/{len(actions)} "
+                          f"action(s) served from speculative calls")
+                    self.executor.handle(actions, thread_id=thread_id, assistant_id=assistant_id,
+                                         actions_client=actions_client, messages_client=messages_client,
+                                         started=started)
+                    return True
+                polls += 1
+                if polls % status_every == 0 and run_status(runs_client.retrieve_run(run_id)) in TERMINAL_STATES:
+                    return False
+                time.sleep(interval)
+            return False
+        finally:
+            for started in self._started.values():        # unclaimed speculation is discarded
+                for fut, _ in started:
+                    fut.cancel()
+            self._started.clear()
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Opt-in memoization for deterministic tools.
+
+Tools such as `get_flight_times` or `get_item_metadata` return the same
+output for the same arguments, so re-executing them on every run is wasted
+latency.  `ToolCache` wraps any tool executor:
+
+• key = tool name + canonical JSON of the arguments (sorted keys, compact
+  separators), so `{"a": 1, "b": 2}` and `{"b":2,"a":1}` share an entry.
+  Arguments are first coerced by `canonical(tool_name, arguments)` – by
+  default the wrapped executor's own, e.g. `ToolRegistry.canonical` – so
+  `{"user": "5"}` and `{"user": 5}` share one too;
+• only tools given a `CachePolicy` are cached – each has its own TTL and
+  LRU size bound, in memory;
+• with `disk_dir` set, entries are also written to
+  `<disk_dir>/<tool>/<sha256>.json` (same TTL) and survive restarts; a disk
+  hit is promoted to memory;
+• exceptions and `{"status": "error"}` payloads are never cached, so a
+  transient failure is not replayed for the whole TTL.
+
+`ToolCache` is itself a `tool_executor`.  Through `execute()` it also
+returns per-call metadata – `{"cache": "memory"|"disk"|"miss",
+"saved_ms": ...}` – which `ParallelActionExecutor` attaches to the
+submitted tool message (`meta_data`), so savings show up in run metadata.
+`stats()` sums hits, misses and saved time per tool.
+
+    cache = ToolCache(tools, {"get_item_metadata": CachePolicy(ttl_s=3600, max_entries=4096)},
+                      disk_dir=os.getenv("TOOL_CACHE_DIR"))
+    executor = ParallelActionExecutor(cache)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+def _is_error(content: Any) -> bool:
+    if not isinstance(content, str) or '"error"' not in content:
+        return False
+    try:
+        payload = json.loads(content)
+    except ValueError:
+        return False
+    return isinstance(payload, dict) and payload.get("status") == "error"
+
+
+def cache_key(tool_name: str, arguments: Dict[str, Any]) -> str:
+    canonical = json.dumps(arguments or {}, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(f"{tool_name}\x00{canonical}".encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CachePolicy:
+    ttl_s: float = 300.0
+    max_entries: int = 1024
+
+
+@dataclass
+class CacheEntry:
+    content: str
+    expires_at: float           # wall clock, so disk entries stay valid across processes
+    ms: float                   # execution time of the original call
+
+
+@dataclass
+class ToolStats:
+    hits_memory: int = 0
+    hits_disk: int = 0
+    misses: int = 0
+    saved_ms: float = 0.0
+
+
+@dataclass
+class _ToolTier:
+    policy: CachePolicy
+    entries: "OrderedDict[str, CacheEntry]" = field(default_factory=OrderedDict)
+    stats: ToolStats = field(default_factory=ToolStats)
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+
+class ToolCache:
+    def __init__(
+        self,
+        tool_executor: Callable[[str, dict], str],
+        policies: Dict[str, CachePolicy],
+        *,
+        disk_dir: Optional[os.PathLike] = None,
+        canonical: Optional[Callable[[str, dict], dict]] = None,
+    ):
+        self.tool_executor = tool_executor
+        self.canonical = canonical or getattr(tool_executor, "canonical", None)
+        self._tiers = {name: _ToolTier(policy) for name, policy in policies.items()}
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+
+    # ─── disk tier ──────────────────────────────────────────────────────────
+    def _disk_path(self, tool_name: str, key: str) -> Path:
+        return self.disk_dir / tool_name / f"{key}.json"
+
+    def _disk_get(self, tool_name: str, key: str) -> Optional[CacheEntry]:
+        if self.disk_dir is None:
+            return None
+        try:
+            entry = CacheEntry(**json.loads(self._disk_path(tool_name, key).read_text(encoding="utf-8")))
+        except (OSError, ValueError, TypeError):
+            return None
+        return entry if entry.expires_at > time.time() else None
+
+    def _disk_put(self, tool_name: str, key: str, entry: CacheEntry) -> None:
+        if self.disk_dir is None:
+            return
+        path = self._disk_path(tool_name, key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".{threading.get_ident()}.tmp")
+            tmp.write_text(json.dumps(entry.__dict__), encoding="utf-8")
+            os.replace(tmp, path)
+        except OSError:
+            pass                                            # the disk tier is best-effort
+
+    # ─── lookup ─────────────────────────────────────────────────────────────
+    def execute(self, tool_name: str, arguments: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+        """Tool output plus cache metadata (empty for tools without a policy)."""
+        tier = self._tiers.get(tool_name)
+        if tier is None:
+            return self.tool_executor(tool_name, arguments), {}
+
+        key = cache_key(tool_name, self.canonical(tool_name, arguments) if self.canonical else arguments)
+        now = time.time()
+        with tier.lock:
+            entry = tier.entries.get(key)
+            if entry is not None and entry.expires_at > now:
+                tier.entries.move_to_end(key)
+                tier.stats.hits_memory += 1
+                tier.stats.saved_ms += entry.ms
+                return entry.content, {"cache": "memory", "saved_ms": round(entry.ms, 1)}
+            if entry is not None:
+                del tier.entries[key]
+
+        source = "disk"
+        entry = self._disk_get(tool_name, key)
+        if entry is None:
+            source = "miss"
+            t0 = time.perf_counter()
+            content = self.tool_executor(tool_name, arguments)
+            ms = (time.perf_counter() - t0) * 1000
+            if _is_error(content):
+                with tier.lock:
+                    tier.stats.misses += 1
+                return content, {"cache": "miss", "ms": round(ms, 1)}
+            entry = CacheEntry(content, time.time() + tier.policy.ttl_s, ms)
+            self._disk_put(tool_name, key, entry)
+
+        with tier.lock:
+            tier.entries[key] = entry
+            tier.entries.move_to_end(key)
+            while len(tier.entries) > tier.policy.max_entries:
+                tier.entries.popitem(last=False)
+            if source == "disk":
+                tier.stats.hits_disk += 1
+                tier.stats.saved_ms += entry.ms
+            else:
+                tier.stats.misses += 1
+
+        if source == "disk":
+            return entry.content, {"cache": "disk", "saved_ms": round(entry.ms, 1)}
+        return entry.content, {"cache": "miss", "ms": round(entry.ms, 1)}
+
+    def __call__(self, tool_name: str, arguments: Dict[str, Any]) -> str:
+        return self.execute(tool_name, arguments)[0]
+
+    def invalidate(self, tool_name: Optional[str] = None) -> None:
+        """Drop the in-memory entries of `tool_name` (default: every tool)."""
+        for name, tier in self._tiers.items():
+            if tool_name is None or name == tool_name:
+                with tier.lock:
+                    tier.entries.clear()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            name: {**tier.stats.__dict__, "saved_ms": round(tier.stats.saved_ms, 1), "entries": len(tier.entries)}
+            for name, tier in self._tiers.items()
+        }
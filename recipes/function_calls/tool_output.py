@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Size-budgeted, compact tool outputs.
+
+A tool result is pasted into the prompt of the follow-up turn, so every
+byte of it is prompt the model has to read before its first token.
+`OutputShaper` turns a result dict with a list of records (e.g.
+`{"status": "success", "results": [...]}`) into the smallest JSON that
+still answers the call:
+
+1. always drops `omit` fields (e.g. `rank`, which list order already says),
+   rounds floats to `float_digits`, cuts strings longer than `max_str` and
+   serialises without whitespace;
+2. while the output is over budget, drops the `drop_order` fields one at a
+   time from every record (lowest value first);
+3. if it is still over budget, keeps the longest prefix of records that
+   fits (binary search – records are assumed ranked best first) and adds
+   `"truncated": {"shown", "total"}` so the model knows more existed.
+
+Every step is a pure function of the payload and the settings, so the same
+result always shapes to the same output.  The budget is `max_bytes`, or
+`max_tokens` at `BYTES_PER_TOKEN`; `ShapeReport` records sizes before and
+after and what was removed.
+
+    shaper = OutputShaper(max_tokens=300, omit=("rank",), drop_order=("score", "genres"))
+    text, report = shaper.dumps({"status": "success", "results": results})
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+BYTES_PER_TOKEN = 4         # rough figure for English / JSON with a BPE tokenizer
+
+
+def _size(text: str) -> int:
+    return len(text.encode("utf-8"))
+
+
+@dataclass
+class ShapeReport:
+    original_bytes: int = 0
+    shaped_bytes: int = 0
+    budget_bytes: Optional[int] = None
+    records_in: int = 0
+    records_out: int = 0
+    dropped_fields: List[str] = field(default_factory=list)
+
+    @property
+    def saved_bytes(self) -> int:
+        return self.original_bytes - self.shaped_bytes
+
+    @property
+    def truncated(self) -> bool:
+        return self.records_out < self.records_in
+
+    def summary(self) -> str:
+        pct = 100.0 * self.saved_bytes / self.original_bytes if self.original_bytes else 0.0
+        parts = [
+            f"{self.original_bytes} → {self.shaped_bytes} B (-{pct:.0f}%, "
+            f"~{self.shaped_bytes // BYTES_PER_TOKEN} tokens)"
+        ]
+        if self.dropped_fields:
+            parts.append(f"dropped {','.join(self.dropped_fields)}")
+        if self.truncated:
+            parts.append(f"kept {self.records_out}/{self.records_in} records")
+        return "  ".join(parts)
+
+
+class OutputShaper:
+    def __init__(
+        self,
+        *,
+        max_bytes: Optional[int] = None,
+        max_tokens: Optional[int] = None,
+        list_key: str = "results",
+        omit: Sequence[str] = (),
+        drop_order: Sequence[str] = (),
+        float_digits: int = 3,
+        max_str: Optional[int] = None,
+    ):
+        if max_bytes is None and max_tokens is not None:
+            max_bytes = max_tokens * BYTES_PER_TOKEN
+        self.max_bytes = max_bytes
+        self.list_key = list_key
+        self.omit = frozenset(omit)
+        self.drop_order = tuple(drop_order)
+        self.float_digits = float_digits
+        self.max_str = max_str
+
+    # ─── compaction ─────────────────────────────────────────────────────────
+    def _compact(self, value: Any) -> Any:
+        if isinstance(value, float):
+            return round(value, self.float_digits)
+        if isinstance(value, str) and self.max_str is not None and len(value) > self.max_str:
+            return value[: self.max_str - 1] + "…"
+        if isinstance(value, dict):
+            return {k: self._compact(v) for k, v in value.items() if k not in self.omit}
+        if isinstance(value, (list, tuple)):
+            return [self._compact(v) for v in value]
+        return value
+
+    @staticmethod
+    def _encode(payload: Dict[str, Any]) -> str:
+        return json.dumps(payload, separators=(",", ":"), ensure_ascii=False)
+
+    def _fits(self, text: str) -> bool:
+        return self.max_bytes is None or _size(text) <= self.max_bytes
+
+    # ─── shaping ────────────────────────────────────────────────────────────
+    def dumps(self, payload: Dict[str, Any]) -> Tuple[str, ShapeReport]:
+        records = payload.get(self.list_key)
+        records = list(records) if isinstance(records, list) else []
+        report = ShapeReport(
+            original_bytes=_size(json.dumps(payload)),
+            budget_bytes=self.max_bytes,
+            records_in=len(records),
+            records_out=len(records),
+        )
+
+        shaped = self._compact(payload)
+        text = self._encode(shaped)
+
+        rows = shaped.get(self.list_key) if isinstance(shaped.get(self.list_key), list) else None
+        for name in self.drop_order:
+            if self._fits(text) or rows is None:
+                break
+            if any(isinstance(r, dict) and name in r for r in rows):
+                rows = [{k: v for k, v in r.items() if k != name} if isinstance(r, dict) else r for r in rows]
+                shaped[self.list_key] = rows
+                report.dropped_fields.append(name)
+                text = self._encode(shaped)
+
+        if not self._fits(text) and rows:
+            def _with(n: int) -> str:
+                head = {**shaped, self.list_key: rows[:n]}
+                head["truncated"] = {"shown": n, "total": len(rows)}
+                return self._encode(head)
+
+            lo, hi = 0, len(rows) - 1                          # largest n < len(rows) that fits
+            while lo < hi:
+                mid = (lo + hi + 1) // 2
+                if self._fits(_with(mid)):
+                    lo = mid
+                else:
+                    hi = mid - 1
+            text = _with(lo)
+            report.records_out = lo
+
+        report.shaped_bytes = _size(text)
+        return text, report
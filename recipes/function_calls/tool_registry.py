@@ -0,0 +1,417 @@
+#!/usr/bin/env python3
+"""
+Tool-executor registry with warm, shared resources.
+
+A tool executor is usually a cheap function sitting on top of expensive
+state – an SDK client, an embedding model, an index, a trained recommender.
+Building that state inside the executor (or at import, in a fixed order)
+puts its cost on the first tool call or on script start-up.
+
+• `ResourceRegistry` – named resources, each built by a factory exactly
+  once (per-resource lock, so concurrent first callers wait for the same
+  build instead of racing), shared by every tool and thread, optionally
+  health-checked.  Checks never run inside `get()`: `warm()` starts a
+  daemon thread that runs each check every `check_every_s` and rebuilds a
+  failing resource in the background, swapping it in when ready.
+• `ToolRegistry` – maps tool names to handlers and the resources each one
+  declares.  It is itself a valid `tool_executor` for
+  `runs.poll_and_execute_action` (`registry(tool_name, arguments)`), and
+  `warm()` builds every declared resource up front, in parallel, so a tool
+  call costs only its own work.
+• Tools registered with their function schema (`@tools.tool(SCHEMA)` or
+  `register(..., schema=SCHEMA)`) get arguments checked and coerced by a
+  validator compiled once from the schema (`compile_schema`): "5" → 5 for
+  integers, a lone string → [string] for arrays, defaults filled in.  Bad
+  arguments are answered with an error payload naming the offending field
+  instead of reaching the handler.
+
+    resources = ResourceRegistry()
+    resources.register("searcher", lambda: StoreSearcher(client),
+                       health_check=lambda s: s.healthy(STORE_ID))
+
+    tools = ToolRegistry(resources)
+
+    @tools.tool(SEARCH_MOVIES, resources=("searcher",))
+    def search_movies(arguments, *, searcher): ...
+
+    tools.warm()
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+# ─── resources ──────────────────────────────────────────────────────────────
+@dataclass
+class Resource:
+    name: str
+    factory: Callable[[], Any]
+    health_check: Optional[Callable[[Any], bool]] = None
+    check_every_s: float = 30.0
+    value: Any = None
+    ready: bool = False
+    init_ms: Optional[float] = None
+    builds: int = 0
+    last_check: float = 0.0
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+
+class ResourceRegistry:
+    def __init__(self) -> None:
+        self._resources: Dict[str, Resource] = {}
+        self._monitor: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def register(
+        self,
+        name: str,
+        factory: Callable[[], Any],
+        *,
+        health_check: Optional[Callable[[Any], bool]] = None,
+        check_every_s: float = 30.0,
+    ) -> None:
+        if name in self._resources:
+            raise ValueError(f"resource '{name}' already registered")
+        self._resources[name] = Resource(name, factory, health_check, check_every_s)
+
+    def _build(self, res: Resource) -> None:
+        t0 = time.perf_counter()
+        res.value = res.factory()
+        res.init_ms = (time.perf_counter() - t0) * 1000
+        res.builds += 1
+        res.last_check = time.monotonic()
+        res.ready = True
+
+    def _healthy(self, res: Resource) -> bool:
+        try:
+            return bool(res.health_check(res.value))
+        except Exception:
+            return False
+
+    def get(self, name: str) -> Any:
+        res = self._resources[name]
+        if res.ready:
+            return res.value                              # fast path: no lock
+        with res.lock:
+            if not res.ready:
+                self._build(res)
+        return res.value
+
+    def warm(self, names: Optional[Iterable[str]] = None) -> Dict[str, float]:
+        """
+        Build `names` (default: all) in parallel and start the health monitor;
+        returns init time per resource.
+        """
+        names = list(self._resources if names is None else dict.fromkeys(names))
+        if names:
+            with ThreadPoolExecutor(max_workers=len(names), thread_name_prefix="warm") as pool:
+                list(pool.map(self.get, names))
+        self.monitor()
+        return {n: self._resources[n].init_ms for n in names}
+
+    # ─── health monitor ─────────────────────────────────────────────────────
+    def check_due(self) -> None:
+        """Run every health check that is due; rebuild (off the call path) what fails."""
+        for res in list(self._resources.values()):
+            if not res.ready or res.health_check is None:
+                continue
+            if time.monotonic() - res.last_check < res.check_every_s:
+                continue
+            if self._healthy(res):
+                res.last_check = time.monotonic()
+                continue
+            with res.lock:                                # callers keep the old value until swapped
+                try:
+                    self._build(res)
+                except Exception as exc:
+                    res.last_check = time.monotonic()     # retry at the next interval
+                    print(f"[resources] rebuilding '{res.name}' failed: {exc}")
+
+    def monitor(self, interval_s: float = 1.0) -> None:
+        """Start the background health-check thread (no-op without checks or if running)."""
+        if self._monitor is not None or not any(r.health_check for r in self._resources.values()):
+            return
+
+        def _loop() -> None:
+            while not self._stop.wait(interval_s):
+                self.check_due()
+
+        self._monitor = threading.Thread(target=_loop, name="resource-health", daemon=True)
+        self._monitor.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def health(self) -> Dict[str, str]:
+        """`ok` / `failing` / `unchecked` / `cold` per resource (checks run now)."""
+        out = {}
+        for name, res in self._resources.items():
+            if not res.ready:
+                out[name] = "cold"
+            elif res.health_check is None:
+                out[name] = "unchecked"
+            else:
+                out[name] = "ok" if self._healthy(res) else "failing"
+        return out
+
+
+# ─── argument schemas ───────────────────────────────────────────────────────
+class ToolArgumentError(ValueError):
+    """Arguments that do not match the tool schema; the message names the field."""
+
+
+Check = Callable[[Any, str], Any]
+
+
+def _fail(path: str, message: str):
+    raise ToolArgumentError(f"{path or 'arguments'}: {message}")
+
+
+def tool_parameters(schema: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+    """`(name, parameters)` of a function schema, with or without the `{"function": …}` wrapper."""
+    fn = schema.get("function", schema)
+    return fn["name"], fn.get("parameters") or {"type": "object"}
+
+
+def _string(schema: Dict[str, Any]) -> Check:
+    def check(value, path):
+        if isinstance(value, str):
+            return value
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return str(value)
+        _fail(path, f"expected a string, got {type(value).__name__}")
+    return check
+
+
+def _integer(schema: Dict[str, Any]) -> Check:
+    def check(value, path):
+        if isinstance(value, int) and not isinstance(value, bool):
+            return value
+        if isinstance(value, float) and value.is_integer():
+            return int(value)
+        if isinstance(value, str):
+            try:
+                return int(value.strip())
+            except ValueError:
+                pass
+        _fail(path, f"expected an integer, got {value!r}")
+    return check
+
+
+def _number(schema: Dict[str, Any]) -> Check:
+    def check(value, path):
+        number = None
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            number = value
+        elif isinstance(value, str):
+            try:
+                number = float(value.strip())
+            except ValueError:
+                pass
+        if number is None or (isinstance(number, float) and not math.isfinite(number)):  # NaN passes any min/max
+            _fail(path, f"expected a finite number, got {value!r}")
+        return number
+    return check
+
+
+def _boolean(schema: Dict[str, Any]) -> Check:
+    words = {"true": True, "false": False}
+
+    def check(value, path):
+        if isinstance(value, bool):
+            return value
+        if isinstance(value, str) and value.strip().lower() in words:
+            return words[value.strip().lower()]
+        _fail(path, f"expected a boolean, got {value!r}")
+    return check
+
+
+def _array(schema: Dict[str, Any]) -> Check:
+    item = compile_schema(schema["items"]) if "items" in schema else None
+
+    def check(value, path):
+        if not isinstance(value, (list, tuple)):
+            value = [value]                                  # "sci-fi" → ["sci-fi"]
+        if item is None:
+            return list(value)
+        return [item(v, f"{path}[{i}]") for i, v in enumerate(value)]
+    return check
+
+
+def _object(schema: Dict[str, Any]) -> Check:
+    props = {name: compile_schema(sub) for name, sub in (schema.get("properties") or {}).items()}
+    required = tuple(schema.get("required") or ())
+    defaults = {
+        name: sub["default"] for name, sub in (schema.get("properties") or {}).items()
+        if isinstance(sub, dict) and "default" in sub
+    }
+    closed = schema.get("additionalProperties") is False
+
+    def check(value, path):
+        if isinstance(value, str):
+            try:
+                value = json.loads(value)
+            except ValueError:
+                pass
+        if not isinstance(value, dict):
+            _fail(path, f"expected an object, got {type(value).__name__}")
+        prefix = f"{path}." if path else ""
+        out = {}
+        for name, v in value.items():
+            sub = props.get(name)
+            if sub is not None:
+                out[name] = None if v is None else sub(v, prefix + name)
+            elif closed:
+                _fail(prefix + name, "unexpected field")
+            else:
+                out[name] = v
+        for name, v in defaults.items():
+            if out.get(name) is None:
+                out[name] = copy.deepcopy(v)
+        for name in required:
+            if out.get(name) is None:
+                _fail(prefix + name, "required")
+        return out
+    return check
+
+
+_TYPES: Dict[str, Callable[[Dict[str, Any]], Check]] = {
+    "string": _string,
+    "integer": _integer,
+    "number": _number,
+    "boolean": _boolean,
+    "array": _array,
+    "object": _object,
+}
+
+
+def compile_schema(schema: Dict[str, Any]) -> Check:
+    """
+    Compile a JSON-schema fragment into `check(value, path) -> value`.
+
+    Handles `type`, `properties` / `required` / `default`,
+    `additionalProperties: false`, `items`, `enum`, `minimum` / `maximum`
+    and `oneOf` / `anyOf` (first matching branch wins).  The schema is
+    walked once here; checking a value only runs the prebuilt closures.
+    """
+    branches = schema.get("oneOf") or schema.get("anyOf")
+    if branches:
+        options = [compile_schema(b) for b in branches]
+
+        def check_any(value, path):
+            errors = []
+            for option in options:
+                try:
+                    return option(value, path)
+                except ToolArgumentError as exc:
+                    errors.append(str(exc))
+            _fail(path, "matches no alternative (" + "; ".join(errors) + ")")
+        return check_any
+
+    make = _TYPES.get(schema.get("type"))
+    base: Check = make(schema) if make else (lambda value, path: value)
+    enum = list(schema["enum"]) if "enum" in schema else None   # a list: values may be unhashable
+    lo, hi = schema.get("minimum"), schema.get("maximum")
+    if enum is None and lo is None and hi is None:
+        return base
+
+    def check(value, path):
+        value = base(value, path)
+        if enum is not None and value not in enum:
+            _fail(path, f"{value!r} is not one of {enum}")
+        try:
+            if lo is not None and value < lo:
+                _fail(path, f"{value!r} is below the minimum {lo}")
+            if hi is not None and value > hi:
+                _fail(path, f"{value!r} is above the maximum {hi}")
+        except TypeError:                                  # untyped schema, non-numeric value
+            _fail(path, f"{value!r} is not a number")
+        return value
+    return check
+
+
+# ─── tools ──────────────────────────────────────────────────────────────────
+@dataclass
+class Tool:
+    name: str
+    handler: Callable[..., str]
+    resources: Sequence[str] = ()
+    schema: Optional[Dict[str, Any]] = None
+    check: Optional[Check] = field(default=None, repr=False)
+
+
+class ToolRegistry:
+    def __init__(self, resources: Optional[ResourceRegistry] = None):
+        self.resources = resources or ResourceRegistry()
+        self._tools: Dict[str, Tool] = {}
+
+    def register(
+        self,
+        name: str,
+        handler: Callable[..., str],
+        *,
+        resources: Sequence[str] = (),
+        schema: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """
+        `handler(arguments, **{resource: value})` must return the tool's JSON
+        string.  With `schema`, `arguments` are validated and coerced first.
+        """
+        check = compile_schema(tool_parameters(schema)[1]) if schema else None
+        self._tools[name] = Tool(name, handler, tuple(resources), schema, check)
+
+    def tool(
+        self,
+        schema: Optional[Dict[str, Any]] = None,
+        *,
+        name: Optional[str] = None,
+        resources: Sequence[str] = (),
+    ) -> Callable[[Callable[..., str]], Callable[..., str]]:
+        """Decorator form of `register`; the tool name is `name`, the schema's, or the function's."""
+        def decorate(handler: Callable[..., str]) -> Callable[..., str]:
+            tool_name = name or (tool_parameters(schema)[0] if schema else handler.__name__)
+            self.register(tool_name, handler, resources=resources, schema=schema)
+            return handler
+        return decorate
+
+    @property
+    def names(self) -> List[str]:
+        return list(self._tools)
+
+    def schemas(self) -> List[Dict[str, Any]]:
+        return [t.schema for t in self._tools.values() if t.schema is not None]
+
+    def canonical(self, tool_name: str, arguments: dict) -> dict:
+        """`arguments` as the handler would see them (coerced, defaults filled); unchanged if invalid."""
+        tool = self._tools.get(tool_name)
+        if tool is None or tool.check is None:
+            return arguments
+        try:
+            return tool.check(arguments or {}, "")
+        except ToolArgumentError:
+            return arguments
+
+    def __call__(self, tool_name: str, arguments: dict) -> str:
+        tool = self._tools.get(tool_name)
+        if tool is None:
+            return json.dumps({"status": "error", "message": f"unknown tool '{tool_name}'"})
+        if tool.check is not None:
+            try:
+                arguments = tool.check(arguments or {}, "")
+            except ToolArgumentError as exc:
+                return json.dumps({"status": "error", "message": f"invalid arguments for '{tool_name}': {exc}"})
+        deps = {r: self.resources.get(r) for r in tool.resources}
+        return tool.handler(arguments, **deps)
+
+    def warm(self) -> Dict[str, float]:
+        """Build every resource any registered tool declares."""
+        needed = [r for tool in self._tools.values() for r in tool.resources]
+        return self.resources.warm(needed)
@@ -0,0 +1,79 @@
+"""
+Function-tool schemas shared by the scripts that register a tool with the
+API and the scripts that execute it locally (`ToolRegistry.tool(schema)`
+validates incoming arguments against the same definition).
+"""
+
+FLIGHT_TIMES = {
+    "name": "get_flight_times",
+    "description": "Return flight times between two airport codes.",
+    "parameters": {
+        "type": "object",
+        "properties": {
+            "departure": {
+                "type": "string",
+                "description": "IATA code for the departure airport."
+            },
+            "arrival": {
+                "type": "string",
+                "description": "IATA code for the arrival airport."
+            }
+        },
+        "required": ["departure", "arrival"]
+    }
+}
+
+SEARCH_MOVIES = {
+    "name": "search_movies",
+    "description": "Semantic search in the MovieLens vector store",
+    "parameters": {
+        "type": "object",
+        "properties": {
+            "query": {
+                "type": "string",
+                "description": "Freeform user query to search for a movie"
+            },
+            "top_k": {
+                "type": "integer",
+                "description": "How many similar results to return",
+                "default": 5,
+                "minimum": 1
+            },
+            "store_id": {
+                "type": "string",
+                "description": "The vector store to search in"
+            },
+            "user": {
+                "type": "integer",
+                "description": "Optional MovieLens user id to personalise the results for"
+            },
+            "filters": {
+                "type": "object",
+                "description": "Optional vector-store filter, e.g. "
+                               "{\"must\": [{\"key\": \"genres\", \"match\": {\"value\": \"Sci-Fi\"}}]}"
+            }
+        },
+        "required": ["query"]
+    }
+}
+
+SIMILAR_MOVIES = {
+    "name": "similar_movies",
+    "description": "Movies most similar to a given MovieLens item id",
+    "parameters": {
+        "type": "object",
+        "properties": {
+            "item_id": {
+                "type": "integer",
+                "description": "MovieLens item id of the reference movie"
+            },
+            "top_k": {
+                "type": "integer",
+                "description": "How many similar movies to return",
+                "default": 5,
+                "minimum": 1
+            }
+        },
+        "required": ["item_id"]
+    }
+}
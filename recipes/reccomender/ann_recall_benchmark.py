@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Recall-vs-latency benchmark for the MovieLens store's ANN settings.
+
+1. Export every stored vector (`StoreSearcher.scroll_points`).
+2. Compute exact top-k ground truth locally with one brute-force NumPy
+   matmul + argpartition over the exported matrix.
+3. Re-run the same queries for each parameter setting – `exact`, a sweep
+   of `hnsw_ef`, and (if the collection is quantized) quantization
+   rescoring on/off – timing every request.  The Entities search API does
+   not take index parameters, so these go straight to Qdrant's
+   `/points/query` at `QDRANT_URL` (`qdrant_search`).
+4. Print recall@k and latency percentiles per setting and, if matplotlib is
+   installed, plot recall@k against p50 latency.
+
+Queries are the text corpus in `movielens_queries.py` plus `--sample-items`
+stored item vectors used as queries (seeded), so there are enough of them
+for stable recall numbers.
+
+Note: Qdrant only builds an HNSW index once a segment passes its
+`indexing_threshold`; a small collection like ml-100k may be served by
+plain full scan, in which case every setting reports recall 1.0.  The
+collection's index status is printed first so that case is obvious.
+
+    python -m recipes.reccomender.ann_recall_benchmark --k 10 --ef 8,16,32,64,128 --plot ann.png
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+
+import numpy as np
+from dotenv import load_dotenv
+from projectdavid import Entity
+
+from recipes.reccomender.movielens_queries import QUERIES
+from recipes.reccomender.movielens_search import StoreSearcher
+from recipes.reccomender.search_timing import LatencyHistogram
+
+DEFAULT_STORE_ID = "vect_mqfWyNlZbacer73PQu4Upy"
+
+
+@dataclass
+class SweepPoint:
+    label: str
+    params: Dict[str, Any]
+    recalls: List[float] = field(default_factory=list)
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+    @property
+    def recall(self) -> float:
+        return float(np.mean(self.recalls)) if self.recalls else 0.0
+
+
+# ─── ground truth ───────────────────────────────────────────────────────────
+def export_matrix(searcher: StoreSearcher, store_id: str):
+    ids, rows = [], []
+    for p in searcher.scroll_points(store_id, include=[], with_vector=True):
+        ids.append(p["id"])
+        rows.append(p["vector"])
+    matrix = np.asarray(rows, dtype=np.float32)
+    matrix /= np.linalg.norm(matrix, axis=1, keepdims=True) + 1e-12
+    return ids, matrix
+
+
+def exact_top_k(matrix: np.ndarray, queries: np.ndarray, k: int) -> np.ndarray:
+    """Row i = indices of the k best cosine matches for query i (unordered)."""
+    scores = queries @ matrix.T
+    return np.argpartition(-scores, k - 1, axis=1)[:, :k]
+
+
+def build_sweep(ef_values: List[int], quantized: bool) -> List[SweepPoint]:
+    points = [SweepPoint("exact", {"exact": True})]
+    points += [SweepPoint(f"ef={ef}", {"hnsw_ef": ef}) for ef in ef_values]
+    if quantized:
+        for ef in ef_values:
+            for rescore in (False, True):
+                points.append(
+                    SweepPoint(
+                        f"ef={ef} q-rescore={'on' if rescore else 'off'}",
+                        {"hnsw_ef": ef, "quantization": {"rescore": rescore}},
+                    )
+                )
+    return points
+
+
+def qdrant_search(
+    searcher: StoreSearcher, store_id: str, vector: List[float], k: int, params: Dict[str, Any]
+) -> List[Dict[str, Any]]:
+    body: Dict[str, Any] = {"query": vector, "limit": k, "with_payload": False, "params": params}
+    field = searcher.vector_field(store_id)
+    if field:
+        body["using"] = field
+    resp = searcher.qdrant.post(f"/collections/{searcher.collection_for(store_id)}/points/query", json=body)
+    resp.raise_for_status()
+    return resp.json()["result"]["points"]
+
+
+# ─── reporting ──────────────────────────────────────────────────────────────
+def print_table(points: List[SweepPoint], k: int) -> None:
+    print(f"\n{'setting':<28} {'recall@' + str(k):>10} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for pt in points:
+        h = pt.latency
+        print(
+            f"{pt.label:<28} {pt.recall:>10.4f} {h.percentile(50):>8.2f} "
+            f"{h.percentile(95):>8.2f} {h.percentile(99):>8.2f}"
+        )
+
+
+def plot(points: List[SweepPoint], k: int, path: str) -> None:
+    try:
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+    except ImportError:
+        print("matplotlib not installed – skipping plot")
+        return
+
+    fig, ax = plt.subplots(figsize=(7, 4.5))
+    for pt in points:
+        ax.scatter(pt.latency.percentile(50), pt.recall)
+        ax.annotate(pt.label, (pt.latency.percentile(50), pt.recall), fontsize=7,
+                    xytext=(4, 2), textcoords="offset points")
+    ax.set_xlabel("p50 latency (ms)")
+    ax.set_ylabel(f"recall@{k}")
+    ax.set_title("MovieLens ANN recall vs latency")
+    ax.grid(True, alpha=0.3)
+    fig.tight_layout()
+    fig.savefig(path, dpi=150)
+    print(f"📈  plot written to {path}")
+
+
+# ─── main ───────────────────────────────────────────────────────────────────
+def main() -> None:
+    ap = argparse.ArgumentParser(description="ANN recall vs latency on MovieLens")
+    ap.add_argument("--store-id", default=DEFAULT_STORE_ID)
+    ap.add_argument("--k", type=int, default=10)
+    ap.add_argument("--ef", default="8,16,32,64,128,256", help="hnsw_ef values to sweep")
+    ap.add_argument("--sample-items", type=int, default=200, help="stored vectors reused as queries")
+    ap.add_argument("--repeats", type=int, default=3, help="timed passes per setting")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--plot", help="write recall/latency scatter to this PNG")
+    args = ap.parse_args()
+
+    load_dotenv()
+    client = Entity(
+        base_url=os.getenv("BASE_URL", "http://localhost:9000"),
+        api_key=os.getenv("ENTITIES_API_KEY"),
+    )
+    searcher = StoreSearcher(client)
+
+    info = searcher.collection_info(args.store_id)
+    quantized = bool(info.get("config", {}).get("quantization_config"))
+    print(
+        f"collection: points={info.get('points_count')} "
+        f"indexed={info.get('indexed_vectors_count')} "
+        f"hnsw={info.get('config', {}).get('hnsw_config')} quantized={quantized}"
+    )
+    if not info.get("indexed_vectors_count"):
+        print("⚠  no HNSW index built yet – searches are full scans, expect recall 1.0 everywhere")
+
+    t0 = time.perf_counter()
+    ids, matrix = export_matrix(searcher, args.store_id)
+    print(f"exported {len(ids)} vectors (dim={matrix.shape[1]}) in {time.perf_counter() - t0:.1f}s")
+
+    rng = np.random.default_rng(args.seed)
+    sampled = rng.choice(len(ids), size=min(args.sample_items, len(ids)), replace=False)
+    text_vecs = np.asarray([searcher.encode(q, store_id=args.store_id) for q in QUERIES], dtype=np.float32)
+    queries = np.vstack([text_vecs, matrix[sampled]])
+
+    t0 = time.perf_counter()
+    truth = exact_top_k(matrix, queries, args.k)
+    print(f"ground truth for {len(queries)} queries in {(time.perf_counter() - t0) * 1000:.1f} ms")
+    truth_ids = [{ids[j] for j in row} for row in truth]
+
+    points = build_sweep([int(v) for v in args.ef.split(",")], quantized)
+    for pt in points:
+        for rep in range(args.repeats):
+            for qi, qvec in enumerate(queries):
+                t = time.perf_counter()
+                hits = qdrant_search(searcher, args.store_id, qvec.tolist(), args.k, pt.params)
+                pt.latency.record((time.perf_counter() - t) * 1000)
+                if rep == 0:
+                    got = {h["id"] for h in hits}
+                    pt.recalls.append(len(got & truth_ids[qi]) / args.k)
+
+    print_table(points, args.k)
+    if args.plot:
+        plot(points, args.k, args.plot)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Offline batch recommendations for every MovieLens user.
+
+• Users are split into contiguous shards and scored on a process pool; each
+  worker loads the saved ALS factors once (pool initializer).
+• A shard is scored with one `shard × items` matmul.  Already-rated items
+  are knocked out in a single fancy-index assignment driven by the shard's
+  slice of the sparse rating matrix, then one row-wise `argpartition` +
+  sort yields every user's top-k.
+• Results are written column-wise to a directory of `.npy` files (row =
+  user_id - 1) that the `get_top_k_recommendations` handler memory-maps:
+
+      item_ids.npy   int32   [n_users, K]
+      scores.npy     float32 [n_users, K]
+      meta.json      {"k", "users", "model"}
+
+  A user with fewer than K unrated items gets a shorter list: the unused
+  slots hold item_id 0 (`PAD_ITEM`, not a MovieLens id) and are skipped by
+  the reader and the parquet export.
+
+  `--parquet` additionally writes a long-format (user_id, rank, item_id,
+  score) table for analytics (needs pandas + pyarrow).
+
+    python -m recipes.reccomender.batch_recommend --k 100 --workers 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from recipes.reccomender.cf_recommender import DEFAULT_MODEL_PATH, ALSRecommender, load_or_train
+from recipes.reccomender.movielens_data import ARTIFACT_DIR
+
+DEFAULT_OUT_DIR = ARTIFACT_DIR / "batch_recommendations"
+PAD_ITEM = 0                # item_id of unused slots (MovieLens ids start at 1)
+
+_MODEL: Optional[ALSRecommender] = None
+
+
+# ─── worker ─────────────────────────────────────────────────────────────────
+def _init_worker(model_path: str) -> None:
+    global _MODEL
+    _MODEL = ALSRecommender.load(Path(model_path))
+
+
+def score_shard(model: ALSRecommender, lo: int, hi: int, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Top-`k` (item_ids, scores) for user rows `lo:hi`; rated items become `PAD_ITEM` slots."""
+    scores = model.user_factors[lo:hi] @ model.item_factors.T          # (shard, items)
+    rows, cols = model.seen[lo:hi].nonzero()
+    scores[rows, cols] = -np.inf
+
+    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    top_scores = np.take_along_axis(scores, top, axis=1)
+    order = np.argsort(-top_scores, axis=1)
+    ids = (np.take_along_axis(top, order, axis=1) + 1).astype(np.int32)
+    top_scores = np.take_along_axis(top_scores, order, axis=1).astype(np.float32)
+    rated = ~np.isfinite(top_scores)                  # k > unrated count: masked items reached the top-k
+    ids[rated] = PAD_ITEM
+    top_scores[rated] = 0.0
+    return ids, top_scores
+
+
+def _run_shard(bounds: Tuple[int, int, int]) -> Tuple[int, np.ndarray, np.ndarray]:
+    lo, hi, k = bounds
+    ids, scores = score_shard(_MODEL, lo, hi, k)
+    return lo, ids, scores
+
+
+# ─── job ────────────────────────────────────────────────────────────────────
+def run_batch(
+    model_path: Path = DEFAULT_MODEL_PATH,
+    out_dir: Path = DEFAULT_OUT_DIR,
+    *,
+    k: int = 100,
+    shard_size: int = 256,
+    workers: Optional[int] = None,
+) -> Path:
+    model = load_or_train(model_path)
+    n_users, n_items = model.user_factors.shape[0], model.item_factors.shape[0]
+    k = min(k, n_items)
+
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    item_ids = np.lib.format.open_memmap(out_dir / "item_ids.npy", mode="w+", dtype=np.int32, shape=(n_users, k))
+    scores = np.lib.format.open_memmap(out_dir / "scores.npy", mode="w+", dtype=np.float32, shape=(n_users, k))
+
+    shards = [(lo, min(lo + shard_size, n_users), k) for lo in range(0, n_users, shard_size)]
+    with ProcessPoolExecutor(
+        max_workers=workers or os.cpu_count(),
+        initializer=_init_worker,
+        initargs=(str(model_path),),
+    ) as pool:
+        for lo, ids, sc in pool.map(_run_shard, shards):
+            item_ids[lo:lo + len(ids)] = ids
+            scores[lo:lo + len(sc)] = sc
+
+    item_ids.flush()
+    scores.flush()
+    (out_dir / "meta.json").write_text(json.dumps({"k": k, "users": n_users, "model": str(model_path)}))
+    return out_dir
+
+
+def write_parquet(out_dir: Path, path: Path) -> None:
+    import pandas as pd
+
+    item_ids = np.load(out_dir / "item_ids.npy")
+    scores = np.load(out_dir / "scores.npy")
+    n_users, k = item_ids.shape
+    df = pd.DataFrame({
+        "user_id": np.repeat(np.arange(1, n_users + 1, dtype=np.int32), k),
+        "rank": np.tile(np.arange(1, k + 1, dtype=np.int16), n_users),
+        "item_id": item_ids.ravel(),
+        "score": scores.ravel(),
+    })
+    df[df["item_id"] != PAD_ITEM].to_parquet(path, index=False)
+
+
+# ─── serving ────────────────────────────────────────────────────────────────
+class BatchRecommendations:
+    """Memory-mapped reader for a `run_batch` output directory."""
+
+    def __init__(self, out_dir: Path = DEFAULT_OUT_DIR):
+        out_dir = Path(out_dir)
+        self.meta = json.loads((out_dir / "meta.json").read_text())
+        self.item_ids = np.load(out_dir / "item_ids.npy", mmap_mode="r")
+        self.scores = np.load(out_dir / "scores.npy", mmap_mode="r")
+
+    @property
+    def k(self) -> int:
+        return self.meta["k"]
+
+    def top_k(self, user_id: int, k: int = 5) -> List[Tuple[int, float]]:
+        """Precomputed `(item_id, score)` for a 1-based user; KeyError if unknown."""
+        if not 1 <= user_id <= self.item_ids.shape[0]:
+            raise KeyError(f"unknown user {user_id}")
+        row = user_id - 1
+        k = min(k, self.k)
+        return [
+            (int(i), float(s))
+            for i, s in zip(self.item_ids[row, :k], self.scores[row, :k])
+            if i != PAD_ITEM
+        ]
+
+
+# ─── CLI ────────────────────────────────────────────────────────────────────
+def _positive_int(text: str) -> int:
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {text}")
+    return value
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Precompute top-k recommendations for every user")
+    ap.add_argument("--model", type=Path, default=DEFAULT_MODEL_PATH)
+    ap.add_argument("--out", type=Path, default=DEFAULT_OUT_DIR)
+    ap.add_argument("--k", type=_positive_int, default=100)
+    ap.add_argument("--shard-size", type=_positive_int, default=256)
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--parquet", type=Path, help="also write a long-format parquet table here")
+    args = ap.parse_args()
+
+    t0 = time.perf_counter()
+    out = run_batch(args.model, args.out, k=args.k, shard_size=args.shard_size, workers=args.workers)
+    meta = json.loads((out / "meta.json").read_text())
+    elapsed = time.perf_counter() - t0
+    print(f"top-{meta['k']} for {meta['users']} users in {elapsed:.2f}s "
+          f"({meta['users'] / elapsed:.0f} users/s) → {out}")
+
+    if args.parquet:
+        write_parquet(out, args.parquet)
+        print(f"parquet → {args.parquet}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,22 @@
 #!/usr/bin/env python3
 """
 Run a set of nuanced semantic queries against an existing MovieLens
-vector-store, using the **public VectorStoreClient API** instead of the
-low-level VectorStoreManager.
+vector-store.
 
-• Relies on `vector_file_search_raw()`, which internally handles
-  text-embedding, auto-detects the correct vector field, and applies any
-  patched logic you’ve added to VectorStoreClient.
+• Searches go through `StoreSearcher` (see `movielens_search.py`), which does
+  the same store lookup → embed → search → decode work as
+  `vector_file_search_raw()`, but as separately timed stages.
 • `STORE_ID` must be the *backend store id* (not the collection name).
+• With `PREFILTER=1` (default) genre / release-year constraints found in the
+  query text are sent as store filters (see `query_filters.py`).  If the
+  filtered search comes back empty the query is retried unfiltered.
+• With `RERANK=1` the top `RERANK_N` candidates are re-scored by a local
+  cross-encoder within `RERANK_BUDGET_MS` (see `rerank.py`); over budget the
+  raw vector order is printed instead.
+• Only the payload fields that are printed are fetched (plus `text` when
+  reranking); vectors are never returned.
+• With `TIMINGS=1` (default) a p50/p95/p99 table per search stage is printed
+  after the last query.
 """
 
 from __future__ import annotations
@@ -16,63 +25,86 @@ import os
 from dotenv import load_dotenv
 from projectdavid import Entity
 
+from recipes.reccomender.movielens_queries import QUERIES
+from recipes.reccomender.movielens_search import DISPLAY_FIELDS, StoreSearcher, hit_metadata
+from recipes.reccomender.query_filters import parse_query
+from recipes.reccomender.rerank import CrossEncoderReranker, RerankReport, rerank
+from recipes.reccomender.search_timing import StageTimings
+
 # ─── configuration ──────────────────────────────────────────────────────────
 load_dotenv()
 BASE_URL = os.getenv("BASE_URL", "http://localhost:9000")
 API_KEY  = os.getenv("ENTITIES_API_KEY")
 STORE_ID = "vect_mqfWyNlZbacer73PQu4Upy"        # ← backend id, **not** collection
 TOP_K    = int(os.getenv("TOP_K", "5"))
+PREFILTER = os.getenv("PREFILTER", "1") == "1"
+
+RERANK           = os.getenv("RERANK", "0") == "1"
+RERANK_N         = int(os.getenv("RERANK_N", "50"))
+RERANK_BATCH     = int(os.getenv("RERANK_BATCH", "16"))
+RERANK_BUDGET_MS = float(os.getenv("RERANK_BUDGET_MS", "150"))
 
-client = Entity(base_url=BASE_URL, api_key=API_KEY)
+client   = Entity(base_url=BASE_URL, api_key=API_KEY)
+searcher = StoreSearcher(client)
+reranker = CrossEncoderReranker() if RERANK else None
+reports: list[RerankReport] = []
+timings  = StageTimings() if os.getenv("TIMINGS", "1") == "1" else None
 
-# ─── helper: single search call (uses VectorStoreClient) ────────────────────
-def search(query: str, top_k: int = TOP_K) -> None:
+# ─── helper: single search call ─────────────────────────────────────────────
+def search(query: str, top_k: int = TOP_K, *, prefilter: bool = PREFILTER) -> None:
     print(f"\n🔍  {query}")
-    hits = client.vectors.vector_file_search_raw(
-        vector_store_id = STORE_ID,
-        query_text      = query,
-        top_k           = top_k,
+
+    filters = None
+    if prefilter:
+        constraints = parse_query(query)
+        filters = constraints.to_store_filters()
+        if filters:
+            print(f"   ⛏  pre-filter: {constraints.describe()}")
+
+    fetch_k = max(top_k, RERANK_N) if reranker else top_k
+    include = (*DISPLAY_FIELDS, "text") if reranker else DISPLAY_FIELDS
+    hits = searcher.search(
+        STORE_ID, query, fetch_k, filters=filters, include=include, timings=timings
     )
 
+    if not hits and filters:
+        print("   ↩  no filtered matches – retrying without pre-filter")
+        hits = searcher.search(STORE_ID, query, fetch_k, include=include, timings=timings)
+
     if not hits:
         print("🙈  No results")
         return
 
+    if reranker:
+        hits, report = rerank(
+            query, hits, reranker,
+            top_k      = top_k,
+            budget_ms  = RERANK_BUDGET_MS,
+            batch_size = RERANK_BATCH,
+        )
+        reports.append(report)
+        print(f"   ⚖  rerank: {report.summary()}")
+        if timings is not None:
+            timings.record("rerank", report.total_ms)
+
     for idx, h in enumerate(hits, 1):
-        md      = h.get("meta_data") or h.get("metadata") or {}
+        md      = hit_metadata(h)
         title   = md.get("title", "<untitled>")
         genres  = ", ".join(md.get("genres", [])) or "—"
         year    = md.get("release_year", "—")
         print(f"{idx}. 🎬 {title} — [{genres}] ({year})  score={h['score']:.3f}")
 
-# ─── queries to run ─────────────────────────────────────────────────────────
-QUERIES = [
-    # 🎭 Stylistic & tonal
-    "A film with a whimsical tone but dark undertones, likely animated and aimed at children but emotionally traumatic for adults.",
-    "An ensemble comedy where at least one character wears a trench coat and the score uses saxophones.",
-    "A low-budget 90s drama about unrequited love that never explicitly mentions romance.",
-
-    # 🧠 Temporal & relational
-    "A sci-fi movie made before the year 2000 that was clearly inspired by Blade Runner but takes place underwater.",
-    "A musical from the 80s that probably flopped on release but became a cult classic due to VHS circulation.",
-    "A romantic comedy that feels like a precursor to When Harry Met Sally, but no one remembers it by name.",
-
-    # 🪩 Subcultural / atmospheric
-    "A movie you’d find on late-night TV in 1997, featuring moody synth music, leather jackets, and an ambiguous ending.",
-    "Something Gen X would consider nostalgic, but that millennials mostly know from memes.",
-    "A film that feels like it should have aired on PBS but has unexpected violence.",
-
-    # 🕵️ Meta / ironic
-    "A murder mystery that’s not really about the murder, but about small-town dynamics and buried secrets.",
-    "A movie pretending to be deep, made in the 90s, with at least one character who quotes Nietzsche.",
-    "A self-serious sci-fi film that takes itself too seriously but accidentally becomes a comedy.",
-
-    # 🧩 Hypothetical crossover
-    "If Jurassic Park were directed by Tim Burton and scored by Danny Elfman but was set in space instead of an island.",
-    "A mashup of Casablanca and The Matrix in spirit, if not in literal content.",
-    "Something that feels like a live-action adaptation of a dream about Looney Tunes crossed with an arthouse thriller.",
-]
-
 if __name__ == "__main__":
     for q in QUERIES:
         search(q)
+
+    if reports:
+        fallbacks = sum(r.fell_back for r in reports)
+        avg_ms    = sum(r.total_ms for r in reports) / len(reports)
+        print(
+            f"\n⚖  rerank summary: {len(reports)} queries, {fallbacks} fell back, "
+            f"avg {avg_ms:.1f} ms (N={RERANK_N}, batch={RERANK_BATCH}, budget={RERANK_BUDGET_MS:.0f} ms)"
+        )
+
+    if timings is not None:
+        print("\n" + timings.table())
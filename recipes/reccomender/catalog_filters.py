@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+Vectorised evaluation of the `get_top_k_recommendations` `filters` object
+(schema: `RECOMMENDATION` in `scripts/tommasso_constants.py`).
+
+The movie catalog is held column-wise, row = item_id - 1:
+
+• multi-valued fields (genres, actors, director, producer) – one packed
+  bitset over all items per distinct value; "any of" is a bitwise OR of a
+  few rows, "all of" a bitwise AND.
+• categorical fields (country) – an int code per item; equality is one
+  vectorised compare.
+• numeric fields (avg_rating, imdb_rating, duration, release year,
+  popularity = number of ratings) – the non-null values pre-sorted with the
+  matching row order; a threshold becomes one `searchsorted` and a slice of
+  the row order.
+
+A filters object is compiled once into a list of steps (cached on its
+canonical JSON), and evaluating it over the whole catalog costs a few
+microseconds.  Every filter field is an AND; within a list-valued field
+genres / director / producer match any listed value, actors must all be
+present.  `higher` / `lower` thresholds are inclusive.  `popularity` keeps
+the top (`popular`) or bottom (`unpopular`) quarter by rating count.
+
+Genre values are matched case/punctuation-insensitively and through
+`GENRE_ALIASES` ("children" → Children's, "science fiction" → Sci-Fi, …).
+Numeric fields take `{"request", "threshold"}` or a plain number (numeric
+strings included) for equality.
+
+ml-100k only provides genres, release year, average rating and rating
+count.  Filters on fields the catalog does not have, specs of the wrong
+shape, and list values that match nothing in the catalog (as
+`"genres:<value>"`) are reported in `FilterPlan.ignored` instead of
+silently matching nothing.
+
+    python -m recipes.reccomender.catalog_filters        # evaluate sample filters and time them
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import time
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from recipes.reccomender.movielens_data import load_items, load_ratings
+
+POPULAR_FRACTION = 0.25
+
+# filters key → catalog column
+NUMERIC_FIELDS = {
+    "avg_rating": "avg_rating",
+    "imdb_rating": "imdb_rating",
+    "duration": "duration",
+    "release_date": "release_year",
+}
+MULTI_FIELDS = {"genres": "any", "actors": "all", "director": "any", "producer": "any"}
+CATEGORICAL_FIELDS = ("country",)
+
+# normalised surface form → catalog genre
+GENRE_ALIASES = {
+    "children": "Children's",
+    "kids": "Children's",
+    "family": "Children's",
+    "sciencefiction": "Sci-Fi",
+    "animated": "Animation",
+    "cartoon": "Animation",
+    "noir": "Film-Noir",
+    "romantic": "Romance",
+    "documentaries": "Documentary",
+    "thrillers": "Thriller",
+    "westerns": "Western",
+    "musicals": "Musical",
+}
+
+
+def normalise(value: str) -> str:
+    """Case/punctuation-insensitive key: "Sci-Fi", "sci fi" and "scifi" are equal."""
+    return re.sub(r"[^a-z0-9]", "", str(value).lower())
+
+
+def _number(value: Any) -> Optional[float]:
+    """A finite number from a number or numeric string; None for anything else."""
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        return None
+    try:
+        number = float(value)
+    except ValueError:
+        return None
+    return number if np.isfinite(number) else None
+
+
+# ─── columns ────────────────────────────────────────────────────────────────
+class BitsetColumn:
+    """Multi-valued field: one packed item bitset per distinct value."""
+
+    def __init__(self, values_per_item: Sequence[Iterable[str]], aliases: Optional[Dict[str, str]] = None):
+        self.n = len(values_per_item)
+        self.aliases = {normalise(k): normalise(v) for k, v in (aliases or {}).items()}
+        vocab: Dict[str, int] = {}
+        pairs = []
+        for row, values in enumerate(values_per_item):
+            for v in values:
+                pairs.append((vocab.setdefault(normalise(v), len(vocab)), row))
+        dense = np.zeros((len(vocab), self.n), dtype=bool)
+        if pairs:
+            codes, rows = np.asarray(pairs).T
+            dense[codes, rows] = True
+        self.vocab = vocab
+        self.bits = np.packbits(dense, axis=1)            # (values, ceil(n / 8)) uint8
+        self._empty = np.zeros(self.bits.shape[1], dtype=np.uint8)
+
+    def code(self, value: str) -> Optional[int]:
+        key = normalise(value)
+        return self.vocab.get(key, self.vocab.get(self.aliases.get(key, "")))
+
+    def match(self, values: Sequence[str], mode: str) -> np.ndarray:
+        codes = [self.code(v) for v in values]
+        if mode == "all" and None in codes:
+            return self._empty
+        codes = [c for c in codes if c is not None]
+        if not codes:
+            return self._empty
+        rows = self.bits[codes]
+        return np.bitwise_and.reduce(rows, axis=0) if mode == "all" else np.bitwise_or.reduce(rows, axis=0)
+
+
+class CategoricalColumn:
+    def __init__(self, values: Sequence[Optional[str]]):
+        self.vocab: Dict[str, int] = {}
+        self.codes = np.asarray(
+            [-1 if v is None else self.vocab.setdefault(normalise(v), len(self.vocab)) for v in values],
+            dtype=np.int32,
+        )
+
+    def equal(self, value: str) -> np.ndarray:
+        return self.codes == self.vocab.get(normalise(value), -2)
+
+
+class SortedColumn:
+    """Numeric field: non-null values sorted once, thresholds via searchsorted."""
+
+    def __init__(self, values: Sequence[Optional[float]]):
+        arr = np.asarray([np.nan if v is None else v for v in values], dtype=np.float64)
+        self.n = len(arr)
+        present = np.flatnonzero(~np.isnan(arr))
+        self.order = present[np.argsort(arr[present], kind="stable")]
+        self.sorted = arr[self.order]
+
+    def _rows(self, rows: np.ndarray) -> np.ndarray:
+        mask = np.zeros(self.n, dtype=bool)
+        mask[rows] = True
+        return mask
+
+    def at_least(self, t: float) -> np.ndarray:
+        return self._rows(self.order[np.searchsorted(self.sorted, t, side="left"):])
+
+    def at_most(self, t: float) -> np.ndarray:
+        return self._rows(self.order[:np.searchsorted(self.sorted, t, side="right")])
+
+    def equal(self, t: float) -> np.ndarray:
+        lo = np.searchsorted(self.sorted, t, side="left")
+        hi = np.searchsorted(self.sorted, t, side="right")
+        return self._rows(self.order[lo:hi])
+
+    def top_fraction(self, f: float) -> np.ndarray:
+        return self._rows(self.order[len(self.order) - int(len(self.order) * f):])
+
+    def bottom_fraction(self, f: float) -> np.ndarray:
+        return self._rows(self.order[:int(len(self.order) * f)])
+
+
+# ─── catalog ────────────────────────────────────────────────────────────────
+@dataclass
+class FilterPlan:
+    steps: List[Callable[[], np.ndarray]] = field(default_factory=list)
+    ignored: List[str] = field(default_factory=list)
+    n: int = 0
+
+    def evaluate(self) -> np.ndarray:
+        mask = np.ones(self.n, dtype=bool)
+        for step in self.steps:
+            out = step()
+            if out.dtype == np.uint8:                       # packed bitset
+                out = np.unpackbits(out, count=self.n).view(bool)
+            mask &= out
+        return mask
+
+
+class MovieCatalog:
+    def __init__(
+        self,
+        item_ids: np.ndarray,
+        *,
+        multi: Dict[str, BitsetColumn],
+        categorical: Dict[str, CategoricalColumn],
+        numeric: Dict[str, SortedColumn],
+    ):
+        self.item_ids = np.asarray(item_ids, dtype=np.int32)
+        self.n = len(self.item_ids)
+        self.multi = multi
+        self.categorical = categorical
+        self.numeric = numeric
+        self._plan = lru_cache(maxsize=1024)(self._compile_json)
+
+    @classmethod
+    def from_movielens(cls) -> "MovieCatalog":
+        items = load_items()
+        n = items[-1]["item_id"]
+        users, item_ids, ratings = load_ratings()
+        counts = np.bincount(item_ids - 1, minlength=n)
+        sums = np.bincount(item_ids - 1, weights=ratings, minlength=n)
+        avg = np.divide(sums, counts, out=np.full(n, np.nan), where=counts > 0)
+        return cls(
+            np.arange(1, n + 1),
+            multi={"genres": BitsetColumn([it["genres"] for it in items], aliases=GENRE_ALIASES)},
+            categorical={},
+            numeric={
+                "release_year": SortedColumn([it["release_year"] for it in items]),
+                "avg_rating": SortedColumn(avg.tolist()),
+                "popularity": SortedColumn(counts.astype(np.float64).tolist()),
+            },
+        )
+
+    # ─── compile ────────────────────────────────────────────────────────────
+    def compile(self, filters: Optional[Dict[str, Any]]) -> FilterPlan:
+        return self._plan(json.dumps(filters or {}, sort_keys=True))
+
+    def _compile_json(self, key: str) -> FilterPlan:
+        plan = FilterPlan(n=self.n)
+        for name, spec in json.loads(key).items():
+            if spec in (None, [], {}, ""):
+                continue
+            reported = len(plan.ignored)
+            step = self._compile_field(name, spec, plan.ignored)
+            if step is not None:
+                plan.steps.append(step)
+            elif len(plan.ignored) == reported:            # nothing more specific recorded
+                plan.ignored.append(name)
+        return plan
+
+    def _compile_field(self, name: str, spec: Any, ignored: List[str]) -> Optional[Callable[[], np.ndarray]]:
+        if name in MULTI_FIELDS:
+            col = self.multi.get(name)
+            if col is None:
+                return None
+            values = [str(v) for v in (spec if isinstance(spec, list) else [spec])
+                      if isinstance(v, (str, int, float))]
+            known = [v for v in values if col.code(v) is not None]
+            ignored.extend(f"{name}:{v}" for v in values if col.code(v) is None)
+            if not known:
+                return None
+            return lambda: col.match(known, MULTI_FIELDS[name])
+
+        if name in CATEGORICAL_FIELDS:
+            col = self.categorical.get(name)
+            if col is None or not isinstance(spec, (str, int, float)):
+                return None
+            return lambda: col.equal(spec)
+
+        if name == "popularity":
+            col = self.numeric.get("popularity")
+            if col is None or spec not in ("popular", "unpopular"):
+                return None
+            if spec == "popular":
+                return lambda: col.top_fraction(POPULAR_FRACTION)
+            return lambda: col.bottom_fraction(POPULAR_FRACTION)
+
+        if name in NUMERIC_FIELDS:
+            col = self.numeric.get(NUMERIC_FIELDS[name])
+            if col is None:
+                return None
+            if not isinstance(spec, dict):
+                value = _number(spec)
+                return None if value is None else (lambda: col.equal(value))
+            request, threshold = spec.get("request"), _number(spec.get("threshold"))
+            if threshold is None or request not in ("higher", "lower"):
+                return None
+            return (lambda: col.at_least(threshold)) if request == "higher" else (lambda: col.at_most(threshold))
+
+        return None
+
+    # ─── evaluate ───────────────────────────────────────────────────────────
+    def filter_mask(self, filters: Optional[Dict[str, Any]]) -> Tuple[np.ndarray, List[str]]:
+        """Boolean mask over items (index = item_id - 1) and the filter keys that were ignored."""
+        plan = self.compile(filters)
+        return plan.evaluate(), plan.ignored
+
+
+# ─── demo / timing ──────────────────────────────────────────────────────────
+SAMPLE_FILTERS = [
+    {"genres": ["sci-fi"]},
+    {"genres": ["sci-fi", "action"], "release_date": {"request": "higher", "threshold": 1990}},
+    {"release_date": {"request": "lower", "threshold": 1980}, "popularity": "popular"},
+    {"avg_rating": {"request": "higher", "threshold": 4}, "genres": ["drama"]},
+    {"genres": ["action"], "release_date": 1994},
+    {"genres": ["children", "science fiction", "cowboys"], "release_date": "1994"},
+    {"release_date": [1994, 1995]},
+    {"actors": ["Tom Cruise"], "genres": ["sci-fi"], "imdb_rating": {"request": "higher", "threshold": 8}},
+]
+
+
+def main() -> None:
+    t0 = time.perf_counter()
+    catalog = MovieCatalog.from_movielens()
+    print(f"catalog: {catalog.n} items built in {(time.perf_counter() - t0) * 1000:.1f} ms\n")
+
+    reps = 2000
+    for filters in SAMPLE_FILTERS:
+        mask, ignored = catalog.filter_mask(filters)
+        t0 = time.perf_counter()
+        for _ in range(reps):
+            catalog.filter_mask(filters)
+        us = (time.perf_counter() - t0) / reps * 1e6
+        note = f"  ignored={ignored}" if ignored else ""
+        print(f"{int(mask.sum()):>5} items  {us:>7.1f} µs  {json.dumps(filters)}{note}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Collaborative-filtering recommender for MovieLens (implicit-feedback ALS).
+
+Training
+• `u.data` → sparse user × item matrix (`movielens_data.ratings_matrix`).
+• Ratings are treated as implicit feedback with confidence `1 + alpha·r`
+  (Hu, Koren & Volinsky 2008) and factorised by alternating least squares:
+  each half-step builds one small `f × f` system per user (or item) from its
+  non-zeros only and solves them all in one batched `np.linalg.solve`.
+
+Serving
+• `recommend(user, k)` is one `items × f` mat-vec, a mask over the user's
+  already-rated items and an `argpartition` – no Python loop over items, so
+  a call costs well under a millisecond on ml-100k.
+• `allowed=` takes a boolean item mask (e.g. from a metadata filter) and
+  restricts the ranking to those items.
+
+Factors are saved as a single `.npz` and loaded by the tool handlers:
+
+    python -m recipes.reccomender.cf_recommender --eval          # ua.base/ua.test precision@10
+    python -m recipes.reccomender.cf_recommender                 # train on u.data and save
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from recipes.reccomender.movielens_data import ARTIFACT_DIR, dataset_shape, ratings_matrix
+
+DEFAULT_MODEL_PATH = ARTIFACT_DIR / "als_ml100k.npz"
+
+
+class ALSRecommender:
+    def __init__(
+        self,
+        factors: int = 32,
+        reg: float = 20.0,
+        alpha: float = 1.0,
+        iterations: int = 10,
+        seed: int = 0,
+    ):
+        self.factors = factors
+        self.reg = reg
+        self.alpha = alpha
+        self.iterations = iterations
+        self.seed = seed
+        self.user_factors: Optional[np.ndarray] = None
+        self.item_factors: Optional[np.ndarray] = None
+        self.seen = None                               # csr user × item, rated items
+
+    # ─── training ───────────────────────────────────────────────────────────
+    def _half_step(self, conf, fixed: np.ndarray) -> np.ndarray:
+        """Solve every row of `conf` (csr, confidence - 1) against `fixed` factors."""
+        f = fixed.shape[1]
+        gram = fixed.T @ fixed + self.reg * np.eye(f, dtype=np.float32)
+        lhs = np.empty((conf.shape[0], f, f), dtype=np.float32)
+        rhs = np.empty((conf.shape[0], f), dtype=np.float32)
+        for row in range(conf.shape[0]):
+            lo, hi = conf.indptr[row], conf.indptr[row + 1]
+            y = fixed[conf.indices[lo:hi]]
+            c = conf.data[lo:hi]
+            lhs[row] = gram + (y.T * c) @ y
+            rhs[row] = y.T @ (c + 1.0)
+        return np.linalg.solve(lhs, rhs[..., None])[..., 0]
+
+    def fit(self, ratings) -> "ALSRecommender":
+        """Fit on a csr user × item rating matrix (zeros = unobserved)."""
+        rng = np.random.default_rng(self.seed)
+        n_users, n_items = ratings.shape
+        conf = ratings.astype(np.float32).tocsr()
+        conf.data = self.alpha * conf.data
+        conf_t = conf.T.tocsr()
+
+        self.user_factors = np.zeros((n_users, self.factors), dtype=np.float32)
+        self.item_factors = (rng.standard_normal((n_items, self.factors)) * 0.01).astype(np.float32)
+        for _ in range(self.iterations):
+            self.user_factors = self._half_step(conf, self.item_factors)
+            self.item_factors = self._half_step(conf_t, self.user_factors)
+
+        self.seen = ratings.tocsr()
+        return self
+
+    # ─── serving ────────────────────────────────────────────────────────────
+    @property
+    def n_users(self) -> int:
+        return self.user_factors.shape[0]
+
+    def recommend(
+        self,
+        user_id: int,
+        k: int = 5,
+        *,
+        exclude_seen: bool = True,
+        allowed: Optional[np.ndarray] = None,
+    ) -> List[Tuple[int, float]]:
+        """Top-`k` `(item_id, score)` for a 1-based MovieLens `user_id`."""
+        if not 1 <= user_id <= self.n_users:
+            raise KeyError(f"unknown user {user_id}")
+        row = user_id - 1
+        scores = self.item_factors @ self.user_factors[row]
+        if exclude_seen:
+            scores[self.seen.indices[self.seen.indptr[row]:self.seen.indptr[row + 1]]] = -np.inf
+        if allowed is not None:
+            scores[~allowed] = -np.inf
+
+        k = min(k, int(np.isfinite(scores).sum()))
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(int(i) + 1, float(scores[i])) for i in top]
+
+    # ─── persistence ────────────────────────────────────────────────────────
+    def save(self, path: Path = DEFAULT_MODEL_PATH) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez(
+            path,
+            user_factors=self.user_factors,
+            item_factors=self.item_factors,
+            seen_indptr=self.seen.indptr,
+            seen_indices=self.seen.indices,
+            params=np.array([self.factors, self.reg, self.alpha, self.iterations, self.seed], dtype=np.float64),
+        )
+        return path
+
+    @classmethod
+    def load(cls, path: Path = DEFAULT_MODEL_PATH) -> "ALSRecommender":
+        from scipy.sparse import csr_matrix
+
+        with np.load(path) as npz:
+            factors, reg, alpha, iterations, seed = npz["params"]
+            model = cls(int(factors), float(reg), float(alpha), int(iterations), int(seed))
+            model.user_factors = npz["user_factors"]
+            model.item_factors = npz["item_factors"]
+            indices = npz["seen_indices"]
+            model.seen = csr_matrix(
+                (np.ones(len(indices), dtype=np.float32), indices, npz["seen_indptr"]),
+                shape=(model.user_factors.shape[0], model.item_factors.shape[0]),
+            )
+        return model
+
+
+def load_or_train(path: Path = DEFAULT_MODEL_PATH) -> ALSRecommender:
+    """Load saved factors, training (and saving) on `u.data` the first time."""
+    if Path(path).exists():
+        return ALSRecommender.load(path)
+    model = ALSRecommender().fit(ratings_matrix())
+    model.save(path)
+    return model
+
+
+def precision_at_k(model: ALSRecommender, test, k: int = 10) -> float:
+    """Mean fraction of each test user's top-k that appears in their test ratings."""
+    hits, users = 0, 0
+    for row in np.unique(test.nonzero()[0]):
+        relevant = set(test.indices[test.indptr[row]:test.indptr[row + 1]] + 1)
+        recs = [item for item, _ in model.recommend(int(row) + 1, k)]
+        hits += len(relevant.intersection(recs))
+        users += 1
+    return hits / (users * k) if users else 0.0
+
+
+# ─── CLI ────────────────────────────────────────────────────────────────────
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Train the MovieLens ALS recommender")
+    ap.add_argument("--factors", type=int, default=32)
+    ap.add_argument("--reg", type=float, default=20.0)
+    ap.add_argument("--alpha", type=float, default=1.0)
+    ap.add_argument("--iterations", type=int, default=10)
+    ap.add_argument("--eval", action="store_true", help="train on ua.base and report precision@k on ua.test")
+    ap.add_argument("--k", type=int, default=10)
+    ap.add_argument("--out", type=Path, default=DEFAULT_MODEL_PATH)
+    args = ap.parse_args()
+
+    model = ALSRecommender(args.factors, args.reg, args.alpha, args.iterations)
+    shape = dataset_shape()
+    train = ratings_matrix("ua.base" if args.eval else "u.data", shape=shape)
+
+    t0 = time.perf_counter()
+    model.fit(train)
+    print(f"trained {shape[0]}×{shape[1]} ({train.nnz} ratings), f={args.factors}, "
+          f"{args.iterations} iterations in {time.perf_counter() - t0:.1f}s")
+
+    if args.eval:
+        test = ratings_matrix("ua.test", shape=shape)
+        print(f"precision@{args.k} on ua.test: {precision_at_k(model, test, args.k):.4f}")
+    else:
+        print(f"saved → {model.save(args.out)}")
+
+    t0 = time.perf_counter()
+    for user in range(1, model.n_users + 1):
+        model.recommend(user, args.k)
+    per_call = (time.perf_counter() - t0) / model.n_users * 1000
+    print(f"serving: {per_call:.3f} ms per recommend() call")
+
+
+if __name__ == "__main__":
+    main()
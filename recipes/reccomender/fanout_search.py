@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Fan one query out to several vector stores and merge the answers.
+
+• The query is encoded once and the same vector is sent to every store in
+  parallel (stores must share the embedding model).
+• Each store's hits come back sorted by score, so the merge is a k-way heap
+  merge (`heapq.merge`) that stops as soon as `top_k` distinct items have
+  been taken – duplicates are dropped on `item_id`, keeping the best score.
+• A request-wide deadline bounds the whole fan-out: stores that have not
+  answered by then are left out of the result and reported in
+  `FanoutResult.outcomes`.  Queued calls are cancelled; every HTTP call a
+  worker makes (store lookup included) gets the time left before the
+  deadline as its timeout, computed when that call starts, so a late call
+  frees its worker soon after the deadline instead of holding it for the
+  client default.
+
+    python -m recipes.reccomender.fanout_search --store-ids vect_a,vect_b "space opera" --deadline-ms 250
+"""
+
+from __future__ import annotations
+
+import argparse
+import heapq
+import itertools
+import os
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from recipes.reccomender.movielens_search import DISPLAY_FIELDS, StoreSearcher, hit_metadata
+from recipes.reccomender.search_timing import StageTimings, timed
+
+DEFAULT_DEADLINE_MS = 300.0
+
+
+@dataclass
+class StoreOutcome:
+    store_id: str
+    status: str                      # "ok" | "error" | "timeout"
+    hits: int = 0
+    ms: Optional[float] = None
+    error: Optional[str] = None
+
+
+@dataclass
+class FanoutResult:
+    hits: List[Dict[str, Any]]
+    outcomes: List[StoreOutcome] = field(default_factory=list)
+    elapsed_ms: float = 0.0
+
+    @property
+    def partial(self) -> bool:
+        return any(o.status != "ok" for o in self.outcomes)
+
+    def summary(self) -> str:
+        parts = []
+        for o in self.outcomes:
+            if o.status == "ok":
+                parts.append(f"{o.store_id}: {o.hits} hits in {o.ms:.1f} ms")
+            elif o.status == "error":
+                parts.append(f"{o.store_id}: error ({o.error})")
+            else:
+                parts.append(f"{o.store_id}: dropped at deadline")
+        return f"fan-out {self.elapsed_ms:.1f} ms – " + "; ".join(parts)
+
+
+def dedupe_key(hit: Dict[str, Any]) -> Any:
+    """`item_id` when the payload has one, otherwise the store-scoped point id."""
+    item_id = hit_metadata(hit).get("item_id")
+    if item_id is not None:
+        return ("item", item_id)
+    return ("point", hit.get("store_id"), hit.get("id"))
+
+
+def merge_top_k(per_store: Iterable[Sequence[Dict[str, Any]]], top_k: int) -> List[Dict[str, Any]]:
+    """
+    Merge score-descending hit lists into the `top_k` best distinct items.
+
+    The heap holds one cursor per store, so the merge costs
+    O(taken · log stores) and never materialises the full union.
+    """
+    tie = itertools.count()
+    streams = [((-h["score"], next(tie), h) for h in hits) for hits in per_store]
+    merged, seen = [], set()
+    for _, _, hit in heapq.merge(*streams):
+        key = dedupe_key(hit)
+        if key in seen:
+            continue
+        seen.add(key)
+        merged.append(hit)
+        if len(merged) == top_k:
+            break
+    return merged
+
+
+def _remaining(deadline: float) -> float:
+    """Seconds left before `deadline`; raises once it has passed."""
+    left = deadline - time.perf_counter()
+    if left <= 0:
+        raise TimeoutError("fan-out deadline passed before the call started")
+    return left
+
+
+class FanoutSearcher:
+    """
+    Parallel search over several stores behind one `StoreSearcher`.
+
+    The thread pool is long-lived so a request does not pay thread start-up;
+    size it to at least the number of stores you fan out to.
+    """
+
+    def __init__(self, searcher: StoreSearcher, *, max_workers: int = 8):
+        self.searcher = searcher
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="fanout")
+
+    def _one(self, store_id: str, vector: List[float], top_k: int, deadline: float, kwargs: Dict[str, Any]):
+        t0 = time.perf_counter()
+        self.searcher.store_info(store_id, kwargs.get("timings"), request_timeout=_remaining(deadline))
+        hits = self.searcher.search_by_vector(
+            store_id, vector, top_k, request_timeout=_remaining(deadline), **kwargs
+        )
+        for h in hits:
+            h["store_id"] = store_id
+        return hits, (time.perf_counter() - t0) * 1000
+
+    def search(
+        self,
+        store_ids: Sequence[str],
+        query_text: str,
+        top_k: int = 5,
+        *,
+        deadline_ms: float = DEFAULT_DEADLINE_MS,
+        filters: Optional[Dict[str, Any]] = None,
+        include: Optional[Sequence[str]] = None,
+        timings: Optional[StageTimings] = None,
+    ) -> FanoutResult:
+        """
+        Query every store in `store_ids` and return the merged top-k.
+
+        `deadline_ms` covers encoding plus the fan-out; whatever has not
+        arrived by then is dropped rather than waited for.
+        """
+        t0 = time.perf_counter()
+        deadline = t0 + deadline_ms / 1000
+
+        with timed(timings, "total"):
+            vector = self.searcher.encode(query_text, timings)
+            kwargs = dict(filters=filters, include=include, timings=timings)
+            futures: Dict[Future, str] = {
+                self.pool.submit(self._one, sid, vector, top_k, deadline, kwargs): sid for sid in store_ids
+            }
+
+            _, pending = wait(futures, timeout=max(0.0, deadline - time.perf_counter()))
+
+            outcomes: Dict[str, StoreOutcome] = {}
+            per_store: List[List[Dict[str, Any]]] = []
+            for fut, sid in futures.items():
+                if fut in pending:
+                    fut.cancel()        # no-op if already running; its HTTP timeout ends it
+                    outcomes[sid] = StoreOutcome(sid, "timeout")
+                    continue
+                try:
+                    hits, ms = fut.result()
+                except Exception as exc:
+                    outcomes[sid] = StoreOutcome(sid, "error", error=f"{type(exc).__name__}: {exc}")
+                    continue
+                outcomes[sid] = StoreOutcome(sid, "ok", hits=len(hits), ms=ms)
+                per_store.append(hits)
+                if timings is not None:
+                    timings.record(f"store {sid}", ms)
+
+            with timed(timings, "merge"):
+                merged = merge_top_k(per_store, top_k)
+
+        return FanoutResult(
+            hits=merged,
+            outcomes=[outcomes[sid] for sid in store_ids],
+            elapsed_ms=(time.perf_counter() - t0) * 1000,
+        )
+
+    def close(self) -> None:
+        self.pool.shutdown(wait=False, cancel_futures=True)
+        self.searcher.close()
+
+
+# ─── CLI ────────────────────────────────────────────────────────────────────
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Search several vector stores at once")
+    ap.add_argument("query")
+    ap.add_argument("--store-ids", required=True, help="comma-separated vector store ids")
+    ap.add_argument("--top-k", type=int, default=5)
+    ap.add_argument("--deadline-ms", type=float, default=DEFAULT_DEADLINE_MS)
+    ap.add_argument("--timings", action="store_true")
+    args = ap.parse_args()
+
+    from dotenv import load_dotenv
+    from projectdavid import Entity
+
+    load_dotenv()
+    client = Entity(
+        base_url=os.getenv("BASE_URL", "http://localhost:9000"),
+        api_key=os.getenv("ENTITIES_API_KEY"),
+    )
+    store_ids = [s.strip() for s in args.store_ids.split(",") if s.strip()]
+    fanout = FanoutSearcher(StoreSearcher(client), max_workers=max(len(store_ids), 1))
+    timings = StageTimings() if args.timings else None
+
+    for sid in store_ids:                     # resolve collections + load model outside the SLO
+        fanout.searcher.collection_for(sid)
+    fanout.searcher.encode("warm-up")
+
+    res = fanout.search(
+        store_ids, args.query, args.top_k,
+        deadline_ms=args.deadline_ms, include=DISPLAY_FIELDS, timings=timings,
+    )
+    for i, h in enumerate(res.hits, 1):
+        md = hit_metadata(h)
+        genres = ", ".join(md.get("genres", [])) or "Unknown genre"
+        print(f"{i}. 🎬 {md.get('title', '<untitled>')} — [{genres}] ({md.get('release_year', '—')})  "
+              f"score={h['score']:.3f}  store={h['store_id']}")
+    print("\n" + res.summary())
+    if timings is not None:
+        print("\n" + timings.table())
+    fanout.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Columnar, memory-mapped MovieLens item-metadata store for `get_item_metadata`.
+
+Built once from `u.item` + `u.data` into a directory of flat files:
+
+    index.npy              int32   item_id → row (-1 = absent), dense
+    avg_rating.npy         float32 mean rating in u.data (NaN = unrated)
+    popularity.npy         int32   number of ratings
+    genres.npy             uint32  genre bitmask (bit i = GENRE_FLAGS[i])
+    title.offsets.npy      int64   [rows + 1] byte offsets into title.bytes
+    title.bytes            utf-8 titles, concatenated
+    release_date.offsets.npy / release_date.bytes    same layout
+    meta.json              {"rows", "fields", "genres"}
+
+Every file is opened memory-mapped, so start-up is instant and only the
+pages a lookup touches are read.  A lookup is `index[item_id]` and one
+element per requested column; `get_many()` gathers a whole list of items
+column by column with fancy indexing, so hydrating a 100-item
+recommendation list is a handful of array ops rather than 100 lookups.
+Only the requested `specification` fields are decoded.
+
+Fields in the tool schema that ml-100k does not have (description,
+director, actors, …) are returned under `"unavailable"`.
+
+    python -m recipes.reccomender.item_metadata          # build + time lookups
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from recipes.reccomender.movielens_data import ARTIFACT_DIR, DATA_DIR, GENRE_FLAGS, load_ratings
+
+DEFAULT_STORE_DIR = ARTIFACT_DIR / "item_metadata"
+FIELDS = ("title", "avg_rating", "genres", "release_date", "popularity")
+STRING_FIELDS = ("title", "release_date")
+
+
+# ─── build ──────────────────────────────────────────────────────────────────
+def _write_strings(out_dir: Path, name: str, values: Sequence[str]) -> None:
+    encoded = [v.encode("utf-8") for v in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(b) for b in encoded])
+    np.save(out_dir / f"{name}.offsets.npy", offsets)
+    (out_dir / f"{name}.bytes").write_bytes(b"".join(encoded))
+
+
+def build_metadata_store(out_dir: Path = DEFAULT_STORE_DIR, data_dir: Path = DATA_DIR) -> Path:
+    ids, titles, dates, genres = [], [], [], []
+    with open(data_dir / "u.item", encoding="latin-1") as fh:
+        for line in fh:
+            cols = line.rstrip("\n").split("|")
+            if len(cols) < 24:
+                continue
+            ids.append(int(cols[0]))
+            titles.append(cols[1])
+            dates.append(cols[2])
+            genres.append(sum(1 << i for i, flag in enumerate(cols[6:24]) if flag == "1"))
+
+    item_ids = np.asarray(ids, dtype=np.int32)
+    _, rated, ratings = load_ratings(data_dir=data_dir)
+    rows_of = np.full(int(item_ids.max()) + 1, -1, dtype=np.int32)
+    rows_of[item_ids] = np.arange(len(item_ids), dtype=np.int32)
+    counts = np.bincount(rows_of[rated], minlength=len(item_ids))
+    sums = np.bincount(rows_of[rated], weights=ratings, minlength=len(item_ids))
+
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    np.save(out_dir / "index.npy", rows_of)
+    np.save(out_dir / "avg_rating.npy",
+            np.divide(sums, counts, out=np.full(len(item_ids), np.nan), where=counts > 0).astype(np.float32))
+    np.save(out_dir / "popularity.npy", counts.astype(np.int32))
+    np.save(out_dir / "genres.npy", np.asarray(genres, dtype=np.uint32))
+    _write_strings(out_dir, "title", titles)
+    _write_strings(out_dir, "release_date", dates)
+    (out_dir / "meta.json").write_text(json.dumps({"rows": len(item_ids), "fields": FIELDS, "genres": GENRE_FLAGS}))
+    return out_dir
+
+
+# ─── serve ──────────────────────────────────────────────────────────────────
+class ItemMetadataStore:
+    def __init__(self, store_dir: Path = DEFAULT_STORE_DIR):
+        store_dir = Path(store_dir)
+        self.meta = json.loads((store_dir / "meta.json").read_text())
+        self.index = np.load(store_dir / "index.npy", mmap_mode="r")
+        self.avg_rating = np.load(store_dir / "avg_rating.npy", mmap_mode="r")
+        self.popularity = np.load(store_dir / "popularity.npy", mmap_mode="r")
+        self.genres = np.load(store_dir / "genres.npy", mmap_mode="r")
+        self.genre_names = np.asarray(self.meta["genres"], dtype=object)
+        self.strings = {
+            name: (
+                np.load(store_dir / f"{name}.offsets.npy", mmap_mode="r"),
+                np.memmap(store_dir / f"{name}.bytes", dtype=np.uint8, mode="r"),
+            )
+            for name in STRING_FIELDS
+        }
+
+    def rows(self, item_ids: Sequence[int]) -> np.ndarray:
+        """Row per item id (-1 for unknown ids), vectorised."""
+        ids = np.asarray(item_ids, dtype=np.int64)
+        rows = np.full(len(ids), -1, dtype=np.int64)
+        ok = (ids >= 0) & (ids < len(self.index))
+        rows[ok] = self.index[ids[ok]]
+        return rows
+
+    def _column(self, name: str, rows: np.ndarray) -> List[Any]:
+        if name in self.strings:
+            offsets, blob = self.strings[name]
+            starts, ends = offsets[rows], offsets[rows + 1]
+            return [bytes(blob[s:e]).decode("utf-8") for s, e in zip(starts, ends)]
+        if name == "genres":
+            bits = (self.genres[rows][:, None] >> np.arange(len(self.genre_names), dtype=np.uint32)) & 1
+            return [self.genre_names[b.astype(bool)].tolist() for b in bits]
+        if name == "avg_rating":
+            return [None if np.isnan(v) else round(float(v), 2) for v in self.avg_rating[rows]]
+        if name == "popularity":
+            return self.popularity[rows].tolist()
+        raise KeyError(name)
+
+    def get_many(
+        self,
+        item_ids: Sequence[int],
+        fields: Optional[Sequence[str]] = None,
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Metadata dicts for `item_ids`, in order (None for unknown ids).
+
+        `fields` projects to those names; names the store does not hold are
+        listed under `"unavailable"` in each record.
+        """
+        wanted = list(FIELDS) if not fields else list(dict.fromkeys(fields))
+        present = [f for f in wanted if f in FIELDS]
+        missing = [f for f in wanted if f not in FIELDS]
+
+        rows = self.rows(item_ids)
+        known = rows >= 0
+        columns = {f: self._column(f, rows[known]) for f in present}
+
+        out: List[Optional[Dict[str, Any]]] = []
+        j = 0
+        for item_id, ok in zip(item_ids, known):
+            if not ok:
+                out.append(None)
+                continue
+            rec: Dict[str, Any] = {"item_id": int(item_id)}
+            rec.update({f: columns[f][j] for f in present})
+            if missing:
+                rec["unavailable"] = missing
+            out.append(rec)
+            j += 1
+        return out
+
+    def get(self, item_id: int, fields: Optional[Sequence[str]] = None) -> Optional[Dict[str, Any]]:
+        return self.get_many([item_id], fields)[0]
+
+
+def load_or_build(store_dir: Path = DEFAULT_STORE_DIR) -> ItemMetadataStore:
+    if not (Path(store_dir) / "meta.json").exists():
+        build_metadata_store(store_dir)
+    return ItemMetadataStore(store_dir)
+
+
+# ─── CLI ────────────────────────────────────────────────────────────────────
+def main() -> None:
+    t0 = time.perf_counter()
+    out = build_metadata_store()
+    print(f"built {out} in {(time.perf_counter() - t0) * 1000:.1f} ms")
+
+    store = ItemMetadataStore(out)
+    print(json.dumps(store.get(82), indent=2))
+
+    reps = 2000
+    t0 = time.perf_counter()
+    for _ in range(reps):
+        store.get(82, ["title", "genres"])
+    print(f"single lookup: {(time.perf_counter() - t0) / reps * 1e6:.1f} µs")
+
+    ids = list(range(1, 101))
+    t0 = time.perf_counter()
+    for _ in range(reps // 10):
+        store.get_many(ids, ["title", "genres", "avg_rating"])
+    print(f"100-item batch: {(time.perf_counter() - t0) / (reps // 10) * 1e6:.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Precomputed item-item neighbour table for "similar movies" lookups.
+
+Offline job
+• Export the item embedding matrix – the vectors stored in the MovieLens
+  store (`--source store`) or the ALS item factors (`--source als`, no
+  backend needed).
+• Compute the top-K cosine neighbours of every item with blocked matrix
+  multiplies: `block_size` rows × all items at a time, so peak memory is
+  `block_size × n_items` scores rather than `n_items²`.
+• Write them to a directory of fixed-width memory-mapped arrays:
+
+      ids.i4       int32   [n_rows, K]   neighbour item_ids, best first
+      scores.f4    float32 [n_rows, K]   cosine similarities
+      index.npy    int32   [max_item_id + 1]   item_id → row (-1 = absent)
+      meta.json    {"k", "rows", "dim", "source", "store_id"}
+
+Serving
+• `NeighbourTable.neighbours(item_id)` is an index lookup plus one row
+  slice of each memmap – O(1) per item, no vector search, and only the
+  pages actually touched are read from disk.
+
+    python -m recipes.reccomender.item_neighbours --source als --k 50
+    python -m recipes.reccomender.item_neighbours --source store --store-id vect_… --k 100
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from recipes.reccomender.movielens_data import ARTIFACT_DIR
+
+DEFAULT_TABLE_DIR = ARTIFACT_DIR / "item_neighbours"
+DEFAULT_STORE_ID = "vect_mqfWyNlZbacer73PQu4Upy"
+
+
+# ─── build ──────────────────────────────────────────────────────────────────
+def build_neighbour_table(
+    item_ids: np.ndarray,
+    matrix: np.ndarray,
+    out_dir: Path = DEFAULT_TABLE_DIR,
+    *,
+    k: int = 50,
+    block_size: int = 1024,
+    source: str = "",
+    store_id: Optional[str] = None,
+) -> Path:
+    """Write the top-`k` cosine neighbours of every row of `matrix` to `out_dir`."""
+    item_ids = np.asarray(item_ids, dtype=np.int32)
+    n, dim = matrix.shape
+    k = min(k, n - 1)
+    unit = np.asarray(matrix, dtype=np.float32)
+    unit = unit / (np.linalg.norm(unit, axis=1, keepdims=True) + 1e-12)
+
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    ids = np.memmap(out_dir / "ids.i4", dtype=np.int32, mode="w+", shape=(n, k))
+    scores = np.memmap(out_dir / "scores.f4", dtype=np.float32, mode="w+", shape=(n, k))
+
+    for lo in range(0, n, block_size):
+        hi = min(lo + block_size, n)
+        sims = unit[lo:hi] @ unit.T                        # (block, n)
+        sims[np.arange(hi - lo), np.arange(lo, hi)] = -np.inf   # drop self-matches
+        top = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(sims, top, axis=1)
+        order = np.argsort(-top_scores, axis=1)
+        ids[lo:hi] = item_ids[np.take_along_axis(top, order, axis=1)]
+        scores[lo:hi] = np.take_along_axis(top_scores, order, axis=1)
+
+    ids.flush()
+    scores.flush()
+    index = np.full(int(item_ids.max()) + 1, -1, dtype=np.int32)
+    index[item_ids] = np.arange(n, dtype=np.int32)
+    np.save(out_dir / "index.npy", index)
+    (out_dir / "meta.json").write_text(json.dumps(
+        {"k": k, "rows": n, "dim": dim, "source": source, "store_id": store_id}
+    ))
+    return out_dir
+
+
+def store_matrix(searcher, store_id: str) -> Tuple[np.ndarray, np.ndarray]:
+    """`(item_ids, vectors)` for every point in the store that has an `item_id`."""
+    item_ids, rows = [], []
+    for p in searcher.scroll_points(store_id, include=["item_id"], with_vector=True):
+        item_id = (p.get("payload") or {}).get("item_id")
+        if item_id is not None:
+            item_ids.append(int(item_id))
+            rows.append(p["vector"])
+    return np.asarray(item_ids), np.asarray(rows, dtype=np.float32)
+
+
+def als_matrix() -> Tuple[np.ndarray, np.ndarray]:
+    from recipes.reccomender.cf_recommender import load_or_train
+
+    factors = load_or_train().item_factors
+    return np.arange(1, factors.shape[0] + 1), factors
+
+
+# ─── serve ──────────────────────────────────────────────────────────────────
+class NeighbourTable:
+    """Read-only view over a table written by `build_neighbour_table`."""
+
+    def __init__(self, table_dir: Path = DEFAULT_TABLE_DIR):
+        table_dir = Path(table_dir)
+        self.meta = json.loads((table_dir / "meta.json").read_text())
+        shape = (self.meta["rows"], self.meta["k"])
+        self.ids = np.memmap(table_dir / "ids.i4", dtype=np.int32, mode="r", shape=shape)
+        self.scores = np.memmap(table_dir / "scores.f4", dtype=np.float32, mode="r", shape=shape)
+        self.index = np.load(table_dir / "index.npy")
+
+    def _row(self, item_id: int) -> int:
+        if 0 <= item_id < len(self.index):
+            return int(self.index[item_id])
+        return -1
+
+    @property
+    def store_id(self) -> Optional[str]:
+        """Vector store the table was built from (None for ALS or older tables)."""
+        return self.meta.get("store_id")
+
+    def __contains__(self, item_id: int) -> bool:
+        return self._row(item_id) >= 0
+
+    def neighbours(self, item_id: int, k: Optional[int] = None) -> List[Tuple[int, float]]:
+        """Up to `k` (1…table width) `(item_id, score)` most similar to `item_id`; KeyError if absent."""
+        row = self._row(item_id)
+        if row < 0:
+            raise KeyError(f"item {item_id} not in neighbour table")
+        k = self.meta["k"] if k is None else max(1, min(k, self.meta["k"]))
+        return [(int(i), float(s)) for i, s in zip(self.ids[row, :k], self.scores[row, :k])]
+
+
+# ─── CLI ────────────────────────────────────────────────────────────────────
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Build the MovieLens item-item neighbour table")
+    ap.add_argument("--source", choices=("store", "als"), default="store")
+    ap.add_argument("--store-id", default=DEFAULT_STORE_ID)
+    ap.add_argument("--k", type=int, default=50)
+    ap.add_argument("--block-size", type=int, default=1024)
+    ap.add_argument("--out", type=Path, default=DEFAULT_TABLE_DIR)
+    args = ap.parse_args()
+
+    t0 = time.perf_counter()
+    if args.source == "store":
+        import os
+
+        from dotenv import load_dotenv
+        from projectdavid import Entity
+
+        from recipes.reccomender.movielens_search import StoreSearcher
+
+        load_dotenv()
+        client = Entity(
+            base_url=os.getenv("BASE_URL", "http://localhost:9000"),
+            api_key=os.getenv("ENTITIES_API_KEY"),
+        )
+        item_ids, matrix = store_matrix(StoreSearcher(client), args.store_id)
+    else:
+        item_ids, matrix = als_matrix()
+    print(f"loaded {len(item_ids)} × {matrix.shape[1]} {args.source} matrix in {time.perf_counter() - t0:.1f}s")
+
+    t0 = time.perf_counter()
+    out = build_neighbour_table(
+        item_ids, matrix, args.out, k=args.k, block_size=args.block_size, source=args.source,
+        store_id=args.store_id if args.source == "store" else None,
+    )
+    print(f"top-{args.k} neighbours written to {out} in {time.perf_counter() - t0:.2f}s")
+
+    table = NeighbourTable(out)
+    t0 = time.perf_counter()
+    for item_id in item_ids:
+        table.neighbours(int(item_id), 10)
+    print(f"lookup: {(time.perf_counter() - t0) / len(item_ids) * 1e6:.1f} µs per item")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+Load-generation harness for MovieLens vector search.
+
+Replays a query corpus (`movielens_queries.QUERIES` by default) against a
+store and reports throughput, latency percentiles and error rates.
+
+Two load models:
+
+  --qps R           open loop: requests are *scheduled* every 1/R s and
+                    latency is measured from the scheduled start, so a
+                    saturated backend shows up as queueing delay instead of
+                    silently lowering the offered load.
+  --concurrency N   closed loop: N workers issue requests back-to-back.
+
+Both accept a comma-separated list (`--qps 5,10,20,40`) to sweep the load
+and print one row per step – the knee where p95/p99 take off is the
+sustainable rate.
+
+`--local` swaps the real store for an in-process stand-in: hashed
+bag-of-words vectors over the MovieLens titles/genres, brute-force cosine
+search, and a fixed number of "server slots" with a seeded service-time
+model.  Numbers are reproducible offline and the harness can be tested
+without a running backend.
+
+Examples
+--------
+    python -m recipes.reccomender.load_test_search --local --qps 100,200,400,600
+    python -m recipes.reccomender.load_test_search --store-id vect_… --concurrency 8 --duration 30
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import itertools
+import random
+import re
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Protocol, Sequence
+
+from recipes.reccomender.movielens_data import load_items
+from recipes.reccomender.movielens_queries import QUERIES
+from recipes.reccomender.search_timing import LatencyHistogram, StageTimings
+
+DEFAULT_STORE_ID = "vect_mqfWyNlZbacer73PQu4Upy"
+
+
+# ─── backends ───────────────────────────────────────────────────────────────
+class SearchBackend(Protocol):
+    def search(self, query: str, top_k: int) -> List[Dict[str, Any]]: ...
+
+
+class StoreBackend:
+    """The real thing: `StoreSearcher` against a live store."""
+
+    def __init__(self, store_id: str, timings: Optional[StageTimings] = None):
+        import os
+
+        from dotenv import load_dotenv
+        from projectdavid import Entity
+
+        from recipes.reccomender.movielens_search import StoreSearcher
+
+        load_dotenv()
+        client = Entity(
+            base_url=os.getenv("BASE_URL", "http://localhost:9000"),
+            api_key=os.getenv("ENTITIES_API_KEY"),
+        )
+        self.store_id = store_id
+        self.timings = timings
+        self.searcher = StoreSearcher(client)
+
+    def search(self, query: str, top_k: int) -> List[Dict[str, Any]]:
+        return self.searcher.search(self.store_id, query, top_k, timings=self.timings)
+
+
+class LocalBackend:
+    """
+    Deterministic offline stand-in for a vector store.
+
+    `slots` concurrent requests are served at a time (like a server's worker
+    pool); each holds its slot for a log-normal service time with median
+    `service_ms`, seeded per request so a replay is reproducible.  A request
+    fails with probability `error_rate`.
+    """
+
+    _TOKEN = re.compile(r"[a-z0-9']+")
+
+    def __init__(
+        self,
+        *,
+        dim: int = 256,
+        service_ms: float = 8.0,
+        slots: int = 4,
+        error_rate: float = 0.0,
+        seed: int = 0,
+    ):
+        import numpy as np
+
+        self.np = np
+        self.dim = dim
+        self.service_ms = service_ms
+        self.error_rate = error_rate
+        self.seed = seed
+        self._slots = threading.BoundedSemaphore(slots)
+        self._seq = itertools.count()
+
+        self.items = load_items()
+        self.matrix = np.stack([self._embed(self._item_text(it)) for it in self.items])
+
+    @staticmethod
+    def _item_text(item: Dict[str, Any]) -> str:
+        return f"{item['title']} {' '.join(item['genres'])}"
+
+    def _embed(self, text: str):
+        vec = self.np.zeros(self.dim, dtype=self.np.float32)
+        for tok in self._TOKEN.findall(text.lower()):
+            h = int.from_bytes(hashlib.blake2b(tok.encode(), digest_size=8).digest(), "little")
+            vec[h % self.dim] += 1.0 if (h >> 63) else -1.0
+        norm = self.np.linalg.norm(vec)
+        return vec / norm if norm else vec
+
+    def search(self, query: str, top_k: int) -> List[Dict[str, Any]]:
+        rng = random.Random(self.seed * 1_000_003 + next(self._seq))
+        with self._slots:
+            scores = self.matrix @ self._embed(query)
+            k = min(top_k, len(scores))
+            idx = self.np.argpartition(-scores, k - 1)[:k]
+            idx = idx[self.np.argsort(-scores[idx])]
+            time.sleep(rng.lognormvariate(0.0, 0.35) * self.service_ms / 1000)
+            if rng.random() < self.error_rate:
+                raise RuntimeError("simulated backend error")
+        return [
+            {"id": self.items[i]["item_id"], "score": float(scores[i]), "metadata": self.items[i]}
+            for i in idx
+        ]
+
+
+# ─── result collection ──────────────────────────────────────────────────────
+@dataclass
+class LoadResult:
+    mode: str
+    target: float
+    elapsed_s: float = 0.0
+    sent: int = 0
+    ok: int = 0
+    errors: Counter = field(default_factory=Counter)
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, ms: float, error: Optional[BaseException]) -> None:
+        with self._lock:
+            self.sent += 1
+            if error is None:
+                self.ok += 1
+                self.latency.record(ms)
+            else:
+                self.errors[type(error).__name__] += 1
+
+    @property
+    def throughput(self) -> float:
+        return self.ok / self.elapsed_s if self.elapsed_s else 0.0
+
+    @property
+    def error_rate(self) -> float:
+        return (self.sent - self.ok) / self.sent if self.sent else 0.0
+
+    HEADER = (
+        f"{'mode':<12} {'target':>8} {'sent':>7} {'ok/s':>8} {'err%':>6} "
+        f"{'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}"
+    )
+
+    def row(self) -> str:
+        h = self.latency
+        return (
+            f"{self.mode:<12} {self.target:>8g} {self.sent:>7} {self.throughput:>8.1f} "
+            f"{self.error_rate * 100:>6.2f} {h.percentile(50):>8.1f} {h.percentile(95):>8.1f} "
+            f"{h.percentile(99):>8.1f} {h.max_ms:>8.1f}"
+        )
+
+
+def _issue(backend: SearchBackend, query: str, top_k: int, t_start: float, result: LoadResult) -> None:
+    error: Optional[BaseException] = None
+    try:
+        backend.search(query, top_k)
+    except Exception as exc:
+        error = exc
+    result.record((time.perf_counter() - t_start) * 1000, error)
+
+
+# ─── load models ────────────────────────────────────────────────────────────
+def run_open_loop(
+    backend: SearchBackend,
+    queries: Sequence[str],
+    *,
+    qps: float,
+    duration_s: float,
+    top_k: int = 5,
+    max_workers: int = 256,
+) -> LoadResult:
+    """Schedule `qps` requests per second for `duration_s` seconds."""
+    result = LoadResult(mode="open-loop", target=qps)
+    n = max(1, int(qps * duration_s))
+    interval = 1.0 / qps
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        start = time.perf_counter()
+        for i in range(n):
+            scheduled = start + i * interval
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            pool.submit(_issue, backend, queries[i % len(queries)], top_k, scheduled, result)
+    result.elapsed_s = time.perf_counter() - start
+    return result
+
+
+def run_closed_loop(
+    backend: SearchBackend,
+    queries: Sequence[str],
+    *,
+    concurrency: int,
+    duration_s: float,
+    top_k: int = 5,
+) -> LoadResult:
+    """Run `concurrency` workers back-to-back for `duration_s` seconds."""
+    result = LoadResult(mode="closed-loop", target=concurrency)
+    counter = itertools.count()
+    deadline = time.perf_counter() + duration_s
+
+    def worker() -> None:
+        while time.perf_counter() < deadline:
+            i = next(counter)
+            _issue(backend, queries[i % len(queries)], top_k, time.perf_counter(), result)
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    result.elapsed_s = time.perf_counter() - start
+    return result
+
+
+# ─── CLI ────────────────────────────────────────────────────────────────────
+def _steps(text: str) -> List[float]:
+    """Comma-separated load steps, each > 0."""
+    try:
+        steps = [float(v) for v in text.split(",")]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected numbers like 10,20,40, got {text!r}")
+    if not all(v > 0 for v in steps):                      # also rejects nan
+        raise argparse.ArgumentTypeError(f"every step must be > 0, got {text!r}")
+    return steps
+
+
+def _workers(text: str) -> List[float]:
+    steps = _steps(text)
+    if not all(v.is_integer() for v in steps):
+        raise argparse.ArgumentTypeError(f"worker counts must be whole numbers, got {text!r}")
+    return steps
+
+
+def _load_queries(path: Optional[str]) -> List[str]:
+    if not path:
+        return list(QUERIES)
+    lines = Path(path).read_text(encoding="utf-8").splitlines()
+    return [ln.strip() for ln in lines if ln.strip()]
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Load-test MovieLens vector search")
+    ap.add_argument("--store-id", default=DEFAULT_STORE_ID)
+    ap.add_argument("--local", action="store_true", help="use the offline stand-in backend")
+    load = ap.add_mutually_exclusive_group()
+    load.add_argument("--qps", type=_steps, help="open-loop target rate(s), e.g. 20 or 10,20,40")
+    load.add_argument("--concurrency", type=_workers, default="4", help="closed-loop worker count(s), e.g. 8 or 1,4,16")
+    ap.add_argument("--duration", type=float, default=10.0, help="seconds per step")
+    ap.add_argument("--top-k", type=int, default=5)
+    ap.add_argument("--queries-file", help="one query per line (default: movielens_queries.QUERIES)")
+    ap.add_argument("--timings", action="store_true", help="per-stage table (store backend only)")
+    ap.add_argument("--local-service-ms", type=float, default=8.0)
+    ap.add_argument("--local-slots", type=int, default=4)
+    ap.add_argument("--local-error-rate", type=float, default=0.0)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    queries = _load_queries(args.queries_file)
+    timings = StageTimings() if args.timings and not args.local else None
+    if args.local:
+        backend: SearchBackend = LocalBackend(
+            service_ms=args.local_service_ms,
+            slots=args.local_slots,
+            error_rate=args.local_error_rate,
+            seed=args.seed,
+        )
+        label = f"local stand-in (slots={args.local_slots}, service≈{args.local_service_ms:g} ms)"
+    else:
+        backend = StoreBackend(args.store_id, timings)
+        label = f"store {args.store_id}"
+
+    open_loop = args.qps is not None
+    steps = args.qps if open_loop else args.concurrency
+
+    warm_up = LoadResult(mode="warm-up", target=1)  # model load, connection pool
+    _issue(backend, queries[0], args.top_k, time.perf_counter(), warm_up)
+    if warm_up.errors:
+        print(f"⚠  warm-up request failed: {dict(warm_up.errors)}")
+    print(f"Load test → {label}, {len(queries)} queries, {args.duration:g}s per step\n")
+    print(LoadResult.HEADER)
+    for step in steps:
+        if open_loop:
+            res = run_open_loop(backend, queries, qps=step, duration_s=args.duration, top_k=args.top_k)
+        else:
+            res = run_closed_loop(backend, queries, concurrency=int(step), duration_s=args.duration, top_k=args.top_k)
+        print(res.row())
+        if res.errors:
+            print(f"{'':<12} errors: {dict(res.errors)}")
+
+    if timings is not None:
+        print("\n" + timings.table())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+"More like this" for MovieLens items, straight from the stored vectors.
+
+    python -m recipes.reccomender.more_like_this 82                 # Jurassic Park
+    python -m recipes.reccomender.more_like_this 82 50 --not 1 --top-k 10
+
+No query text is embedded: the seed items' vectors are looked up by
+`item_id` and averaged into the search query (`StoreSearcher.recommend`).
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+
+from dotenv import load_dotenv
+from projectdavid import Entity
+
+from recipes.reccomender.movielens_search import DISPLAY_FIELDS, StoreSearcher, hit_metadata
+from recipes.reccomender.search_timing import StageTimings
+
+DEFAULT_STORE_ID = "vect_mqfWyNlZbacer73PQu4Upy"
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Recommend MovieLens items similar to given item_ids")
+    ap.add_argument("positive", type=int, nargs="+", help="item_ids to find neighbours of")
+    ap.add_argument("--not", dest="negative", type=int, nargs="*", default=[], help="item_ids to steer away from")
+    ap.add_argument("--store-id", default=DEFAULT_STORE_ID)
+    ap.add_argument("--top-k", type=int, default=5)
+    ap.add_argument("--timings", action="store_true")
+    args = ap.parse_args()
+
+    load_dotenv()
+    client = Entity(
+        base_url=os.getenv("BASE_URL", "http://localhost:9000"),
+        api_key=os.getenv("ENTITIES_API_KEY"),
+    )
+    searcher = StoreSearcher(client)
+    timings = StageTimings() if args.timings else None
+
+    hits = searcher.recommend(
+        args.store_id,
+        args.positive,
+        args.negative,
+        args.top_k,
+        include=DISPLAY_FIELDS,
+        timings=timings,
+    )
+    for i, h in enumerate(hits, 1):
+        md = hit_metadata(h)
+        genres = ", ".join(md.get("genres", [])) or "Unknown genre"
+        print(f"{i}. 🎬 {md.get('title', '<untitled>')} — [{genres}] ({md.get('release_year', '—')})  "
+              f"score={h['score']:.3f}  item_id={md.get('item_id')}")
+    if timings is not None:
+        print("\n" + timings.table())
+    searcher.close()
+
+
+if __name__ == "__main__":
+    main()
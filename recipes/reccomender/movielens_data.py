@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+MovieLens 100k loaders shared by the offline recommenders.
+
+MovieLens ids are dense and 1-based (users 1‥943, items 1‥1682), so a
+user/item id maps to matrix row `id - 1` with no lookup table.  Matrices are
+`scipy.sparse.csr_matrix` with users as rows and items as columns.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+DATA_DIR = Path(__file__).parent / "ml-100k" / "ml-100k"
+ARTIFACT_DIR = Path(__file__).parent / "artifacts"
+GENRE_FLAGS = [
+    "Action", "Adventure", "Animation", "Children's", "Comedy", "Crime",
+    "Documentary", "Drama", "Fantasy", "Film-Noir", "Horror", "Musical",
+    "Mystery", "Romance", "Sci-Fi", "Thriller", "War", "Western",
+]
+
+
+def load_items(data_dir: Path = DATA_DIR) -> List[Dict[str, Any]]:
+    """`u.item` as `{"item_id", "title", "genres", "release_year"}` dicts, in id order."""
+    items = []
+    with open(data_dir / "u.item", encoding="latin-1") as fh:
+        for line in fh:
+            cols = line.rstrip("\n").split("|")
+            if len(cols) < 24:
+                continue
+            year = cols[2][-4:]
+            items.append({
+                "item_id": int(cols[0]),
+                "title": cols[1],
+                "genres": [g for g, flag in zip(GENRE_FLAGS, cols[6:24]) if flag == "1"],
+                "release_year": int(year) if year.isdigit() else None,
+            })
+    return items
+
+
+def load_ratings(name: str = "u.data", data_dir: Path = DATA_DIR) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """`(user_ids, item_ids, ratings)` arrays from a tab-separated ratings file."""
+    raw = np.loadtxt(data_dir / name, dtype=np.int32, usecols=(0, 1, 2))
+    return raw[:, 0], raw[:, 1], raw[:, 2].astype(np.float32)
+
+
+def dataset_shape(data_dir: Path = DATA_DIR) -> Tuple[int, int]:
+    """`(n_users, n_items)` from `u.info`."""
+    counts = {}
+    for line in (data_dir / "u.info").read_text().splitlines():
+        value, _, key = line.partition(" ")
+        counts[key.strip()] = int(value)
+    return counts["users"], counts["items"]
+
+
+def ratings_matrix(
+    name: str = "u.data",
+    data_dir: Path = DATA_DIR,
+    shape: Optional[Tuple[int, int]] = None,
+):
+    """Sparse user × item rating matrix; row/column = id - 1."""
+    from scipy.sparse import csr_matrix
+
+    users, items, ratings = load_ratings(name, data_dir)
+    return csr_matrix(
+        (ratings, (users - 1, items - 1)),
+        shape=shape or dataset_shape(data_dir),
+        dtype=np.float32,
+    )
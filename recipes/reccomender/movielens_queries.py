@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Query corpus for the MovieLens search recipes.
+
+Kept free of SDK imports so load tests and benchmarks can replay it without
+constructing a client.
+"""
+
+QUERIES = [
+    # 🎭 Stylistic & tonal
+    "A film with a whimsical tone but dark undertones, likely animated and aimed at children but emotionally traumatic for adults.",
+    "An ensemble comedy where at least one character wears a trench coat and the score uses saxophones.",
+    "A low-budget 90s drama about unrequited love that never explicitly mentions romance.",
+
+    # 🧠 Temporal & relational
+    "A sci-fi movie made before the year 2000 that was clearly inspired by Blade Runner but takes place underwater.",
+    "A musical from the 80s that probably flopped on release but became a cult classic due to VHS circulation.",
+    "A romantic comedy that feels like a precursor to When Harry Met Sally, but no one remembers it by name.",
+
+    # 🪩 Subcultural / atmospheric
+    "A movie you’d find on late-night TV in 1997, featuring moody synth music, leather jackets, and an ambiguous ending.",
+    "Something Gen X would consider nostalgic, but that millennials mostly know from memes.",
+    "A film that feels like it should have aired on PBS but has unexpected violence.",
+
+    # 🕵️ Meta / ironic
+    "A murder mystery that’s not really about the murder, but about small-town dynamics and buried secrets.",
+    "A movie pretending to be deep, made in the 90s, with at least one character who quotes Nietzsche.",
+    "A self-serious sci-fi film that takes itself too seriously but accidentally becomes a comedy.",
+
+    # 🧩 Hypothetical crossover
+    "If Jurassic Park were directed by Tim Burton and scored by Danny Elfman but was set in space instead of an island.",
+    "A mashup of Casablanca and The Matrix in spirit, if not in literal content.",
+    "Something that feels like a live-action adaptation of a dream about Looney Tunes crossed with an arthouse thriller.",
+]
@@ -0,0 +1,581 @@
+#!/usr/bin/env python3
+"""
+Staged MovieLens vector search shared by the search recipes and the
+`search_movies` tool executor.
+
+`StoreSearcher.search()` sends the same request as the SDK's
+`vector_file_search_raw()` – `POST /v1/vector-stores/{id}/search` on the
+Entities API, with the store's `vector_field` – but performs the steps
+itself so each one can be timed:
+
+    resolve   store id → store record (cached after the first call)
+    encode    query text → embedding (SDK embedding model, truncated to
+              the model's max length)
+    search    the search call (the API, or Qdrant for projected and
+              paged queries – see below)
+    decode    hit construction
+
+Hits have the shape `{"id", "score", "text", "metadata"}`; `hit_metadata()`
+also reads the SDK's `meta_data` spelling.  Filters use the SDK's dict
+format (`{"must": [{"key": …, "match": {"value": …}}, …]}`) and are passed
+through unchanged.
+
+For large result sets (candidate generation, full-catalog scoring)
+`iter_search()` yields hits lazily in score order, one page at a time, and
+`open_cursor()` / `fetch_page()` expose the same paging with an explicit,
+resumable `SearchCursor`.  Pages are fetched with `offset` / `limit` (and
+`score_threshold`) applied server-side – by Qdrant's `/points/query` once
+an offset or threshold is needed, as the API search has neither – so each
+page transfers and decodes only its own hits and only one page is held in
+memory; a consumer that stops early never fetches the remaining pages.
+Qdrant still ranks `offset + limit` candidates per page, so very deep pages
+cost more on the server:
+
+    matches = (h for h in searcher.iter_search(STORE_ID, q, page_size=200)
+               if h["metadata"].get("release_year", 0) < 1980)
+    first_20 = list(itertools.islice(matches, 20))
+
+Every search call accepts a payload projection: `include=` (only these
+payload keys) or `exclude=` (everything but these), and `with_vector=True`
+to return the stored vectors.  The API search always returns full payloads
+and no vectors, so a projected search is sent to Qdrant's `/points/query`
+at `QDRANT_URL` with `with_payload` / `with_vector` instead – the unused
+fields (including the chunk `text`) are never serialised, transferred or
+decoded.  The MovieLens printers and the `search_movies` tool only keep
+`DISPLAY_FIELDS`.
+
+`recommend()` is "more like this" by MovieLens `item_id`: the seed items'
+stored vectors are combined into the query (several positive and negative
+seeds allowed), so no text is embedded at all and the neighbours are those
+of the item itself rather than of a sentence describing it.  Seeds are
+excluded from the results.
+
+Stored vectors are not exposed by the API, so `recommend()` and the offline
+exports (`scroll_points()`, `collection_info()`) read them from Qdrant too
+(`QDRANT_URL`, default `http://localhost:6333`, key `QDRANT_API_KEY`).
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from dataclasses import dataclass, replace
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import httpx
+import numpy as np
+
+from recipes.reccomender.search_timing import StageTimings, timed
+
+DEFAULT_QDRANT_URL = "http://localhost:6333"
+CLIP_VECTOR_SIZE = 1024     # stores of this size are searched on `caption_vector` (SDK rule)
+
+# Payload keys the result printers and the `search_movies` tool actually use.
+DISPLAY_FIELDS = ("item_id", "title", "genres", "release_year")
+
+
+def hit_metadata(hit: Dict[str, Any]) -> Dict[str, Any]:
+    """Metadata of a hit from either `query_store()` or `vector_file_search_raw()`."""
+    return hit.get("meta_data") or hit.get("metadata") or {}
+
+
+@dataclass(frozen=True)
+class SearchCursor:
+    """Resumable position in a paged search – holds the encoded query, not the hits."""
+
+    store_id: str
+    vector: Tuple[float, ...]
+    page_size: int = 100
+    offset: int = 0
+    filters: Optional[Dict[str, Any]] = None
+    score_threshold: Optional[float] = None
+    include: Optional[Tuple[str, ...]] = None
+    exclude: Optional[Tuple[str, ...]] = None
+    exhausted: bool = False
+
+
+def payload_selector(
+    include: Optional[Sequence[str]] = None,
+    exclude: Optional[Sequence[str]] = None,
+) -> Any:
+    """Qdrant `with_payload` value for an include *or* exclude projection."""
+    if include is not None and exclude is not None:
+        raise ValueError("pass either include= or exclude=, not both")
+    if include is not None:
+        return {"include": list(include)} if include else False
+    if exclude is not None:
+        return {"exclude": list(exclude)}
+    return True
+
+
+def _project(
+    metadata: Dict[str, Any],
+    include: Optional[Sequence[str]],
+    exclude: Optional[Sequence[str]],
+) -> Dict[str, Any]:
+    if include is not None:
+        return {k: metadata[k] for k in include if k in metadata}
+    if exclude is not None:
+        return {k: v for k, v in metadata.items() if k not in exclude}
+    return metadata
+
+
+class StoreSearcher:
+    """Encode + search a vector store with optional per-stage timing hooks."""
+
+    def __init__(
+        self,
+        client: Any,
+        *,
+        qdrant_url: Optional[str] = None,
+        timeout: float = 30.0,
+    ) -> None:
+        self.client = client
+        self.http = httpx.Client(
+            base_url=str(client.base_url).rstrip("/"),
+            timeout=timeout,
+            headers={"X-API-Key": client.api_key} if client.api_key else None,
+        )
+        self.qdrant_url = (qdrant_url or os.getenv("QDRANT_URL") or DEFAULT_QDRANT_URL).rstrip("/")
+        self.timeout = timeout
+        self._qdrant: Optional[httpx.Client] = None
+        self._stores: Dict[str, Dict[str, Any]] = {}
+        self._item_vectors: Dict[Tuple[str, Any], Any] = {}
+        self._lock = threading.Lock()
+
+    # ─── stages ─────────────────────────────────────────────────────────────
+    def store_info(
+        self,
+        store_id: str,
+        timings: Optional[StageTimings] = None,
+        *,
+        request_timeout: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """The store record (`GET /v1/vector-stores/{id}`), cached after the first call."""
+        with self._lock:
+            info = self._stores.get(store_id)
+        if info is None:
+            with timed(timings, "resolve"):
+                resp = self.http.get(
+                    f"/v1/vector-stores/{store_id}",
+                    timeout=request_timeout if request_timeout is not None else httpx.USE_CLIENT_DEFAULT,
+                )
+                resp.raise_for_status()
+                info = resp.json()
+            with self._lock:
+                self._stores[store_id] = info
+        return info
+
+    def collection_for(self, store_id: str, timings: Optional[StageTimings] = None) -> str:
+        return self.store_info(store_id, timings)["collection_name"]
+
+    def healthy(self, store_id: str) -> bool:
+        """True if the API answers for `store_id` (not cached)."""
+        try:
+            return self.http.get(f"/v1/vector-stores/{store_id}").is_success
+        except httpx.HTTPError:
+            return False
+
+    def vector_field(self, store_id: str) -> Optional[str]:
+        """Named vector the API searches for this store (None = the default vector)."""
+        return "caption_vector" if self.store_info(store_id).get("vector_size") == CLIP_VECTOR_SIZE else None
+
+    def encode(
+        self,
+        text: str,
+        timings: Optional[StageTimings] = None,
+        *,
+        store_id: Optional[str] = None,
+    ) -> List[float]:
+        """Query embedding; for a CLIP store (`store_id` given) the CLIP text encoder."""
+        processor = self.client.vectors.file_processor
+        clip = store_id is not None and self.vector_field(store_id) == "caption_vector"
+        with timed(timings, "encode"):
+            if clip:
+                return processor.encode_clip_text(text).tolist()
+            return processor.embedding_model.encode(
+                [text],
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+                truncate="model_max_length",
+                show_progress_bar=False,
+            )[0].tolist()
+
+    def query(
+        self,
+        store_id: str,
+        vector: Sequence[float],
+        top_k: int,
+        timings: Optional[StageTimings] = None,
+        *,
+        filters: Optional[Dict[str, Any]] = None,
+        include: Optional[Sequence[str]] = None,
+        exclude: Optional[Sequence[str]] = None,
+        with_vector: bool = False,
+        offset: int = 0,
+        score_threshold: Optional[float] = None,
+        request_timeout: Optional[float] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Hits `offset … offset + top_k` for an already-encoded query.
+
+        A plain query is the `vector_file_search_raw()` request.  A projected
+        (`include` / `exclude`), `with_vector`, offset or thresholded query
+        goes to Qdrant's `/points/query`, which applies all of them
+        server-side – the API search takes none of them.
+        """
+        selector = payload_selector(include, exclude)
+        direct = selector is not True or with_vector or offset > 0 or score_threshold is not None
+        timeout = request_timeout if request_timeout is not None else httpx.USE_CLIENT_DEFAULT
+        field = self.vector_field(store_id)
+
+        with timed(timings, "search"):
+            if direct:
+                body: Dict[str, Any] = {
+                    "query": list(vector),
+                    "limit": top_k,
+                    "offset": offset,
+                    "with_payload": selector,
+                    "with_vector": [field] if with_vector and field else with_vector,
+                }
+                if field:
+                    body["using"] = field
+                if filters:
+                    body["filter"] = filters
+                if score_threshold is not None:
+                    body["score_threshold"] = score_threshold
+                resp = self.qdrant.post(
+                    f"/collections/{self.collection_for(store_id, timings)}/points/query",
+                    json=body,
+                    timeout=timeout,
+                )
+                resp.raise_for_status()
+                raw = resp.json()["result"]["points"]
+            else:
+                resp = self.http.post(
+                    f"/v1/vector-stores/{store_id}/search",
+                    json={"query_vector": list(vector), "top_k": top_k, "filters": filters, "vector_field": field},
+                    timeout=timeout,
+                )
+                resp.raise_for_status()
+                raw = resp.json()
+
+        with timed(timings, "decode"):
+            if not direct:
+                return [
+                    {
+                        "id": h.get("id", h.get("vector_id")),
+                        "score": h["score"],
+                        "text": h.get("text"),
+                        "metadata": hit_metadata(h),
+                    }
+                    for h in raw
+                ]
+            hits = []
+            for p in raw:
+                payload = p.get("payload") or {}
+                hit = {
+                    "id": p["id"],
+                    "score": p["score"],
+                    "text": payload.get("text"),
+                    "metadata": {k: v for k, v in payload.items() if k != "text"},
+                }
+                if with_vector:
+                    hit["vector"] = self._stored_vector(store_id, p.get("vector"))
+                hits.append(hit)
+            return hits
+
+    # ─── public API ─────────────────────────────────────────────────────────
+    def search(
+        self,
+        store_id: str,
+        query_text: str,
+        top_k: int = 5,
+        *,
+        filters: Optional[Dict[str, Any]] = None,
+        include: Optional[Sequence[str]] = None,
+        exclude: Optional[Sequence[str]] = None,
+        with_vector: bool = False,
+        timings: Optional[StageTimings] = None,
+    ) -> List[Dict[str, Any]]:
+        with timed(timings, "total"):
+            self.store_info(store_id, timings)
+            return self.search_by_vector(
+                store_id,
+                self.encode(query_text, timings, store_id=store_id),
+                top_k,
+                filters=filters,
+                include=include,
+                exclude=exclude,
+                with_vector=with_vector,
+                timings=timings,
+            )
+
+    def search_by_vector(
+        self,
+        store_id: str,
+        vector: Sequence[float],
+        top_k: int = 5,
+        *,
+        filters: Optional[Dict[str, Any]] = None,
+        include: Optional[Sequence[str]] = None,
+        exclude: Optional[Sequence[str]] = None,
+        with_vector: bool = False,
+        request_timeout: Optional[float] = None,
+        timings: Optional[StageTimings] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Search with an already-computed query vector (no encoder call).
+
+        `request_timeout` (seconds) overrides the client timeout for this call.
+        """
+        return self.query(
+            store_id,
+            vector,
+            top_k,
+            timings,
+            filters=filters,
+            include=include,
+            exclude=exclude,
+            with_vector=with_vector,
+            request_timeout=request_timeout,
+        )
+
+    def recommend(
+        self,
+        store_id: str,
+        positive: Sequence[Any],
+        negative: Sequence[Any] = (),
+        top_k: int = 5,
+        *,
+        filters: Optional[Dict[str, Any]] = None,
+        include: Optional[Sequence[str]] = None,
+        exclude: Optional[Sequence[str]] = None,
+        timings: Optional[StageTimings] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Items similar to the `positive` item_ids and unlike the `negative` ones.
+
+        The query is built from the vectors already stored for those items
+        the way Qdrant's `average_vector` recommend does it –
+        `mean(positive) + (mean(positive) − mean(negative))` – so there is
+        no encoder call.
+        """
+        if not positive:
+            raise ValueError("recommend() needs at least one positive item_id")
+        with timed(timings, "total"):
+            vectors = self.item_vectors(store_id, [*positive, *negative], timings)
+            unknown = [i for i in (*positive, *negative) if i not in vectors]
+            if unknown:
+                raise ValueError(f"unknown item_id(s) in store {store_id}: {unknown}")
+
+            query = np.mean([vectors[i] for i in positive], axis=0)
+            if negative:
+                query = 2 * query - np.mean([vectors[i] for i in negative], axis=0)
+
+            seeds = {*positive, *negative}
+            fetch_include, fetch_exclude = include, exclude    # item_id is needed to drop the seeds
+            if include is not None and "item_id" not in include:
+                fetch_include = [*include, "item_id"]
+            if exclude is not None and "item_id" in exclude:
+                fetch_exclude = [k for k in exclude if k != "item_id"]
+            hits = self.search_by_vector(
+                store_id,
+                query.tolist(),
+                top_k + len(seeds),
+                filters=filters,
+                include=fetch_include,
+                exclude=fetch_exclude,
+                timings=timings,
+            )
+            with timed(timings, "decode"):
+                hits = [h for h in hits if h["metadata"].get("item_id") not in seeds][:top_k]
+                if fetch_include is not include or fetch_exclude is not exclude:
+                    for h in hits:
+                        h["metadata"] = _project(h["metadata"], include, exclude)
+            return hits
+
+    # ─── stored vectors (Qdrant) ────────────────────────────────────────────
+    @property
+    def qdrant(self) -> httpx.Client:
+        if self._qdrant is None:
+            api_key = os.getenv("QDRANT_API_KEY")
+            self._qdrant = httpx.Client(
+                base_url=self.qdrant_url,
+                timeout=self.timeout,
+                headers={"api-key": api_key} if api_key else None,
+            )
+        return self._qdrant
+
+    def _stored_vector(self, store_id: str, vector: Any) -> Any:
+        if isinstance(vector, dict):                       # named vectors
+            return vector.get(self.vector_field(store_id) or "", next(iter(vector.values()), None))
+        return vector
+
+    def item_vectors(
+        self,
+        store_id: str,
+        item_ids: Sequence[Any],
+        timings: Optional[StageTimings] = None,
+    ) -> Dict[Any, np.ndarray]:
+        """Stored vectors of MovieLens `item_id`s (cached); unknown ids are left out."""
+        found: Dict[Any, np.ndarray] = {}
+        missing = []
+        with self._lock:
+            for item_id in item_ids:
+                vec = self._item_vectors.get((store_id, item_id))
+                if vec is None:
+                    missing.append(item_id)
+                else:
+                    found[item_id] = vec
+        if missing:
+            with timed(timings, "lookup"):
+                points = list(self.scroll_points(
+                    store_id,
+                    include=["item_id"],
+                    filters={"must": [{"key": "item_id", "match": {"any": missing}}]},
+                ))
+            with self._lock:
+                for p in points:
+                    item_id = (p.get("payload") or {}).get("item_id")
+                    vec = np.asarray(self._stored_vector(store_id, p.get("vector")), dtype=np.float32)
+                    found[item_id] = vec
+                    self._item_vectors[(store_id, item_id)] = vec
+        return found
+
+    def scroll_points(
+        self,
+        store_id: str,
+        *,
+        include: Optional[Sequence[str]] = None,
+        with_vector: bool = True,
+        filters: Optional[Dict[str, Any]] = None,
+        page_size: int = 512,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yield every stored point (`{"id", "payload", "vector"?}`) in id order.
+
+        Used to export the stored embeddings for offline jobs; pages through
+        Qdrant's `/points/scroll` so only one page is held at a time.
+        """
+        collection = self.collection_for(store_id)
+        field = self.vector_field(store_id)
+        body: Dict[str, Any] = {
+            "limit": page_size,
+            "with_payload": payload_selector(include),
+            "with_vector": [field] if with_vector and field else with_vector,
+        }
+        if filters:
+            body["filter"] = filters
+        while True:
+            resp = self.qdrant.post(f"/collections/{collection}/points/scroll", json=body)
+            resp.raise_for_status()
+            result = resp.json()["result"]
+            for p in result["points"]:
+                if p.get("vector") is not None:
+                    p["vector"] = self._stored_vector(store_id, p["vector"])
+                yield p
+            if result.get("next_page_offset") is None:
+                return
+            body["offset"] = result["next_page_offset"]
+
+    def collection_info(self, store_id: str) -> Dict[str, Any]:
+        """Qdrant collection description (index status, HNSW / quantization config)."""
+        resp = self.qdrant.get(f"/collections/{self.collection_for(store_id)}")
+        resp.raise_for_status()
+        return resp.json()["result"]
+
+    # ─── paging ─────────────────────────────────────────────────────────────
+    def open_cursor(
+        self,
+        store_id: str,
+        query_text: str,
+        *,
+        page_size: int = 100,
+        filters: Optional[Dict[str, Any]] = None,
+        score_threshold: Optional[float] = None,
+        include: Optional[Sequence[str]] = None,
+        exclude: Optional[Sequence[str]] = None,
+        timings: Optional[StageTimings] = None,
+    ) -> SearchCursor:
+        """Encode `query_text` once and return a cursor positioned at rank 0."""
+        if page_size <= 0:
+            raise ValueError("page_size must be positive")
+        payload_selector(include, exclude)                 # validate early
+        return SearchCursor(
+            store_id=store_id,
+            vector=tuple(self.encode(query_text, timings, store_id=store_id)),
+            page_size=page_size,
+            filters=filters,
+            score_threshold=score_threshold,
+            include=tuple(include) if include is not None else None,
+            exclude=tuple(exclude) if exclude is not None else None,
+        )
+
+    def fetch_page(
+        self,
+        cursor: SearchCursor,
+        timings: Optional[StageTimings] = None,
+    ) -> Tuple[List[Dict[str, Any]], SearchCursor]:
+        """Return the next page of hits and the cursor positioned after it."""
+        if cursor.exhausted:
+            return [], cursor
+        hits = self.query(
+            cursor.store_id,
+            cursor.vector,
+            cursor.page_size,
+            timings,
+            filters=cursor.filters,
+            include=cursor.include,
+            exclude=cursor.exclude,
+            offset=cursor.offset,
+            score_threshold=cursor.score_threshold,
+        )
+        return hits, replace(
+            cursor,
+            offset=cursor.offset + len(hits),
+            exhausted=len(hits) < cursor.page_size,
+        )
+
+    def iter_search(
+        self,
+        store_id: str,
+        query_text: str,
+        *,
+        page_size: int = 100,
+        limit: Optional[int] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        score_threshold: Optional[float] = None,
+        include: Optional[Sequence[str]] = None,
+        exclude: Optional[Sequence[str]] = None,
+        timings: Optional[StageTimings] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yield hits in score order, fetching `page_size` at a time.
+
+        Pages are requested lazily, so breaking out of the loop stops the
+        scan.  `limit` caps the total number of hits yielded.
+        """
+        cursor = self.open_cursor(
+            store_id,
+            query_text,
+            page_size=page_size if limit is None else min(page_size, limit),
+            filters=filters,
+            score_threshold=score_threshold,
+            include=include,
+            exclude=exclude,
+            timings=timings,
+        )
+        yielded = 0
+        while not cursor.exhausted:
+            hits, cursor = self.fetch_page(cursor, timings)
+            for h in hits:
+                if limit is not None and yielded >= limit:
+                    return
+                yield h
+                yielded += 1
+
+    def close(self) -> None:
+        self.http.close()
+        if self._qdrant is not None:
+            self._qdrant.close()
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Personalised, latency-bounded re-ranking of `search_movies` candidates.
+
+This is the plug-in point for "your user specific pretrained model":
+
+• `FeatureBuilder` turns the whole candidate list into one feature matrix
+  (rows = candidates, columns = `FEATURES`) with vectorised lookups – vector
+  score, the user's ALS affinity for the item, average rating, popularity
+  and recency.
+• Any object with `score(user, features) -> scores` (`CandidateScorer`)
+  can rank them; `LinearScorer` is a small hand-weighted default.
+• `PersonalReranker` runs features + model on a worker thread and waits at
+  most `budget_ms`.  Over budget, or if the model raises, the raw vector
+  order is served and the late result is discarded, so a slow model never
+  adds more than the budget to a tool call.  A scorer that is already
+  running cannot be stopped, so calls in flight are counted: while every
+  worker is busy (e.g. hung model calls) new requests fall back at once
+  with reason "rerank pool busy" instead of queueing behind them.  Every
+  call returns a `rerank.RerankReport` for logging.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import Any, Dict, List, Optional, Protocol, Sequence, Tuple
+
+import numpy as np
+
+from recipes.reccomender.movielens_search import hit_metadata
+from recipes.reccomender.rerank import RerankReport
+
+FEATURES = ("vector_score", "cf_affinity", "avg_rating", "log_popularity", "recency")
+
+
+# ─── model interface ────────────────────────────────────────────────────────
+class CandidateScorer(Protocol):
+    def score(self, user: Optional[int], features: np.ndarray) -> Sequence[float]: ...
+
+
+class LinearScorer:
+    """Weighted sum of the `FEATURES` columns."""
+
+    DEFAULT_WEIGHTS = {
+        "vector_score": 1.0,
+        "cf_affinity": 0.5,
+        "avg_rating": 0.15,
+        "log_popularity": 0.1,
+        "recency": 0.0,
+    }
+
+    def __init__(self, weights: Optional[Dict[str, float]] = None):
+        merged = {**self.DEFAULT_WEIGHTS, **(weights or {})}
+        self.weights = np.asarray([merged[f] for f in FEATURES], dtype=np.float32)
+
+    def score(self, user: Optional[int], features: np.ndarray) -> Sequence[float]:
+        return features @ self.weights
+
+
+# ─── features ───────────────────────────────────────────────────────────────
+class FeatureBuilder:
+    """
+    Batched candidate features.  `recommender` (ALS factors) and `metadata`
+    (item-metadata store) are optional; missing sources give zero columns.
+    """
+
+    def __init__(self, recommender=None, metadata=None):
+        self.recommender = recommender
+        self.metadata = metadata
+        if metadata is not None:
+            pop = np.asarray(metadata.popularity, dtype=np.float32)
+            self._log_pop_max = float(np.log1p(pop.max())) or 1.0
+
+    def build(self, user: Optional[int], hits: Sequence[Dict[str, Any]]) -> np.ndarray:
+        n = len(hits)
+        feats = np.zeros((n, len(FEATURES)), dtype=np.float32)
+        mds = [hit_metadata(h) for h in hits]
+        item_ids = np.asarray([md.get("item_id") or 0 for md in mds], dtype=np.int64)
+
+        feats[:, 0] = [h["score"] for h in hits]
+
+        rec = self.recommender
+        if rec is not None and user is not None and 1 <= user <= rec.n_users:
+            ok = (item_ids >= 1) & (item_ids <= rec.item_factors.shape[0])
+            feats[ok, 1] = rec.item_factors[item_ids[ok] - 1] @ rec.user_factors[user - 1]
+
+        if self.metadata is not None:
+            rows = self.metadata.rows(item_ids)
+            ok = rows >= 0
+            avg = np.asarray(self.metadata.avg_rating[rows[ok]], dtype=np.float32)
+            feats[ok, 2] = np.nan_to_num((avg - 3.0) / 2.0)
+            feats[ok, 3] = np.log1p(np.asarray(self.metadata.popularity[rows[ok]], dtype=np.float32)) / self._log_pop_max
+
+        years = np.asarray([md.get("release_year") or np.nan for md in mds], dtype=np.float32)
+        feats[:, 4] = np.nan_to_num((years - 1990.0) / 30.0)
+        return feats
+
+
+# ─── reranker ───────────────────────────────────────────────────────────────
+class PersonalReranker:
+    def __init__(
+        self,
+        scorer: CandidateScorer,
+        features: FeatureBuilder,
+        *,
+        budget_ms: float = 50.0,
+        workers: int = 2,
+    ):
+        self.scorer = scorer
+        self.features = features
+        self.budget_ms = budget_ms
+        self.workers = workers
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="rerank")
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> bool:
+        with self._lock:
+            if self._in_flight >= self.workers:
+                return False
+            self._in_flight += 1
+            return True
+
+    def _release(self, _future=None) -> None:
+        with self._lock:
+            self._in_flight -= 1
+
+    def _score(self, user: Optional[int], hits: Sequence[Dict[str, Any]]) -> Tuple[np.ndarray, float]:
+        feats = self.features.build(user, hits)
+        t0 = time.perf_counter()
+        scores = np.asarray(self.scorer.score(user, feats), dtype=np.float64)
+        return scores, (time.perf_counter() - t0) * 1000
+
+    def rerank(
+        self,
+        user: Optional[int],
+        hits: List[Dict[str, Any]],
+        top_k: int,
+    ) -> Tuple[List[Dict[str, Any]], RerankReport]:
+        """
+        First `top_k` of `hits` re-ordered by the model, or in vector order on
+        budget overrun / model error.  Reranked hits gain `rerank_score`.
+        """
+        start = time.perf_counter()
+        report = RerankReport(candidates=len(hits), batch_size=len(hits), budget_ms=self.budget_ms)
+
+        def _fallback(reason: str):
+            report.fell_back = True
+            report.reason = reason
+            report.total_ms = (time.perf_counter() - start) * 1000
+            return hits[:top_k], report
+
+        if len(hits) <= 1:
+            return _fallback("nothing to rerank")
+
+        if not self._reserve():
+            return _fallback("rerank pool busy")
+        future = self._pool.submit(self._score, user, hits)
+        future.add_done_callback(self._release)       # also runs on cancel
+        try:
+            scores, score_ms = future.result(timeout=self.budget_ms / 1000)
+        except FutureTimeout:
+            future.cancel()
+            return _fallback("budget exceeded")
+        except Exception as exc:                       # model errors must not fail the tool call
+            return _fallback(f"scorer error: {exc}")
+
+        report.batches_scored = 1
+        report.score_ms = report.max_batch_ms = score_ms
+        order = np.argsort(-scores, kind="stable")[:top_k]
+        reranked = [{**hits[j], "rerank_score": float(scores[j])} for j in order]
+        report.total_ms = (time.perf_counter() - start) * 1000
+        return reranked, report
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
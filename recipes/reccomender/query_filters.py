@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Rule-based pre-filter extraction for natural-language MovieLens queries.
+
+Queries such as *"a sci-fi movie made before the year 2000"* or *"a musical
+from the 80s"* carry hard constraints that the embedding only captures
+loosely.  `parse_query()` pulls the genre and release-year constraints out
+with a handful of precompiled regexes, and `QueryConstraints.to_store_filters()`
+turns them into a filter dict accepted by `vector_file_search_raw(filters=…)`.
+
+• The ingest recipe (`ingest_movielens_all_attributes.py`) stores metadata
+  flat in the point payload, so the filter keys are `genres` and
+  `release_year` – pass `key_prefix="metadata."` for stores that nest it.
+• Several genres in one query ("romantic comedy") become a `should` group,
+  i.e. *at least one* of them must match; a single genre is a `must`.
+• Genres preceded by a negation ("never mentions romance") are ignored.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+# ─── vocabulary ─────────────────────────────────────────────────────────────
+# MovieLens genre name → surface forms that imply it.
+GENRE_PATTERNS: Dict[str, str] = {
+    "Action":      r"(?<!live-)(?<!live )action",
+    "Adventure":   r"adventures?",
+    "Animation":   r"animated|animation|cartoons?|anime",
+    "Children's":  r"children'?s|kids'?|family[- ]friendly|(?:for|aimed at) children",
+    "Comedy":      r"comed(?:y|ies)|comedic|rom-?coms?",
+    "Crime":       r"crime|heist|gangsters?|mobsters?",
+    "Documentary": r"documentar(?:y|ies)",
+    "Drama":       r"dramas?",
+    "Fantasy":     r"fantasy",
+    "Film-Noir":   r"film[- ]noir|noir",
+    "Horror":      r"horror|slashers?",
+    "Musical":     r"musicals?",
+    "Mystery":     r"myster(?:y|ies)|whodunn?its?",
+    "Romance":     r"romance|romantic|rom-?coms?|love stor(?:y|ies)",
+    "Sci-Fi":      r"sci-?fi|science[- ]fiction",
+    "Thriller":    r"thrillers?",
+    "War":         r"war (?:film|movie|drama|epic)s?",
+    "Western":     r"westerns?",
+}
+
+NEGATORS = {"no", "not", "never", "without", "nothing", "isn't", "aren't",
+            "doesn't", "don't", "isn’t", "aren’t", "doesn’t", "don’t"}
+NEGATION_WINDOW = 3                              # tokens looked at before a match
+_CLAUSE_BREAK_RE = re.compile(r"[,;:.!?()]|\b(?:but|and|or|yet)\b", re.I)  # negation does not cross these
+
+GENRE_KEY = "genres"
+YEAR_KEY  = "release_year"
+
+_GENRE_RES: List[Tuple[str, re.Pattern]] = [
+    (genre, re.compile(rf"\b(?:{pattern})\b", re.IGNORECASE))
+    for genre, pattern in GENRE_PATTERNS.items()
+]
+
+_YEAR = r"(1[89]\d\d|20\d\d)"
+_RANGE_RE  = re.compile(rf"\b(?:between|from)\s+{_YEAR}\s+(?:and|to|-)\s+{_YEAR}\b", re.I)
+_BEFORE_RE = re.compile(rf"\b(?:before|prior to|pre-?)\s*(?:the\s+year\s+)?{_YEAR}\b", re.I)
+_AFTER_RE  = re.compile(rf"\b(?:after|post-?)\s*(?:the\s+year\s+)?{_YEAR}\b", re.I)
+_SINCE_RE  = re.compile(rf"\bsince\s+(?:the\s+year\s+)?{_YEAR}\b", re.I)
+_EXACT_RE  = re.compile(rf"\b(?:made|released|filmed|shot|from)\s+(?:in\s+)?(?:the\s+year\s+)?{_YEAR}\b", re.I)
+_DECADE_RE = re.compile(r"\b(early|mid|late)?[- ]?(?:the\s+)?(?:'|’)?(19|20)?(\d)0'?s\b", re.I)
+
+_DECADE_PART = {None: (0, 9), "early": (0, 3), "mid": (3, 6), "late": (6, 9)}
+
+
+# ─── result type ────────────────────────────────────────────────────────────
+@dataclass(frozen=True)
+class QueryConstraints:
+    genres: Tuple[str, ...] = ()
+    year_gte: Optional[int] = None
+    year_lte: Optional[int] = None
+
+    def is_empty(self) -> bool:
+        return not self.genres and self.year_gte is None and self.year_lte is None
+
+    def to_store_filters(self, key_prefix: str = "") -> Optional[Dict[str, Any]]:
+        """Return a `{"must": …, "should": …}` filter dict, or None if unconstrained."""
+        if self.is_empty():
+            return None
+
+        must: List[Dict[str, Any]] = []
+        should: List[Dict[str, Any]] = []
+
+        if self.year_gte is not None or self.year_lte is not None:
+            rng = {k: v for k, v in (("gte", self.year_gte), ("lte", self.year_lte)) if v is not None}
+            must.append({"key": f"{key_prefix}{YEAR_KEY}", "range": rng})
+
+        genre_conds = [
+            {"key": f"{key_prefix}{GENRE_KEY}", "match": {"value": g}} for g in self.genres
+        ]
+        if len(genre_conds) == 1:
+            must.extend(genre_conds)
+        else:
+            should.extend(genre_conds)
+
+        filters: Dict[str, Any] = {}
+        if must:
+            filters["must"] = must
+        if should:
+            filters["should"] = should
+        return filters
+
+    def describe(self) -> str:
+        parts = []
+        if self.genres:
+            parts.append("genre∈{" + ", ".join(self.genres) + "}")
+        if self.year_gte is not None or self.year_lte is not None:
+            lo = self.year_gte if self.year_gte is not None else "…"
+            hi = self.year_lte if self.year_lte is not None else "…"
+            parts.append(f"year∈[{lo}, {hi}]")
+        return "  ".join(parts) or "none"
+
+
+# ─── parser ─────────────────────────────────────────────────────────────────
+def _negated(text: str, start: int) -> bool:
+    clause = _CLAUSE_BREAK_RE.split(text[:start])[-1]
+    preceding = clause.lower().split()[-NEGATION_WINDOW:]
+    return any(tok.strip("\"'") in NEGATORS for tok in preceding)
+
+
+def _extract_genres(text: str) -> Tuple[str, ...]:
+    found = []
+    for genre, rx in _GENRE_RES:
+        for m in rx.finditer(text):
+            if not _negated(text, m.start()):
+                found.append(genre)
+                break
+    return tuple(found)
+
+
+def _extract_years(text: str) -> Tuple[Optional[int], Optional[int]]:
+    bounds: List[Tuple[Optional[int], Optional[int]]] = []
+
+    for m in _RANGE_RE.finditer(text):
+        a, b = sorted((int(m.group(1)), int(m.group(2))))
+        bounds.append((a, b))
+    for m in _BEFORE_RE.finditer(text):
+        bounds.append((None, int(m.group(1)) - 1))
+    for m in _AFTER_RE.finditer(text):
+        bounds.append((int(m.group(1)) + 1, None))
+    for m in _SINCE_RE.finditer(text):
+        bounds.append((int(m.group(1)), None))
+    for m in _EXACT_RE.finditer(text):
+        if not _RANGE_RE.match(text, m.start()):
+            year = int(m.group(1))
+            bounds.append((year, year))
+    for m in _DECADE_RE.finditer(text):
+        part, century, digit = m.group(1), m.group(2), int(m.group(3))
+        if century:
+            base = int(century) * 100 + digit * 10
+        else:
+            base = (2000 if digit < 2 else 1900) + digit * 10
+        lo, hi = _DECADE_PART[part.lower() if part else None]
+        bounds.append((base + lo, base + hi))
+
+    if not bounds:
+        return None, None
+
+    gte = max((lo for lo, _ in bounds if lo is not None), default=None)
+    lte = min((hi for _, hi in bounds if hi is not None), default=None)
+    if gte is not None and lte is not None and gte > lte:
+        return None, None                        # contradictory – leave it to the embedding
+    return gte, lte
+
+
+def parse_query(text: str) -> QueryConstraints:
+    """Extract genre and release-year constraints from a free-text query."""
+    gte, lte = _extract_years(text)
+    return QueryConstraints(genres=_extract_genres(text), year_gte=gte, year_lte=lte)
+
+
+if __name__ == "__main__":
+    import sys
+
+    for q in sys.argv[1:] or ["A sci-fi movie made before the year 2000."]:
+        c = parse_query(q)
+        print(f"{q}\n   → {c.describe()}  filters={c.to_store_filters()}")
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Bounded-cost second stage for MovieLens search.
+
+Fetch the top-N vector candidates, score (query, candidate text) pairs with a
+local cross-encoder in fixed-size batches, and re-order by that score – unless
+the latency budget would be blown, in which case the raw vector order is
+served instead.
+
+• The budget is checked *before* every batch, estimating it from the
+  per-candidate cost so far; a small probe batch goes first so the first
+  full batch is estimated too.  A partially scored list is never served,
+  and a fully scored one is never discarded.
+• Every call returns a `RerankReport` (N, batch size, batches scored, timings,
+  fallback reason) so the precision / latency trade-off can be tuned.
+• `sentence_transformers` is only imported when a `CrossEncoderReranker` is
+  constructed.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Protocol, Sequence, Tuple
+
+DEFAULT_MODEL = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+PROBE_SIZE = 2                                  # candidates scored before the first full batch
+
+
+# ─── scorer interface ───────────────────────────────────────────────────────
+class PairScorer(Protocol):
+    def score_batch(self, query: str, texts: Sequence[str]) -> List[float]: ...
+
+
+class CrossEncoderReranker:
+    """Thin wrapper around `sentence_transformers.CrossEncoder`."""
+
+    def __init__(self, model_name: str = DEFAULT_MODEL, *, device: Optional[str] = None):
+        from sentence_transformers import CrossEncoder
+
+        self.model_name = model_name
+        self.model = CrossEncoder(model_name, device=device)
+        # First forward pass pays for kernel / tokenizer warm-up – do it here,
+        # not inside somebody's latency budget.
+        self.score_batch("warm-up", ["warm-up"])
+
+    def score_batch(self, query: str, texts: Sequence[str]) -> List[float]:
+        scores = self.model.predict(
+            [(query, t) for t in texts],
+            batch_size=len(texts),
+            show_progress_bar=False,
+        )
+        return [float(s) for s in scores]
+
+
+# ─── report ─────────────────────────────────────────────────────────────────
+@dataclass
+class RerankReport:
+    candidates: int
+    batch_size: int
+    budget_ms: float
+    batches_scored: int = 0
+    score_ms: float = 0.0
+    max_batch_ms: float = 0.0
+    total_ms: float = 0.0
+    fell_back: bool = False
+    reason: str = ""
+
+    def summary(self) -> str:
+        status = f"fallback ({self.reason})" if self.fell_back else "reranked"
+        return (
+            f"N={self.candidates} batch={self.batch_size} "
+            f"batches={self.batches_scored} score={self.score_ms:.1f}ms "
+            f"max_batch={self.max_batch_ms:.1f}ms total={self.total_ms:.1f}ms "
+            f"budget={self.budget_ms:.0f}ms → {status}"
+        )
+
+
+# ─── rerank ─────────────────────────────────────────────────────────────────
+def hit_text(hit: Dict[str, Any]) -> str:
+    if hit.get("text"):
+        return hit["text"]
+    md = hit.get("meta_data") or hit.get("metadata") or {}
+    return f"Title: {md.get('title', '')}. Genres: {', '.join(md.get('genres', []))}."
+
+
+def rerank(
+    query: str,
+    hits: List[Dict[str, Any]],
+    scorer: PairScorer,
+    *,
+    top_k: int,
+    budget_ms: float,
+    batch_size: int = 16,
+) -> Tuple[List[Dict[str, Any]], RerankReport]:
+    """
+    Re-order `hits` by cross-encoder score within `budget_ms`.
+
+    Returns the first `top_k` hits – reranked, or in their original vector
+    order if the next batch would exceed the budget (estimated from the
+    per-candidate cost so far, starting with a `PROBE_SIZE` probe) or the
+    scorer fails.  A rerank that finished over budget is still returned.
+    Reranked hits keep their cosine `score` and gain `rerank_score`.
+    """
+    start = time.perf_counter()
+    report = RerankReport(candidates=len(hits), batch_size=batch_size, budget_ms=budget_ms)
+
+    def _fallback(reason: str):
+        report.fell_back = True
+        report.reason = reason
+        report.total_ms = (time.perf_counter() - start) * 1000
+        return hits[:top_k], report
+
+    if len(hits) <= 1:
+        return _fallback("nothing to rerank")
+
+    texts = [hit_text(h) for h in hits]
+    scores: List[float] = []
+
+    # a tiny probe batch first: it prices one candidate before a full batch
+    # is committed to, so even the first real batch is checked against the budget
+    probe = min(PROBE_SIZE, batch_size, len(texts))
+    spans = [(0, probe)] + [
+        (i, min(i + batch_size, len(texts))) for i in range(probe, len(texts), batch_size)
+    ]
+
+    for lo, hi in spans:
+        if scores:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            estimate_ms = report.score_ms / len(scores) * (hi - lo)
+            if elapsed_ms + estimate_ms > budget_ms:
+                return _fallback(f"budget hit after {report.batches_scored} batches")
+
+        t0 = time.perf_counter()
+        try:
+            scores.extend(scorer.score_batch(query, texts[lo:hi]))
+        except Exception as exc:                       # model errors must not fail the search
+            return _fallback(f"scorer error: {exc}")
+        batch_ms = (time.perf_counter() - t0) * 1000
+
+        report.batches_scored += 1
+        report.score_ms += batch_ms
+        report.max_batch_ms = max(report.max_batch_ms, batch_ms)
+
+    # every candidate is scored: an overrun here is already paid for, so the
+    # result is served (total_ms shows it) rather than thrown away
+    order = sorted(range(len(hits)), key=lambda j: scores[j], reverse=True)[:top_k]
+    reranked = [{**hits[j], "rerank_score": scores[j]} for j in order]
+    report.total_ms = (time.perf_counter() - start) * 1000
+    return reranked, report
@@ -1,14 +1,29 @@
+"""
+MovieLens fuzzy-search REPL.
+
+The prompt appears immediately: importing `projectdavid`, constructing the
+`Entity` client, loading the embedding model and resolving the store all
+run on a background thread (`warmup.BackgroundInit`).  The first query only
+blocks if that warm-up is still in progress.  Heavy modules are imported
+inside the warm-up, not at module import time.
+"""
 
 from __future__ import annotations
 
 import os
 import sys
 import time
+from pathlib import Path
 from typing import Optional
 
 from dotenv import load_dotenv
-from projectdavid import Entity
 
+# Run as a file (`python recipes/reccomender/search_movielens-v2.py`; the
+# hyphen rules out `-m`), so put the repo root on the path for `recipes.*`.
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from recipes.reccomender.search_timing import StageTimings
+from recipes.reccomender.warmup import BackgroundInit
 
 
 load_dotenv()
@@ -20,26 +35,47 @@ BASE_URL = os.getenv("BASE_URL", "http://localhost:9000")
 API_KEY = os.getenv("ENTITIES_API_KEY")
 STORE_ID = "vect_mqfWyNlZbacer73PQu4Upy"
 TOP_K = int(os.getenv("TOP_K", "5"))
+TIMINGS = StageTimings() if os.getenv("TIMINGS", "0") == "1" else None
 
 if not STORE_ID:
     print("❌  MOVIELENS_STORE_ID env var missing – add it to .env or the IDE run‑config", file=sys.stderr)
     sys.exit(1)
 
 # ────────────────────────────────────────────────────────────────
-#  Core lookup helper (re‑uses the high‑level client search)
+#  Core lookup helper (staged search, see movielens_search.py)
 # ────────────────────────────────────────────────────────────────
 
+def _build_searcher():
+    """Import the SDK, build the client and pay every first-call cost up front."""
+    from projectdavid import Entity
+
+    from recipes.reccomender.movielens_search import StoreSearcher
+
+    client = Entity(base_url=BASE_URL, api_key=API_KEY)
+    searcher = StoreSearcher(client)
+    searcher.collection_for(STORE_ID)           # store id → collection (cached)
+    searcher.encode("warm-up")                  # model load + first forward pass
+    return searcher
+
+
+WARM = BackgroundInit(_build_searcher, name="movielens-warm-up")
+
+
 def search_once(query: str, top_k: int = TOP_K, *, host_override: Optional[str] = None) -> None:
     """Print `top_k` matches for `query`."""
 
-    client = Entity(base_url=BASE_URL, api_key=API_KEY)
+    if not WARM.ready():
+        print("⏳  still warming up …")
+        t0 = time.perf_counter()
+        searcher = WARM.get()
+        if TIMINGS is not None:
+            TIMINGS.record("warm-up wait", (time.perf_counter() - t0) * 1000)
+    else:
+        searcher = WARM.get()
 
-    hits = client.vectors.vector_file_search_raw(
-        vector_store_id=STORE_ID,
-        query_text=query,
-        top_k=top_k,
+    from recipes.reccomender.movielens_search import DISPLAY_FIELDS, hit_metadata
 
-    )
+    hits = searcher.search(STORE_ID, query, top_k, include=DISPLAY_FIELDS, timings=TIMINGS)
 
 
     if not hits:
@@ -47,7 +83,7 @@ def search_once(query: str, top_k: int = TOP_K, *, host_override: Optional[str]
         return
 
     for i, h in enumerate(hits, 1):
-        md = h.get("meta_data") or h.get("metadata") or {}
+        md = hit_metadata(h)
         genres = ", ".join(md.get("genres", [])) or "Unknown genre"
         title = md.get("title", "<untitled>")
         year = md.get("release_year", "—")
@@ -67,5 +103,9 @@ if __name__ == "__main__":
                 continue
             search_once(query)
     except (EOFError, KeyboardInterrupt):
+        if TIMINGS is not None:
+            if WARM.elapsed_s is not None:
+                print(f"\nwarm-up took {WARM.elapsed_s:.2f}s")
+            print("\n" + TIMINGS.table())
         print("\nBye!")
         sys.exit(0)
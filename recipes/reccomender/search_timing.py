@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Optional per-stage latency instrumentation for MovieLens search.
+
+`StageTimings` keeps one log-bucketed `LatencyHistogram` per stage name
+("resolve", "encode", "search", "decode", …) and prints a p50/p95/p99 table.
+Pass an instance into the search helpers to turn the hooks on; pass `None`
+and `timed()` degrades to a no-op context manager.
+
+Histograms use fixed relative-width buckets (~2 %), so memory stays constant
+no matter how many queries are recorded and percentiles are accurate to the
+bucket width.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import ContextManager, Dict, Iterator, Optional
+
+GROWTH = 1.02          # bucket upper bound / lower bound
+MIN_MS = 0.001         # everything faster lands in bucket 0
+
+
+class LatencyHistogram:
+    """Fixed-memory latency histogram with ~2 % relative error."""
+
+    def __init__(self) -> None:
+        self.buckets: Dict[int, int] = {}
+        self.count = 0
+        self.total_ms = 0.0
+        self.min_ms = math.inf
+        self.max_ms = 0.0
+
+    @staticmethod
+    def _index(ms: float) -> int:
+        if ms <= MIN_MS:
+            return 0
+        return int(math.log(ms / MIN_MS) / math.log(GROWTH)) + 1
+
+    @staticmethod
+    def _upper(index: int) -> float:
+        return MIN_MS * GROWTH ** index
+
+    def record(self, ms: float) -> None:
+        idx = self._index(ms)
+        self.buckets[idx] = self.buckets.get(idx, 0) + 1
+        self.count += 1
+        self.total_ms += ms
+        self.min_ms = min(self.min_ms, ms)
+        self.max_ms = max(self.max_ms, ms)
+
+    def percentile(self, p: float) -> float:
+        """Return the latency (ms) at percentile `p` (0–100)."""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(self.count * p / 100))
+        seen = 0
+        for idx in sorted(self.buckets):
+            seen += self.buckets[idx]
+            if seen >= rank:
+                return min(max(self._upper(idx), self.min_ms), self.max_ms)
+        return self.max_ms
+
+    @property
+    def mean_ms(self) -> float:
+        return self.total_ms / self.count if self.count else 0.0
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        for idx, n in other.buckets.items():
+            self.buckets[idx] = self.buckets.get(idx, 0) + n
+        self.count += other.count
+        self.total_ms += other.total_ms
+        self.min_ms = min(self.min_ms, other.min_ms)
+        self.max_ms = max(self.max_ms, other.max_ms)
+
+
+class StageTimings:
+    """Thread-safe collection of per-stage latency histograms."""
+
+    def __init__(self) -> None:
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, ms: float) -> None:
+        with self._lock:
+            self.histograms.setdefault(stage, LatencyHistogram()).record(ms)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, (time.perf_counter() - t0) * 1000)
+
+    def table(self, title: str = "search latency (ms)") -> str:
+        with self._lock:
+            rows = list(self.histograms.items())
+        if not rows:
+            return f"{title}: no samples"
+
+        width = max(8, *(len(name) for name, _ in rows))
+        lines = [
+            f"{title}",
+            f"{'stage':<{width}} {'n':>6} {'mean':>9} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9}",
+        ]
+        for name, h in rows:
+            lines.append(
+                f"{name:<{width}} {h.count:>6} {h.mean_ms:>9.2f} {h.percentile(50):>9.2f} "
+                f"{h.percentile(95):>9.2f} {h.percentile(99):>9.2f} {h.max_ms:>9.2f}"
+            )
+        return "\n".join(lines)
+
+
+def timed(timings: Optional[StageTimings], name: str) -> ContextManager[None]:
+    """`with timed(timings, "encode"): …` – a no-op when `timings` is None."""
+    return timings.stage(name) if timings is not None else nullcontext()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Single-flight request coalescing.
+
+Concurrent callers that ask for the same key share one in-flight call: the
+first caller (the leader) runs the work, everyone who arrives while it is
+running waits for and receives the same result – or the same exception.
+Nothing is kept once the call finishes, so unlike a cache this never serves
+stale data; it only removes duplicate work that overlaps in time.
+
+    flight = SingleFlight()
+    key = search_key(store_id, query, top_k, filters)
+    hits, shared = flight.do(key, lambda: searcher.search(store_id, query, top_k))
+
+The result object is handed to every waiter as-is – treat it as read-only.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+def search_key(
+    store_id: str,
+    query: str,
+    top_k: int,
+    filters: Optional[Dict[str, Any]] = None,
+) -> Tuple[str, str, int, str]:
+    """Coalescing key for a search; whitespace and filter key order don't split it."""
+    return (
+        store_id,
+        " ".join(query.split()),
+        int(top_k),
+        json.dumps(filters, sort_keys=True, separators=(",", ":")),
+    )
+
+
+class SingleFlight:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._inflight: Dict[Hashable, Future] = {}
+        self.executed = 0           # calls that actually ran
+        self.coalesced = 0          # callers that piggy-backed on one of them
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> Tuple[T, bool]:
+        """Run `fn` once per concurrent `key`; returns `(result, shared)`."""
+        with self._lock:
+            fut = self._inflight.get(key)
+            leader = fut is None
+            if leader:
+                fut = self._inflight[key] = Future()
+                self.executed += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            return fut.result(), True
+
+        try:
+            result = fn()
+        except BaseException as exc:
+            fut.set_exception(exc)
+            raise
+        else:
+            fut.set_result(result)
+            return result, False
+        finally:
+            with self._lock:
+                del self._inflight[key]
+
+    def stats(self) -> str:
+        total = self.executed + self.coalesced
+        saved = self.coalesced / total * 100 if total else 0.0
+        return f"single-flight: {total} calls, {self.executed} executed, {self.coalesced} coalesced ({saved:.1f}% saved)"
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+User profile vectors for personalised MovieLens search.
+
+A user's profile is the rating-weighted mean of the embeddings of the
+movies they rated in `u.data`, in the same space as the store's vectors.
+All users are computed in one pass – a sparse `users × items` rating matrix
+times the dense `items × dim` embedding matrix – normalised, and cached as
+`.npy` (memory-mapped on load), one file per store.
+
+Personalising a search is then one vector blend before the usual
+`search_by_vector`, so it costs the same as a generic search:
+
+    q = searcher.encode(query)
+    hits = searcher.search_by_vector(store_id, blend(q, profiles.vector(user), 0.3), top_k)
+
+    python -m recipes.reccomender.user_profiles --store-id vect_…     # build the cache
+"""
+
+from __future__ import annotations
+
+import argparse
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+from recipes.reccomender.movielens_data import ARTIFACT_DIR, dataset_shape, ratings_matrix
+
+DEFAULT_STORE_ID = "vect_mqfWyNlZbacer73PQu4Upy"
+
+
+def build_profiles(ratings, item_ids: np.ndarray, matrix: np.ndarray) -> np.ndarray:
+    """
+    Unit-norm rating-weighted mean embedding per user (rows = user_id - 1).
+
+    Items without an embedding are ignored; users with no embedded ratings
+    get a zero vector.
+    """
+    n_items = ratings.shape[1]
+    emb = np.zeros((n_items, matrix.shape[1]), dtype=np.float32)
+    has = np.zeros(n_items, dtype=np.float32)
+    rows = np.asarray(item_ids) - 1
+    emb[rows] = matrix
+    has[rows] = 1.0
+
+    weighted = ratings @ emb                               # (users, dim)
+    weight = ratings @ has                                 # (users,)
+    profiles = weighted / np.maximum(weight, 1e-12)[:, None]
+    norms = np.linalg.norm(profiles, axis=1, keepdims=True)
+    return np.divide(profiles, norms, out=np.zeros_like(profiles), where=norms > 0).astype(np.float32)
+
+
+def blend(query: Sequence[float], profile: np.ndarray, weight: float) -> list:
+    """Unit-norm `(1 - weight)·query + weight·profile`; the query alone if the profile is empty."""
+    q = np.asarray(query, dtype=np.float32)
+    if weight <= 0 or not profile.any():
+        return q.tolist()
+    mixed = (1.0 - weight) * q + weight * profile
+    return (mixed / np.linalg.norm(mixed)).tolist()
+
+
+def profile_path(store_id: str) -> Path:
+    return ARTIFACT_DIR / f"user_profiles_{store_id}.npy"
+
+
+class UserProfiles:
+    """
+    Disk-cached profile matrices, one per store (thread-safe).
+
+    Matrices are built on first use; call `build(store_id)` up front (e.g. in
+    a resource factory) so no search pays for the store export.
+    """
+
+    def __init__(self, searcher):
+        self.searcher = searcher
+        self._profiles: Dict[str, np.ndarray] = {}
+        self._lock = threading.Lock()
+
+    def matrix(self, store_id: str) -> np.ndarray:
+        with self._lock:
+            profiles = self._profiles.get(store_id)
+            if profiles is None:
+                path = profile_path(store_id)
+                if not path.exists():
+                    from recipes.reccomender.item_neighbours import store_matrix
+
+                    item_ids, matrix = store_matrix(self.searcher, store_id)
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    np.save(path, build_profiles(ratings_matrix(), item_ids, matrix))
+                profiles = self._profiles[store_id] = np.load(path, mmap_mode="r")
+        return profiles
+
+    def build(self, *store_ids: str) -> "UserProfiles":
+        """Load or build the matrices of `store_ids` now; returns self."""
+        for store_id in store_ids:
+            self.matrix(store_id)
+        return self
+
+    def vector(self, store_id: str, user_id: int) -> Optional[np.ndarray]:
+        """Profile of a 1-based MovieLens user, or None if the id is out of range."""
+        profiles = self.matrix(store_id)
+        if not 1 <= user_id <= profiles.shape[0]:
+            return None
+        return np.asarray(profiles[user_id - 1])
+
+
+# ─── CLI ────────────────────────────────────────────────────────────────────
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Precompute MovieLens user profile vectors for a store")
+    ap.add_argument("--store-id", default=DEFAULT_STORE_ID)
+    args = ap.parse_args()
+
+    import os
+
+    from dotenv import load_dotenv
+    from projectdavid import Entity
+
+    from recipes.reccomender.item_neighbours import store_matrix
+    from recipes.reccomender.movielens_search import StoreSearcher
+
+    load_dotenv()
+    client = Entity(
+        base_url=os.getenv("BASE_URL", "http://localhost:9000"),
+        api_key=os.getenv("ENTITIES_API_KEY"),
+    )
+    t0 = time.perf_counter()
+    item_ids, matrix = store_matrix(StoreSearcher(client), args.store_id)
+    print(f"exported {len(item_ids)} item vectors in {time.perf_counter() - t0:.1f}s")
+
+    t0 = time.perf_counter()
+    profiles = build_profiles(ratings_matrix(shape=dataset_shape()), item_ids, matrix)
+    print(f"{profiles.shape[0]} profiles (dim={profiles.shape[1]}) in {(time.perf_counter() - t0) * 1000:.1f} ms")
+
+    path = profile_path(args.store_id)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    np.save(path, profiles)
+    print(f"saved → {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Run expensive start-up work (SDK import, client construction, embedding
+model load) on a background thread so an interactive prompt can appear
+immediately.
+
+    warm = BackgroundInit(build_searcher)     # returns at once
+    ...
+    searcher = warm.get()                     # blocks only if still warming up
+
+Exceptions raised by the factory are re-raised from `get()`.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Generic, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class BackgroundInit(Generic[T]):
+    def __init__(self, factory: Callable[[], T], *, name: str = "warm-up") -> None:
+        self._factory = factory
+        self._future: Future = Future()
+        self.started = time.perf_counter()
+        self.elapsed_s: Optional[float] = None
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        try:
+            result = self._factory()
+        except BaseException as exc:
+            self.elapsed_s = time.perf_counter() - self.started
+            self._future.set_exception(exc)
+        else:
+            self.elapsed_s = time.perf_counter() - self.started
+            self._future.set_result(result)
+
+    def ready(self) -> bool:
+        return self._future.done()
+
+    def get(self, timeout: Optional[float] = None) -> T:
+        return self._future.result(timeout)
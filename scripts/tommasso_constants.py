@@ -28,6 +28,8 @@ RECOMMENDATION = {
                     "type": "integer",
                     "description": "Number of items IDs that have to be included in the generated ranking. "
                     "Default value is 5.",
+                    "default": 5,
+                    "minimum": 1,
                 },
                 "filters": {
                     "type": "object",
@@ -351,8 +353,8 @@ METADATA = {
                     },
                 },
             },
+            "required": ["item", "specification"],
         },
-        "required": ["item", "specification"],
         "examples": {
             "Provide all the information you know about item 47": {
                 "name": "get_item_metadata",
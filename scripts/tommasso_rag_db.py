@@ -1,3 +1,4 @@
+# Run from the repository root:  python -m scripts.tommasso_rag_db
 import time
 from projectdavid import Entity
 from dotenv import load_dotenv
@@ -5,10 +6,33 @@ import os
 
 load_dotenv()
 os.environ.pop("DATABASE_URL", None)
-from tommasso_constants import RECOMMENDATION, METADATA
+from scripts.tommasso_constants import RECOMMENDATION, METADATA
 from projectdavid_common.schemas.tools import ToolFunction
 import json
 
+from recipes.function_calls.action_executor import ParallelActionExecutor
+from recipes.function_calls.action_wait import ActionWaiter
+from recipes.function_calls.tool_cache import CachePolicy, ToolCache
+from recipes.function_calls.tool_registry import ResourceRegistry, ToolRegistry
+from recipes.reccomender.batch_recommend import DEFAULT_OUT_DIR, BatchRecommendations
+from recipes.reccomender.catalog_filters import MovieCatalog
+from recipes.reccomender.cf_recommender import load_or_train
+from recipes.reccomender.item_metadata import load_or_build as load_metadata_store
+from recipes.reccomender.warmup import BackgroundInit
+
+# Tool state is declared once and shared by every call.  It is built in the
+# background while the assistant / thread / run are being set up.  If the
+# nightly batch job (batch_recommend.py) has run, its precomputed top-k is
+# served instead of scoring with the live ALS model.
+resources = ResourceRegistry()
+resources.register("recommender", load_or_train)
+resources.register(
+    "precomputed",
+    lambda: BatchRecommendations() if (DEFAULT_OUT_DIR / "meta.json").exists() else None,
+)
+resources.register("item_metadata", load_metadata_store)
+resources.register("catalog", MovieCatalog.from_movielens)
+
 client = Entity(base_url="http://localhost:9000", api_key=os.getenv("ENTITIES_API_KEY"))
 
 #  Using ready-made user for convenience
@@ -51,25 +75,70 @@ except Exception as e:
 """
 
 
+# arguments arrive validated and coerced against RECOMMENDATION / METADATA
+TOOLS = ToolRegistry(resources)
+
+
+@TOOLS.tool(RECOMMENDATION, resources=("recommender", "precomputed", "catalog", "item_metadata"))
+def get_top_k_recommendations(arguments, *, recommender, precomputed, catalog, item_metadata):
+    user = arguments["user"]
+    k = arguments["k"]
+    allowed, ignored = catalog.filter_mask(arguments.get("filters"))
+    try:
+        recs = []
+        if precomputed is not None and k <= precomputed.k:
+            recs = [(i, s) for i, s in precomputed.top_k(user, precomputed.k) if allowed[i - 1]][:k]
+        if len(recs) < k:
+            recs = recommender.recommend(user, k, allowed=allowed)
+    except KeyError:
+        return json.dumps({"status": "error", "message": f"Unknown user {user}"})
+    records = item_metadata.get_many([item for item, _ in recs], ["title"])
+    listing = ", ".join(
+        f"{item} ({rec['title'] if rec else 'unknown title'})" for (item, _), rec in zip(recs, records)
+    )
+    message = f"Suggested recommendations for user {user}: {listing or 'no items match the filters'}"
+    if ignored:
+        message += f" (filters or values not in the catalog, ignored: {', '.join(ignored)})"
+    return json.dumps({"status": "success", "message": message})
+
+
+@TOOLS.tool(METADATA, resources=("item_metadata",))
+def get_item_metadata(arguments, *, item_metadata):
+    item = arguments["item"]
+    record = item_metadata.get(item, arguments.get("specification"))
+    if record is None:
+        return json.dumps({"status": "error", "message": f"Unknown item {item}"})
+    return json.dumps(
+        {
+            "status": "success",
+            "message": f"Here's the requested metadata ({arguments.get('specification')}) for item {item}: {json.dumps(record)}",
+        }
+    )
+
+
+WARM = BackgroundInit(TOOLS.warm, name="tool-warm-up")
+
+
 def function_call_handler(tool_name, arguments):
 
     print(f"This is the tool name:{tool_name}")
 
-    if tool_name == "get_top_k_recommendations":
-        return json.dumps(
-            {
-                "status": "success",
-                "message": f"Suggested recommendations for user {arguments.get('user')}: 45, 65, 43",
-            }
-        )
-    elif tool_name == "get_item_metadata":
-        return json.dumps(
-            {
-                "status": "success",
-                "message": f"Here's the requested metadata ({arguments.get('specification')}) for item {arguments.get('item')}: Oblivion",
-            }
-        )
-    raise ValueError("Wrong tool name passed!!")
+    if tool_name not in TOOLS.names:
+        raise ValueError("Wrong tool name passed!!")
+    return TOOLS(tool_name, arguments)
+
+
+# both tools are deterministic for a given model / metadata build; set
+# TOOL_CACHE_DIR to keep results across runs
+CACHED_HANDLER = ToolCache(
+    function_call_handler,
+    {
+        "get_item_metadata": CachePolicy(ttl_s=3600.0, max_entries=4096),
+        "get_top_k_recommendations": CachePolicy(ttl_s=300.0, max_entries=1024),
+    },
+    disk_dir=os.getenv("TOOL_CACHE_DIR"),
+    canonical=TOOLS.canonical,
+)
 
 
 assistant_id = "asst_OvVCiNOg5ZIY1bISxq9iXk"
@@ -111,16 +180,26 @@ for chunk in sync_stream.stream_chunks(
 
 # --- Function call execution ---
 try:
-    action_was_handled = client.runs.poll_and_execute_action(
-        run_id=run.id,
-        thread_id=thread.id,
-        assistant_id="default",
-        tool_executor=function_call_handler,
-        actions_client=client.actions,
-        messages_client=client.messages,
-        timeout=45.0,
-        interval=1.5,
+    # every pending action runs concurrently; outputs are submitted in call order
+    executor = ParallelActionExecutor(
+        CACHED_HANDLER,
+        timeouts={"get_top_k_recommendations": 10.0, "get_item_metadata": 5.0},
     )
+    waited = ActionWaiter.from_client(client).wait(run.id, timeout=45.0)
+    action_was_handled = waited.status == "pending_action"
+    if action_was_handled:
+        try:
+            warm_ms = WARM.get()                 # normally done long before the action arrives
+            print(f"\n[warm-up] {', '.join(f'{n} {ms:.0f} ms' for n, ms in warm_ms.items())}")
+        except Exception as exc:                 # tools build what they need on first use
+            print(f"\n[warm-up] failed, resources will be built on first use: {exc}")
+        executor.handle(
+            waited.actions,
+            thread_id=thread.id,
+            assistant_id="default",
+            actions_client=client.actions,
+            messages_client=client.messages,
+        )
 
     if action_was_handled:
         print("\n[Tool executed. Generating final response...]\n")
@@ -141,5 +220,6 @@ try:
             content = final_chunk.get("content", "")
             if content:
                 print(content, end="", flush=True)
+    print(f"\n[tool cache] {CACHED_HANDLER.stats()}")
 except Exception as e:
     print(f"\n[Error during tool execution or final stream]: {str(e)}")